@@ -0,0 +1,85 @@
+"""Two-tier read-through cache: a small per-process TTL LRU in front of Redis."""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable
+
+import orjson
+from cachetools import TTLCache
+
+from . import metrics
+from .config import get_redis_connection
+
+
+class ReadThroughCache:
+    """
+    Values are JSON-serializable dicts/lists. They round-trip through orjson
+    before being stored locally, so both tiers hand back identical types
+    (datetimes come back as ISO strings).
+
+    The local tier is not invalidated across processes; keep its TTL short.
+    """
+
+    def __init__(self, namespace: str, ttl_seconds: int, local_ttl_seconds: float, local_maxsize: int = 1024) -> None:
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self._local: TTLCache = TTLCache(maxsize=local_maxsize, ttl=local_ttl_seconds)
+        self._lock = threading.Lock()
+
+    def get(self, key: str, loader: Callable[[], Any]) -> Any:
+        value = self.peek(key)
+        if value is not None:
+            return value
+
+        metrics.incr(f"cache.{self.namespace}.miss")
+        value = loader()
+        if value is None:
+            return None
+        return self.set(key, value)
+
+    def peek(self, key: str) -> Any:
+        """Cached value from either tier, or None; never calls a loader."""
+        with self._lock:
+            value = self._local.get(key)
+        if value is not None:
+            metrics.incr(f"cache.{self.namespace}.local_hit")
+            return value
+
+        raw = None
+        try:
+            raw = get_redis_connection().get(self._redis_key(key))
+        except Exception as exc:  # noqa: BLE001
+            metrics.incr(f"cache.{self.namespace}.redis_error")
+            print(f"[cache:{self.namespace}] redis read failed: {exc}")
+        if raw is not None:
+            metrics.incr(f"cache.{self.namespace}.redis_hit")
+            value = orjson.loads(raw)
+            with self._lock:
+                self._local[key] = value
+            return value
+        return None
+
+    def set(self, key: str, value: Any) -> Any:
+        serialized = orjson.dumps(value)
+        normalized = orjson.loads(serialized)
+        try:
+            get_redis_connection().set(self._redis_key(key), serialized, ex=self.ttl_seconds)
+        except Exception as exc:  # noqa: BLE001
+            metrics.incr(f"cache.{self.namespace}.redis_error")
+            print(f"[cache:{self.namespace}] redis write failed: {exc}")
+        with self._lock:
+            self._local[key] = normalized
+        return normalized
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._local.pop(key, None)
+        try:
+            get_redis_connection().delete(self._redis_key(key))
+        except Exception as exc:  # noqa: BLE001
+            metrics.incr(f"cache.{self.namespace}.redis_error")
+            print(f"[cache:{self.namespace}] redis invalidation failed: {exc}")
+
+    def _redis_key(self, key: str) -> str:
+        return f"cache:{self.namespace}:{key}"
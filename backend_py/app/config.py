@@ -47,6 +47,21 @@ class Settings:
             default=True,
         )
         self.db_ssl_ca: str = os.getenv("DB_SSL_CA", "")
+        # Connection pool
+        self.db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+        self.db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+        self.db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+        self.db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+        # "idle" pings only connections that sat in the pool longer than
+        # DB_PRE_PING_IDLE_SECONDS; "always" pings on every checkout; "off" never pings
+        self.db_pre_ping: str = os.getenv("DB_PRE_PING", "idle").strip().lower()
+        if self.db_pre_ping not in {"idle", "always", "off"}:
+            raise RuntimeError("DB_PRE_PING must be one of: idle, always, off")
+        self.db_pre_ping_idle_seconds: float = float(os.getenv("DB_PRE_PING_IDLE_SECONDS", "30"))
+        # Upper bound on blocking DB calls offloaded from the event loop at once
+        self.db_max_concurrency: int = int(
+            os.getenv("DB_MAX_CONCURRENCY", str(self.db_pool_size + self.db_max_overflow))
+        )
 
         # Cloudinary
         self.cloudinary_cloud_name: str = os.getenv("CLOUDINARY_CLOUD_NAME", "")
@@ -77,6 +92,62 @@ class Settings:
         self.redis_host: str = os.getenv("REDIS_HOST", "127.0.0.1")
         self.redis_port: int = int(os.getenv("REDIS_PORT", "6379"))
 
+        # Read-through caches (Redis TTL, plus a short per-process tier)
+        self.job_cache_ttl_seconds: int = int(os.getenv("JOB_CACHE_TTL_SECONDS", "3600"))
+        self.cache_local_ttl_seconds: float = float(os.getenv("CACHE_LOCAL_TTL_SECONDS", "30"))
+        self.evaluation_cache_ttl_seconds: int = int(os.getenv("EVALUATION_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+        # Parsed resume text no queued evaluation refers to (kept only to avoid re-parsing)
+        self.resume_text_ttl_seconds: int = int(os.getenv("RESUME_TEXT_TTL_SECONDS", str(24 * 3600)))
+        # Minimum TTL of a parsed text still referenced by queued evaluations; bounds leaked references
+        self.resume_text_ref_ttl_seconds: int = int(os.getenv("RESUME_TEXT_REF_TTL_SECONDS", str(7 * 24 * 3600)))
+
+        # Estimated-token budget for resume text sent to the evaluation model (after compaction)
+        self.resume_token_budget: int = int(os.getenv("RESUME_TOKEN_BUDGET", "3000"))
+        # Resume parsing: "pdfium" (fast, falls back to pdfplumber on empty/garbled text) or "pdfplumber"
+        self.resume_pdf_engine: str = os.getenv("RESUME_PDF_ENGINE", "pdfium").strip().lower()
+        if self.resume_pdf_engine not in {"pdfium", "pdfplumber"}:
+            raise RuntimeError("RESUME_PDF_ENGINE must be one of: pdfium, pdfplumber")
+        # Process pool
+        self.parse_pool_size: int = int(os.getenv("PARSE_POOL_SIZE", "2"))
+        self.parse_timeout_seconds: float = float(os.getenv("PARSE_TIMEOUT_SECONDS", "30"))
+        # Address-space cap per parser process (POSIX only); 0 disables it
+        self.parse_memory_limit_mb: int = int(os.getenv("PARSE_MEMORY_LIMIT_MB", "2048"))
+
+        # Evaluation worker: "sync" runs one job at a time (RQ SimpleWorker), "async" runs up to
+        # EVAL_WORKER_CONCURRENCY jobs at once on one event loop
+        self.eval_worker_mode: str = os.getenv("EVAL_WORKER_MODE", "sync").strip().lower()
+        if self.eval_worker_mode not in {"sync", "async"}:
+            raise RuntimeError("EVAL_WORKER_MODE must be one of: sync, async")
+        self.eval_worker_concurrency: int = int(os.getenv("EVAL_WORKER_CONCURRENCY", "20"))
+        # Async mode: jobs downloaded/parsed ahead while the LLM calls are outstanding
+        self.eval_worker_prefetch: int = int(os.getenv("EVAL_WORKER_PREFETCH", "4"))
+        # Jobs kept on the ai-evaluation RQ queue; the rest wait in per-job-posting lanes (fair scheduling)
+        self.eval_queue_buffer: int = int(os.getenv("EVAL_QUEUE_BUFFER", "10"))
+        # A queued or running evaluation blocks duplicates for at most this long (in case its run never ends)
+        self.eval_dedupe_ttl_seconds: int = int(os.getenv("EVAL_DEDUPE_TTL_SECONDS", str(24 * 3600)))
+        # Run-time lease per candidate; must outlast the job timeout (600s)
+        self.eval_lease_seconds: int = int(os.getenv("EVAL_LEASE_SECONDS", "900"))
+        # Transient stage failures (network, 5xx, rate limits, DB/Redis drops) are retried in-process with
+        # exponential backoff and jitter; finished stages are checkpointed in Redis for later retries
+        self.eval_retry_attempts: int = int(os.getenv("EVAL_RETRY_ATTEMPTS", "4"))
+        self.eval_retry_base_seconds: float = float(os.getenv("EVAL_RETRY_BASE_SECONDS", "2"))
+        self.eval_retry_max_seconds: float = float(os.getenv("EVAL_RETRY_MAX_SECONDS", "60"))
+        self.eval_checkpoint_ttl_seconds: int = int(os.getenv("EVAL_CHECKPOINT_TTL_SECONDS", str(24 * 3600)))
+        # Worker supervisor (run_supervisor.py): one process per WORKER_JOBS_PER_PROCESS queued jobs,
+        # between the min and max, plus one more while the oldest queued job is older than the age limit
+        self.worker_min_processes: int = int(os.getenv("WORKER_MIN_PROCESSES", "1"))
+        self.worker_max_processes: int = int(os.getenv("WORKER_MAX_PROCESSES", "4"))
+        if self.worker_min_processes < 0 or self.worker_max_processes < max(1, self.worker_min_processes):
+            raise RuntimeError("WORKER_MAX_PROCESSES must be >= 1 and >= WORKER_MIN_PROCESSES >= 0")
+        self.worker_jobs_per_process: int = int(os.getenv("WORKER_JOBS_PER_PROCESS", "50"))
+        self.worker_scale_age_seconds: float = float(os.getenv("WORKER_SCALE_AGE_SECONDS", "120"))
+        self.worker_scale_interval_seconds: float = float(os.getenv("WORKER_SCALE_INTERVAL_SECONDS", "5"))
+        self.worker_scale_down_delay_seconds: float = float(os.getenv("WORKER_SCALE_DOWN_DELAY_SECONDS", "60"))
+        # Recycle each worker process after this many jobs; 0 never recycles
+        self.worker_max_jobs_per_process: int = int(os.getenv("WORKER_MAX_JOBS_PER_PROCESS", "200"))
+        # On shutdown, workers finishing their current job are killed after this long
+        self.worker_drain_timeout_seconds: float = float(os.getenv("WORKER_DRAIN_TIMEOUT_SECONDS", "600"))
+
         # OpenAI
         self.openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
         self.openai_model: str = os.getenv("OPENAI_MODEL", "gpt-4o")
@@ -84,6 +155,26 @@ class Settings:
         if not self.openai_api_key:
             raise RuntimeError("OPENAI_API_KEY environment variable is required")
 
+        # Shared OpenAI rate limiter: account limits per model as "model=rpm:tpm,..." (tpm 0 = requests only);
+        # models not listed use the defaults. Buckets are filled to OPENAI_RATE_LIMIT_HEADROOM of the limits.
+        self.openai_default_rpm: int = int(os.getenv("OPENAI_DEFAULT_RPM", "500"))
+        self.openai_default_tpm: int = int(os.getenv("OPENAI_DEFAULT_TPM", "30000"))
+        self.openai_rate_limits: dict[str, tuple[int, int]] = self._parse_rate_limits(
+            os.getenv("OPENAI_RATE_LIMITS", "")
+        )
+        self.openai_rate_limit_headroom: float = float(os.getenv("OPENAI_RATE_LIMIT_HEADROOM", "0.9"))
+        # Share of each bucket only interview-path (interactive) calls may use
+        self.openai_interactive_reserve: float = float(os.getenv("OPENAI_INTERACTIVE_RESERVE", "0.2"))
+        if not 0 <= self.openai_interactive_reserve < 1:
+            raise RuntimeError("OPENAI_INTERACTIVE_RESERVE must be between 0 and 1")
+        # Longest a call waits for capacity: background calls then fail, interactive calls go ahead anyway
+        self.openai_background_max_wait_seconds: float = float(
+            os.getenv("OPENAI_BACKGROUND_MAX_WAIT_SECONDS", "300")
+        )
+        self.openai_interactive_max_wait_seconds: float = float(
+            os.getenv("OPENAI_INTERACTIVE_MAX_WAIT_SECONDS", "10")
+        )
+
     def _build_database_url(self) -> str:
         if self.database_url and self.database_url.strip():
             url = self.database_url.strip()
@@ -101,6 +192,20 @@ class Settings:
             f"@{self.db_host}:{self.db_port}/{self.db_name}?charset=utf8mb4"
         )
 
+    @staticmethod
+    def _parse_rate_limits(value: str) -> dict[str, tuple[int, int]]:
+        limits: dict[str, tuple[int, int]] = {}
+        for item in value.split(","):
+            if not item.strip():
+                continue
+            try:
+                model, rates = item.split("=", 1)
+                rpm, tpm = rates.split(":", 1)
+                limits[model.strip()] = (int(rpm), int(tpm))
+            except ValueError as exc:
+                raise RuntimeError("OPENAI_RATE_LIMITS must look like gpt-4o=500:30000,whisper-1=50:0") from exc
+        return limits
+
     @staticmethod
     def _to_bool(value: str | None, default: bool = False) -> bool:
         if value is None:
@@ -1,18 +1,28 @@
 from __future__ import annotations
 
-import json
-from contextlib import contextmanager
-from datetime import datetime
-from functools import lru_cache
-from typing import Any, Dict, Generator, Iterable, Optional
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache, partial
+from typing import Any, AsyncGenerator, Callable, Dict, Generator, Optional, TypeVar
 
 import certifi
-from sqlalchemy import Engine, create_engine, text
-from sqlalchemy.engine import Connection, Result
+import orjson
+from sqlalchemy import Engine, create_engine, event, text
+from sqlalchemy.engine import Connection, Result, Row
+from sqlalchemy.exc import DisconnectionError
+from starlette.exceptions import HTTPException
 
+from . import metrics
 from .config import get_settings
 
 
+T = TypeVar("T")
+
+
 @lru_cache()
 def get_engine() -> Engine:
     settings = get_settings()
@@ -26,22 +36,255 @@ def get_engine() -> Engine:
                 "ssl_verify_identity": settings.db_ssl_verify_identity,
             }
         )
-    return create_engine(
+    engine = create_engine(
         settings.sqlalchemy_database_url,
-        pool_pre_ping=True,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pre_ping == "always",
         connect_args=connect_args,
         future=True,
     )
+    event.listen(engine, "before_cursor_execute", _count_statement)
+    event.listen(engine, "commit", _count_commit)
+    event.listen(engine, "connect", _on_pool_connect)
+    event.listen(engine, "checkin", _on_pool_checkin)
+    event.listen(engine, "invalidate", _on_pool_invalidate)
+    if settings.db_pre_ping == "idle":
+        event.listen(engine, "checkout", _ping_if_idle)
+    return engine
+
+
+def _on_pool_connect(dbapi_conn: Any, connection_record: Any) -> None:
+    metrics.incr("db.pool.connects")
+
+
+def _on_pool_checkin(dbapi_conn: Any, connection_record: Any) -> None:
+    connection_record.info["checked_in_at"] = time.monotonic()
+
+
+def _on_pool_invalidate(dbapi_conn: Any, connection_record: Any, exception: BaseException | None) -> None:
+    metrics.incr("db.pool.invalidations")
+
+
+def _ping_if_idle(dbapi_conn: Any, connection_record: Any, connection_proxy: Any) -> None:
+    """Pre-ping only connections that sat idle long enough for the server to drop them."""
+    checked_in_at = connection_record.info.get("checked_in_at")
+    if checked_in_at is None:
+        return
+    if time.monotonic() - checked_in_at < get_settings().db_pre_ping_idle_seconds:
+        return
+    metrics.incr("db.pool.pings")
+    try:
+        if hasattr(dbapi_conn, "ping"):
+            dbapi_conn.ping(reconnect=False)
+        else:
+            cursor = dbapi_conn.cursor()
+            try:
+                cursor.execute("SELECT 1")
+            finally:
+                cursor.close()
+    except Exception as exc:  # noqa: BLE001
+        # The pool discards this connection and retries the checkout with a fresh one
+        metrics.incr("db.pool.reconnects")
+        raise DisconnectionError() from exc
+
+
+def _connect(engine: Engine) -> Connection:
+    started = time.perf_counter()
+    conn = engine.connect()
+    metrics.observe("db.pool.checkout_wait", time.perf_counter() - started)
+    return conn
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    pool = get_engine().pool
+    counters = metrics.snapshot()
+    wait = counters["timings"].get("db.pool.checkout_wait", {})
+    stats: Dict[str, Any] = {
+        "pool_size": pool.size() if hasattr(pool, "size") else None,
+        "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+        "checked_in": pool.checkedin() if hasattr(pool, "checkedin") else None,
+        "overflow": pool.overflow() if hasattr(pool, "overflow") else None,
+        "checkouts": wait.get("count", 0),
+        "checkout_wait_avg_seconds": wait.get("avg", 0.0),
+        "checkout_wait_max_seconds": wait.get("max", 0.0),
+    }
+    for name in ("connects", "pings", "reconnects", "invalidations"):
+        stats[name] = counters["counters"].get(f"db.pool.{name}", 0)
+    return stats
+
+
+class UnitOfWork:
+    """
+    Database session for one request (see get_unit_of_work).
+
+    Statements issued while a unit of work is active share one pooled
+    connection and one transaction. The connection is checked out lazily on
+    the first statement and handed back to the pool on every commit.
+    """
+
+    def __init__(self) -> None:
+        self._conn: Connection | None = None
+        self._lock = threading.RLock()
+        self.rollback_only = False
+        self.statements = 0
+        self.commits = 0
+        self.checkouts = 0
+
+    @contextmanager
+    def connection(self) -> Generator[Connection, None, None]:
+        with self._lock:
+            if self._conn is None:
+                self._conn = _connect(get_engine())
+                self.checkouts += 1
+            yield self._conn
+
+    def commit(self) -> None:
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                if self._conn.in_transaction():
+                    self._conn.commit()
+            finally:
+                self._release()
+
+    def rollback(self) -> None:
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                if self._conn.in_transaction():
+                    self._conn.rollback()
+            finally:
+                self._release()
+
+    async def commit_async(self) -> None:
+        if self._conn is not None:
+            await run_in_db_executor(self.commit)
+
+    async def rollback_async(self) -> None:
+        if self._conn is not None:
+            await run_in_db_executor(self.rollback)
+
+    def stats(self) -> Dict[str, int]:
+        return {"statements": self.statements, "commits": self.commits, "checkouts": self.checkouts}
+
+    def _release(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            conn.close()
+
+
+_current_unit_of_work: contextvars.ContextVar[UnitOfWork | None] = contextvars.ContextVar(
+    "db_unit_of_work", default=None
+)
+
+
+def _count_statement(conn: Connection, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    uow = _current_unit_of_work.get()
+    if uow is not None:
+        uow.statements += 1
+
+
+def _count_commit(conn: Connection) -> None:
+    uow = _current_unit_of_work.get()
+    if uow is not None:
+        uow.commits += 1
+
+
+@contextmanager
+def unit_of_work() -> Generator[UnitOfWork, None, None]:
+    current = _current_unit_of_work.get()
+    if current is not None:
+        yield current
+        return
+    uow = UnitOfWork()
+    token = _current_unit_of_work.set(uow)
+    try:
+        yield uow
+        if uow.rollback_only:
+            uow.rollback()
+        else:
+            uow.commit()
+    except BaseException:
+        uow.rollback()
+        raise
+    finally:
+        _current_unit_of_work.reset(token)
+
+
+@contextmanager
+def outside_unit_of_work() -> Generator[None, None, None]:
+    """
+    Statements in this block (and DB executor calls started from it) use their own
+    pooled connections instead of joining the current unit of work, so a slow
+    non-DB call in between does not keep the request's connection checked out.
+    """
+    token = _current_unit_of_work.set(None)
+    try:
+        yield
+    finally:
+        _current_unit_of_work.reset(token)
+
+
+@asynccontextmanager
+async def unit_of_work_async() -> AsyncGenerator[UnitOfWork, None]:
+    current = _current_unit_of_work.get()
+    if current is not None:
+        yield current
+        return
+    uow = UnitOfWork()
+    token = _current_unit_of_work.set(uow)
+    try:
+        yield uow
+        if uow.rollback_only:
+            await uow.rollback_async()
+        else:
+            await uow.commit_async()
+    except BaseException:
+        await uow.rollback_async()
+        raise
+    finally:
+        _current_unit_of_work.reset(token)
+
+
+async def get_unit_of_work() -> AsyncGenerator[UnitOfWork, None]:
+    """
+    FastAPI dependency opening a unit of work for routes that need several writes
+    to commit together. It is committed when the handler finishes, also for 4xx
+    errors, and rolled back on 5xx errors and unhandled exceptions. Routes commit
+    early (uow.commit_async) before slow non-DB calls so the connection goes back
+    to the pool.
+    """
+    client_error: HTTPException | None = None
+    async with unit_of_work_async() as uow:
+        try:
+            yield uow
+        except HTTPException as exc:
+            if exc.status_code >= 500:
+                raise
+            client_error = exc
+    if client_error is not None:
+        raise client_error
 
 
 @contextmanager
 def db_connection(transactional: bool = False) -> Generator[Connection, None, None]:
-    engine = get_engine()
-    if transactional:
-        with engine.begin() as conn:
+    uow = _current_unit_of_work.get()
+    if uow is not None:
+        # Inside a unit of work every block joins the shared transaction;
+        # the owner of the unit of work decides when to commit.
+        with uow.connection() as conn:
             yield conn
-    else:
-        with engine.connect() as conn:
+        return
+    with _connect(get_engine()) as conn:
+        if transactional:
+            with conn.begin():
+                yield conn
+        else:
             yield conn
 
 
@@ -54,27 +297,76 @@ def execute(sql: str, params: Optional[Dict[str, Any]] = None, conn: Optional[Co
 
 
 def fetch_all(sql: str, params: Optional[Dict[str, Any]] = None, conn: Optional[Connection] = None) -> list[Dict[str, Any]]:
+    payload = params or {}
+    if conn is not None:
+        return _rows_to_dicts(conn.execute(text(sql), payload))
+    with db_connection() as owned_conn:
+        return _rows_to_dicts(owned_conn.execute(text(sql), payload))
+
+
+def fetch_one(sql: str, params: Optional[Dict[str, Any]] = None, conn: Optional[Connection] = None) -> Dict[str, Any] | None:
     payload = params or {}
     if conn is not None:
         result = conn.execute(text(sql), payload)
-        return [_row_to_dict(r._mapping) for r in result]
+        row = result.first()
+        return dict(zip(result.keys(), row)) if row else None
     with db_connection() as owned_conn:
         result = owned_conn.execute(text(sql), payload)
-        return [_row_to_dict(r._mapping) for r in result]
+        row = result.first()
+        return dict(zip(result.keys(), row)) if row else None
 
 
-def fetch_one(sql: str, params: Optional[Dict[str, Any]] = None, conn: Optional[Connection] = None) -> Dict[str, Any] | None:
+def fetch_rows(sql: str, params: Optional[Dict[str, Any]] = None, conn: Optional[Connection] = None) -> list[Row[Any]]:
+    """
+    Return raw tuple-backed rows (attribute/index access, no per-row dict).
+    Prefer this over fetch_all for large result sets that are reshaped anyway.
+    """
     payload = params or {}
     if conn is not None:
-        result = conn.execute(text(sql), payload).first()
-        return _row_to_dict(result._mapping) if result else None
+        return conn.execute(text(sql), payload).all()
     with db_connection() as owned_conn:
-        result = owned_conn.execute(text(sql), payload).first()
-        return _row_to_dict(result._mapping) if result else None
+        return owned_conn.execute(text(sql), payload).all()
+
+
+@lru_cache()
+def get_db_executor() -> ThreadPoolExecutor:
+    settings = get_settings()
+    return ThreadPoolExecutor(max_workers=max(1, settings.db_max_concurrency), thread_name_prefix="db")
+
+
+async def run_in_db_executor(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run blocking database work on the bounded DB thread pool instead of the event loop."""
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(get_db_executor(), partial(ctx.run, func, *args, **kwargs))
+
+
+async def execute_async(
+    sql: str, params: Optional[Dict[str, Any]] = None, conn: Optional[Connection] = None
+) -> Result[Any]:
+    return await run_in_db_executor(execute, sql, params, conn)
+
+
+async def fetch_all_async(
+    sql: str, params: Optional[Dict[str, Any]] = None, conn: Optional[Connection] = None
+) -> list[Dict[str, Any]]:
+    return await run_in_db_executor(fetch_all, sql, params, conn)
+
+
+async def fetch_one_async(
+    sql: str, params: Optional[Dict[str, Any]] = None, conn: Optional[Connection] = None
+) -> Dict[str, Any] | None:
+    return await run_in_db_executor(fetch_one, sql, params, conn)
+
+
+async def fetch_rows_async(
+    sql: str, params: Optional[Dict[str, Any]] = None, conn: Optional[Connection] = None
+) -> list[Row[Any]]:
+    return await run_in_db_executor(fetch_rows, sql, params, conn)
 
 
 def to_json_db(value: Any) -> str:
-    return json.dumps(value if value is not None else [])
+    return orjson.dumps(value if value is not None else [], option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
 
 
 def from_json_db(value: Any, default: Any) -> Any:
@@ -82,24 +374,15 @@ def from_json_db(value: Any, default: Any) -> Any:
         return default
     if isinstance(value, (dict, list)):
         return value
-    if isinstance(value, (bytes, bytearray)):
+    if isinstance(value, (str, bytes, bytearray)):
         try:
-            value = value.decode("utf-8")
-        except Exception:
-            return default
-    if isinstance(value, str):
-        try:
-            return json.loads(value)
+            return orjson.loads(value)
         except Exception:
             return default
     return default
 
 
-def _row_to_dict(mapping: Iterable[tuple[str, Any]] | Any) -> Dict[str, Any]:
-    row: Dict[str, Any] = {}
-    for key, value in dict(mapping).items():
-        if isinstance(value, datetime):
-            row[key] = value.isoformat()
-        else:
-            row[key] = value
-    return row
+def _rows_to_dicts(result: Result[Any]) -> list[Dict[str, Any]]:
+    # Datetimes stay native; the ORJSON response class serializes them directly.
+    keys = tuple(result.keys())
+    return [dict(zip(keys, row)) for row in result]
@@ -3,16 +3,23 @@ from __future__ import annotations
 import os
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles # <--- IMPORT THIS
+from starlette.concurrency import run_in_threadpool
 
+from . import metrics
 from .config import get_settings
+from .db import get_pool_stats
 from .routes import apply, candidates, invites, jobs, interview
 
 
 settings = get_settings()
 
-app = FastAPI(title="AI Interviewer Python Backend", version="1.0.0")
+app = FastAPI(
+    title="AI Interviewer Python Backend",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+)
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
@@ -24,14 +31,14 @@ async def http_exception_handler(request: Request, exc: HTTPException):
         payload = detail
     else:
         payload = {"error": str(detail)}
-    return JSONResponse(status_code=exc.status_code, content=payload)
+    return ORJSONResponse(status_code=exc.status_code, content=payload)
 
 
 @app.exception_handler(Exception)
 async def unhandled_exception_handler(request: Request, exc: Exception):
     # Avoid leaking internals to the client, but keep it debuggable via server logs
     print("[unhandled]", repr(exc))
-    return JSONResponse(status_code=500, content={"error": "Internal server error"})
+    return ORJSONResponse(status_code=500, content={"error": "Internal server error"})
 
 app.add_middleware(
     CORSMiddleware,
@@ -51,6 +58,23 @@ async def health():
     from datetime import datetime, timezone
     return {"status": "ok", "timestamp": datetime.now(timezone.utc).isoformat()}
 
+
+@app.get("/metrics")
+async def metrics_snapshot():
+    # Workers publish their own snapshots to Redis; they are best-effort here
+    try:
+        workers = await run_in_threadpool(metrics.collect, "worker")
+        supervisors = await run_in_threadpool(metrics.collect, "supervisor")
+    except Exception as exc:  # noqa: BLE001
+        print("[metrics] failed to collect worker snapshots:", repr(exc))
+        workers = []
+        supervisors = []
+    return {
+        "api": {"pid": os.getpid(), "db_pool": get_pool_stats(), **metrics.snapshot()},
+        "workers": workers,
+        "supervisors": supervisors,
+    }
+
 app.include_router(jobs.router)
 app.include_router(invites.router)
 app.include_router(candidates.router)
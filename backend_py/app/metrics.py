@@ -0,0 +1,73 @@
+"""In-process counters and timings, published to Redis so API and workers can be scraped together."""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import threading
+import time
+from typing import Any, Dict, List
+
+from .config import get_redis_connection
+
+
+METRICS_KEY_PREFIX = "metrics"
+METRICS_TTL_SECONDS = 300
+
+_lock = threading.Lock()
+_counters: Dict[str, float] = {}
+_timings: Dict[str, Dict[str, float]] = {}
+
+
+def incr(name: str, value: float = 1) -> None:
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def observe(name: str, seconds: float) -> None:
+    with _lock:
+        timing = _timings.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0})
+        timing["count"] += 1
+        timing["total"] += seconds
+        if seconds > timing["max"]:
+            timing["max"] = seconds
+
+
+def snapshot() -> Dict[str, Any]:
+    with _lock:
+        counters = dict(_counters)
+        timings = {
+            name: {**values, "avg": (values["total"] / values["count"]) if values["count"] else 0.0}
+            for name, values in _timings.items()
+        }
+    return {"counters": counters, "timings": timings}
+
+
+def publish(role: str, extra: Dict[str, Any] | None = None) -> None:
+    """Store this process' snapshot under metrics:<role>:<host>:<pid> with a short TTL."""
+    payload = {
+        "role": role,
+        "host": socket.gethostname(),
+        "pid": os.getpid(),
+        "published_at": time.time(),
+        **snapshot(),
+        **(extra or {}),
+    }
+    key = f"{METRICS_KEY_PREFIX}:{role}:{payload['host']}:{payload['pid']}"
+    get_redis_connection().set(key, json.dumps(payload, default=str), ex=METRICS_TTL_SECONDS)
+
+
+def collect(role: str = "*") -> List[Dict[str, Any]]:
+    """Return every live snapshot published for the given role."""
+    redis_conn = get_redis_connection()
+    snapshots: List[Dict[str, Any]] = []
+    for key in redis_conn.scan_iter(match=f"{METRICS_KEY_PREFIX}:{role}:*", count=100):
+        raw = redis_conn.get(key)
+        if not raw:
+            continue
+        try:
+            snapshots.append(json.loads(raw))
+        except Exception:  # noqa: BLE001
+            continue
+    return snapshots
@@ -1,16 +1,28 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from hashlib import sha256
 from typing import Any, Dict
 from uuid import uuid4
 
-from fastapi import APIRouter, File, Form, Header, HTTPException, UploadFile, status
+from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, UploadFile, status
 from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
 
-from ..db import db_connection, execute, fetch_one
+from ..db import (
+    UnitOfWork,
+    db_connection,
+    execute,
+    execute_async,
+    fetch_one,
+    fetch_one_async,
+    get_unit_of_work,
+    run_in_db_executor,
+)
 from ..queue import ai_queue
 from ..services.ai_evaluation_service import create_pending_evaluation
-from ..services.resume_parser_service import extract_resume_text
+from ..services.evaluation_scheduler_service import enqueue_evaluation, evaluation_job_id
+from ..services.resume_text_service import parse_resume_shared, release_parsed_text, retain_parsed_text
 from ..services.storage_service import delete_media, upload_resume
 
 
@@ -31,7 +43,7 @@ async def validate_token(token: str | None = None) -> Dict[str, Any]:
         return {"valid": False, "error": "Token is required"}
 
     try:
-        data = fetch_one(
+        data = await fetch_one_async(
             """
             SELECT email, status, expires_at
             FROM application_tokens
@@ -52,7 +64,7 @@ async def validate_token(token: str | None = None) -> Dict[str, Any]:
     expires_at = _parse_datetime(str(data["expires_at"]))
     now = datetime.now(timezone.utc)
     if expires_at <= now:
-        execute("UPDATE application_tokens SET status = 'EXPIRED' WHERE token = :token", {"token": token})
+        await execute_async("UPDATE application_tokens SET status = 'EXPIRED' WHERE token = :token", {"token": token})
         return {"valid": False, "error": "Token has expired"}
 
     return {"valid": True, "email": data["email"]}
@@ -67,12 +79,13 @@ async def submit_application(
     resume: UploadFile = File(...),
     token_form: str | None = Form(None),
     x_application_token: str | None = Header(None),
+    uow: UnitOfWork = Depends(get_unit_of_work),
 ) -> Dict[str, Any]:
     token = x_application_token or token_form
     if not token:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Application token is required")
 
-    token_data = fetch_one(
+    token_data = await fetch_one_async(
         """
         SELECT email, status, expires_at
         FROM application_tokens
@@ -93,7 +106,7 @@ async def submit_application(
     expires_at = _parse_datetime(str(token_data["expires_at"]))
     now = datetime.now(timezone.utc)
     if expires_at <= now:
-        execute("UPDATE application_tokens SET status = 'EXPIRED' WHERE token = :token", {"token": token})
+        await execute_async("UPDATE application_tokens SET status = 'EXPIRED' WHERE token = :token", {"token": token})
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="This invitation has expired")
 
     if email != token_data["email"]:
@@ -107,6 +120,9 @@ async def submit_application(
             detail="Name, job selection, and resume are required",
         )
 
+    # Only reads so far; hand the connection back before the slow parse and upload below
+    await uow.commit_async()
+
     allowed_types = {
         "application/pdf",
         "application/msword",
@@ -122,19 +138,50 @@ async def submit_application(
     if len(file_bytes) > max_size:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File size must be less than 5MB")
 
-    parsed_resume_text: str | None = None
+    # Same sha256 upload_resume stores in candidate_documents; keys the shared parsed-text store
+    file_hash = sha256(file_bytes).hexdigest()
+    # Only a text that made it into the shared store can be referenced by the job
+    text_stored = False
     try:
-        parsed_resume_text = extract_resume_text(
+        _, text_stored = await run_in_threadpool(
+            parse_resume_shared,
             file_bytes,
             resume.filename or "resume.pdf",
-        ).text
+            file_hash,
+        )
     except Exception as exc:  # noqa: BLE001
         # Non-fatal: worker can still try URL-based fallback
         print("Resume text pre-parse failed, worker will fallback to file fetch:", repr(exc))
 
     candidate_id = str(uuid4())
-    candidate = None
+
+    # Upload before opening the transaction, so no pooled connection is held during it
+    upload_result: Dict[str, Any] = {}
     try:
+        upload_result = await upload_resume(
+            file_bytes=file_bytes,
+            file_name=resume.filename or "resume.pdf",
+            file_type=resume.content_type or "application/octet-stream",
+            candidate_id=candidate_id,
+        )
+    except Exception as exc:  # noqa: BLE001
+        print("Error uploading resume:", repr(exc))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to upload resume: {exc}",
+        ) from exc
+
+    async def _discard_upload() -> None:
+        public_id = upload_result.get("public_id")
+        if public_id:
+            try:
+                await delete_media(public_id, upload_result.get("resource_type", "raw"))
+            except Exception:
+                pass
+
+    candidate = None
+
+    def _insert_candidate() -> Dict[str, Any] | None:
         with db_connection(transactional=True) as conn:
             execute(
                 """
@@ -154,8 +201,12 @@ async def submit_application(
                 },
                 conn=conn,
             )
-            candidate = fetch_one("SELECT * FROM candidates WHERE id = :id LIMIT 1", {"id": candidate_id}, conn=conn)
+            return fetch_one("SELECT * FROM candidates WHERE id = :id LIMIT 1", {"id": candidate_id}, conn=conn)
+
+    try:
+        candidate = await run_in_db_executor(_insert_candidate)
     except IntegrityError as exc:
+        await _discard_upload()
         err = str(exc).lower()
         if "1062" in err or "duplicate" in err:
             raise HTTPException(
@@ -167,32 +218,18 @@ async def submit_application(
             detail="Failed to create application record.",
         ) from exc
     except Exception as exc:  # noqa: BLE001
+        await _discard_upload()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create application record. Internal Error.",
         ) from exc
 
     if not candidate:
+        await _discard_upload()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Database returned no data.")
 
-    upload_result: Dict[str, Any] = {}
     try:
-        upload_result = await upload_resume(
-            file_bytes=file_bytes,
-            file_name=resume.filename or "resume.pdf",
-            file_type=resume.content_type or "application/octet-stream",
-            candidate_id=str(candidate["id"]),
-        )
-    except Exception as exc:  # noqa: BLE001
-        print("Error uploading resume:", repr(exc))
-        execute("DELETE FROM candidates WHERE id = :id", {"id": candidate["id"]})
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to upload resume: {exc}",
-        ) from exc
-
-    try:
-        execute(
+        await execute_async(
             """
             INSERT INTO candidate_documents (
                 id, candidate_id, storage_bucket, storage_path, file_hash, uploaded_at
@@ -210,20 +247,15 @@ async def submit_application(
             },
         )
     except Exception as exc:  # noqa: BLE001
+        # The 5xx response rolls back the unit of work, candidate row included
         print("Error creating document record:", exc)
-        execute("DELETE FROM candidates WHERE id = :id", {"id": candidate["id"]})
-        public_id = upload_result.get("public_id")
-        if public_id:
-            try:
-                await delete_media(public_id, upload_result.get("resource_type", "raw"))
-            except Exception:
-                pass
+        await _discard_upload()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to save document information",
         ) from exc
 
-    execute(
+    await execute_async(
         """
         UPDATE application_tokens
         SET status = 'USED', used_at = :used_at
@@ -240,20 +272,56 @@ async def submit_application(
     except Exception as exc:  # noqa: BLE001
         print("Failed to create pending evaluation row:", repr(exc))
 
+    # The worker reads these rows, so they must be durable before the job is queued
+    try:
+        await uow.commit_async()
+    except Exception as exc:  # noqa: BLE001
+        print("Error committing application:", exc)
+        await _discard_upload()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to save application",
+        ) from exc
+
+    # The job carries only the hash; its reference keeps the shared parsed text alive until the worker reads it
+    resume_text_ref = file_hash if text_stored else None
+    resume_text_ref_id = uuid4().hex
+    dedupe_job_id = evaluation_job_id(str(job_id), token_data["email"], upload_result["hash"])
     try:
-        ai_queue.enqueue(
+        if resume_text_ref:
+            await run_in_threadpool(retain_parsed_text, resume_text_ref, resume_text_ref_id)
+        # Fair-scheduled per job posting, so one large campaign cannot starve other jobs.
+        # The job id is derived from the job posting, email and resume, so a retried submit of
+        # the same application does not queue a second evaluation.
+        job = await run_in_threadpool(
+            enqueue_evaluation,
+            ai_queue,
+            str(job_id),
             "app.workers.ai_evaluation_worker.process_evaluation_job",
-            candidate_id=str(candidate["id"]),
-            job_id=str(job_id),
-            resume_path=upload_result["path"],
-            storage_bucket="cloudinary",
-            resume_public_id=upload_result.get("public_id"),
-            resume_resource_type=upload_result.get("resource_type", "raw"),
-            resume_text=parsed_resume_text,
-            job_timeout=600,
+            {
+                "candidate_id": str(candidate["id"]),
+                "job_id": str(job_id),
+                "resume_path": upload_result["path"],
+                "storage_bucket": "cloudinary",
+                "resume_public_id": upload_result.get("public_id"),
+                "resume_resource_type": upload_result.get("resource_type", "raw"),
+                "resume_hash": upload_result["hash"],
+                "resume_text_ref": resume_text_ref,
+                "resume_text_ref_id": resume_text_ref_id,
+                "dedupe_job_id": dedupe_job_id,
+            },
+            600,
+            dedupe_job_id,
         )
-        print(f"[API] Enqueued AI evaluation job for candidate {candidate['id']}")
+        if job is None:
+            # Already queued or running: that job holds its own text reference
+            if resume_text_ref:
+                await run_in_threadpool(release_parsed_text, resume_text_ref, resume_text_ref_id)
+        else:
+            print(f"[API] Enqueued AI evaluation job for candidate {candidate['id']}")
     except Exception as exc:  # noqa: BLE001
         print("Failed to enqueue AI evaluation job:", exc)
+        if resume_text_ref:
+            await run_in_threadpool(release_parsed_text, resume_text_ref, resume_text_ref_id)
 
     return {"success": True, "message": "Application submitted successfully"}
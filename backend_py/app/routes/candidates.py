@@ -1,151 +1,320 @@
 from __future__ import annotations
 
+import base64
 from datetime import datetime
 from typing import Any, Dict, List
 
-from fastapi import APIRouter, Body, HTTPException, Path
+from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query
+from fastapi.responses import ORJSONResponse
 
 from ..config import get_settings
-from ..db import fetch_all, fetch_one, from_json_db, execute
+from ..db import (
+    UnitOfWork,
+    execute_async,
+    fetch_all_async,
+    fetch_one_async,
+    fetch_rows_async,
+    from_json_db,
+    get_unit_of_work,
+    run_in_db_executor,
+)
 from ..services.ai_evaluation_service import normalize_ai_evaluation_row
 from ..services.email_service import send_approval_email, send_offer_email, send_rejection_email
-from ..services.interview_service import create_interview_session
+from ..services.interview_service import create_interview_session, ensure_interview_questions
 from ..services.storage_service import get_resume_url
 
 
 router = APIRouter(prefix="/api/candidates", tags=["candidates"])
 
 
+CANDIDATE_STATUSES = ("PENDING", "APPROVED", "REJECTED")
+RECOMMENDATIONS = ("STRONG_MATCH", "POTENTIAL_MATCH", "WEAK_MATCH")
+
+
+def _encode_cursor(created_at: Any, candidate_id: str) -> str:
+    value = created_at.isoformat() if isinstance(created_at, datetime) else str(created_at)
+    return base64.urlsafe_b64encode(f"{value}|{candidate_id}".encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, candidate_id = base64.urlsafe_b64decode(padded).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(created_at), candidate_id
+    except Exception as exc:  # noqa: BLE001
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
 @router.get("/")
-async def get_candidates() -> List[Dict[str, Any]]:
+async def get_candidates(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None),
+    job_id: str | None = Query(None),
+    status: str | None = Query(None),
+    recommendation: str | None = Query(None),
+) -> ORJSONResponse:
+    """
+    Newest-first page of candidates, keyset-paginated on (created_at, id).
+    Jobs are returned once in a side dictionary keyed by id instead of per row.
+    """
+    if status is not None and status not in CANDIDATE_STATUSES:
+        raise HTTPException(status_code=400, detail="Invalid status")
+    if recommendation is not None and recommendation not in RECOMMENDATIONS:
+        raise HTTPException(status_code=400, detail="Invalid recommendation")
+
+    conditions: List[str] = []
+    params: Dict[str, Any] = {"limit": limit + 1}
+    if cursor:
+        params["cursor_created_at"], params["cursor_id"] = _decode_cursor(cursor)
+        conditions.append(
+            "(c.created_at < :cursor_created_at OR (c.created_at = :cursor_created_at AND c.id < :cursor_id))"
+        )
+    if job_id:
+        conditions.append("c.job_id = :job_id")
+        params["job_id"] = job_id
+    if status:
+        conditions.append("c.status = :status")
+        params["status"] = status
+    if recommendation:
+        conditions.append("e.recommendation = :recommendation")
+        params["recommendation"] = recommendation
+    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
     try:
-        rows = fetch_all(
-            """
+        rows = await fetch_rows_async(
+            f"""
             SELECT
-                c.id, c.name, c.email, c.phone, c.created_at,
-                j.id AS job_id, j.title AS job_title, j.description AS job_description
+                c.id, c.job_id, c.name, c.email, c.phone, c.status, c.created_at,
+                e.status AS evaluation_status, e.recommendation, e.score
             FROM candidates c
-            LEFT JOIN jobs j ON j.id = c.job_id
-            ORDER BY c.created_at DESC
-            """
+            LEFT JOIN ai_evaluations e ON e.candidate_id = c.id
+            {where_clause}
+            ORDER BY c.created_at DESC, c.id DESC
+            LIMIT :limit
+            """,
+            params,
         )
-        return [
+        page = rows[:limit]
+        next_cursor = _encode_cursor(page[-1].created_at, page[-1].id) if len(rows) > limit else None
+
+        jobs: Dict[str, Dict[str, Any]] = {}
+        job_ids = sorted({row.job_id for row in page if row.job_id})
+        if job_ids:
+            placeholders = ", ".join(f":job_{idx}" for idx in range(len(job_ids)))
+            job_rows = await fetch_rows_async(
+                f"SELECT id, title, description FROM jobs WHERE id IN ({placeholders})",
+                {f"job_{idx}": value for idx, value in enumerate(job_ids)},
+            )
+            jobs = {row.id: {"id": row.id, "title": row.title, "description": row.description} for row in job_rows}
+
+        # Returning the response directly skips FastAPI's jsonable_encoder pass over every row
+        return ORJSONResponse(
             {
-                "id": row["id"],
-                "name": row["name"],
-                "email": row["email"],
-                "phone": row.get("phone"),
-                "created_at": row["created_at"],
-                "job": {
-                    "id": row.get("job_id"),
-                    "title": row.get("job_title"),
-                    "description": row.get("job_description"),
-                },
+                "items": [
+                    {
+                        "id": row.id,
+                        "name": row.name,
+                        "email": row.email,
+                        "phone": row.phone,
+                        "status": row.status,
+                        "created_at": row.created_at,
+                        "job_id": row.job_id,
+                        "evaluation": (
+                            {
+                                "status": row.evaluation_status,
+                                "recommendation": row.recommendation,
+                                "score": row.score,
+                            }
+                            if row.evaluation_status
+                            else None
+                        ),
+                    }
+                    for row in page
+                ],
+                "jobs": jobs,
+                "next_cursor": next_cursor,
             }
-            for row in rows
-        ]
+        )
     except Exception as exc:  # noqa: BLE001
         print(f"Error fetching candidates: {exc}")
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
 
+DETAIL_SECTIONS = ("job", "job_description", "documents", "evaluation", "interview", "ai_interview_report")
+
+_EVALUATION_COLUMNS = (
+    "id", "candidate_id", "score", "recommendation", "matched_skills", "missing_skills",
+    "strengths", "weaknesses", "summary", "status", "error_message", "resume_tokens_original",
+    "resume_tokens_compacted", "created_at", "updated_at",
+)
+_SESSION_COLUMNS = (
+    "id", "candidate_id", "job_id", "access_token", "status", "last_question_id",
+    "duration", "transcript_url", "completed_at", "created_at",
+)
+_REPORT_COLUMNS = (
+    "id", "session_id", "score", "recommendation", "summary", "matched_skills",
+    "missing_skills", "strengths", "areas_for_improvement", "created_at",
+)
+_DOCUMENT_COLUMNS = ("id", "candidate_id", "storage_bucket", "storage_path", "file_hash", "uploaded_at")
+
+
+def _parse_include(include: str | None) -> set[str]:
+    if not include:
+        return set(DETAIL_SECTIONS)
+    sections = {part.strip() for part in include.split(",") if part.strip()}
+    unknown = sections - set(DETAIL_SECTIONS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown include section(s): {', '.join(sorted(unknown))}")
+    if "job_description" in sections:
+        sections.add("job")
+    return sections
+
+
+def _select_prefixed(alias: str, prefix: str, columns: tuple[str, ...]) -> str:
+    return ", ".join(f"{alias}.{column} AS {prefix}__{column}" for column in columns)
+
+
+def _pop_prefixed(row: Dict[str, Any], prefix: str, columns: tuple[str, ...]) -> Dict[str, Any] | None:
+    values = {column: row.pop(f"{prefix}__{column}") for column in columns}
+    return values if values["id"] is not None else None
+
+
+def _parse_documents(value: Any) -> List[Dict[str, Any]]:
+    docs = from_json_db(value, None) or []
+    for doc in docs:
+        uploaded_at = doc.get("uploaded_at")
+        if isinstance(uploaded_at, str):
+            try:
+                doc["uploaded_at"] = datetime.fromisoformat(uploaded_at)
+            except ValueError:
+                pass
+    docs.sort(key=lambda doc: str(doc.get("uploaded_at") or ""), reverse=True)
+    return docs
+
+
 @router.get("/{candidate_id}")
-async def get_candidate_by_id(candidate_id: str = Path(...)) -> Dict[str, Any]:
-    candidate = fetch_one(
-        """
-        SELECT
-            c.*,
-            j.id AS job_id_ref,
-            j.title AS job_title,
-            j.description AS job_description,
-            j.status AS job_status,
-            j.created_at AS job_created_at
-        FROM candidates c
-        LEFT JOIN jobs j ON j.id = c.job_id
-        WHERE c.id = :candidate_id
-        LIMIT 1
-        """,
-        {"candidate_id": candidate_id},
-    )
-    if not candidate:
-        raise HTTPException(status_code=404, detail="Candidate not found")
+async def get_candidate_by_id(
+    candidate_id: str = Path(...),
+    include: str | None = Query(None, description=f"Comma-separated subset of: {', '.join(DETAIL_SECTIONS)}"),
+) -> Dict[str, Any]:
+    """
+    Whole candidate view in one statement: the 1:1 sections are LEFT JOINed
+    (latest interview session through a derived table) and documents are
+    aggregated into a JSON array by a scalar subquery.
+    """
+    sections = _parse_include(include)
+    want_session = "interview" in sections or "ai_interview_report" in sections
 
-    docs = []
-    try:
-        docs_res = fetch_all(
-            "SELECT * FROM candidate_documents WHERE candidate_id = :candidate_id ORDER BY uploaded_at DESC",
-            {"candidate_id": candidate_id},
+    select_parts = ["c.*"]
+    joins: List[str] = []
+    if "job" in sections:
+        select_parts.append(
+            "j.id AS job_id_ref, j.title AS job_title, j.status AS job_status, j.created_at AS job_created_at"
         )
-        for doc in docs_res:
-            url = await get_resume_url(doc["storage_path"], doc["storage_bucket"])
-            docs.append({**doc, "url": url})
-    except Exception:
-        pass
-
-    evaluation_data = None
-    try:
-        eval_row = fetch_one(
-            "SELECT * FROM ai_evaluations WHERE candidate_id = :candidate_id LIMIT 1",
-            {"candidate_id": candidate_id},
+        if "job_description" in sections:
+            select_parts.append("j.description AS job_description")
+        joins.append("LEFT JOIN jobs j ON j.id = c.job_id")
+    if "evaluation" in sections:
+        select_parts.append(_select_prefixed("e", "eval", _EVALUATION_COLUMNS))
+        joins.append("LEFT JOIN ai_evaluations e ON e.candidate_id = c.id")
+    if want_session:
+        select_parts.append(_select_prefixed("s", "session", _SESSION_COLUMNS))
+        joins.append(
+            """LEFT JOIN (
+                SELECT *
+                FROM interview_sessions
+                WHERE candidate_id = :candidate_id
+                ORDER BY created_at DESC
+                LIMIT 1
+            ) s ON s.candidate_id = c.id"""
+        )
+    if "ai_interview_report" in sections:
+        select_parts.append(_select_prefixed("ie", "report", _REPORT_COLUMNS))
+        joins.append("LEFT JOIN ai_interview_evaluations ie ON ie.session_id = s.id")
+    if "documents" in sections:
+        doc_object = ", ".join(f"'{column}', d.{column}" for column in _DOCUMENT_COLUMNS)
+        select_parts.append(
+            f"""(
+                SELECT JSON_ARRAYAGG(JSON_OBJECT({doc_object}))
+                FROM candidate_documents d
+                WHERE d.candidate_id = :candidate_id
+            ) AS documents_json"""
         )
-        evaluation_data = normalize_ai_evaluation_row(eval_row)
-    except Exception:
-        pass
 
-    interview_data = None
-    ai_interview_report = None
+    select_clause = ",\n            ".join(select_parts)
+    join_clause = "\n        ".join(joins)
     try:
-        session = fetch_one(
-            """
-            SELECT *
-            FROM interview_sessions
-            WHERE candidate_id = :candidate_id
-            ORDER BY created_at DESC
+        candidate = await fetch_one_async(
+            f"""
+            SELECT
+            {select_clause}
+            FROM candidates c
+            {join_clause}
+            WHERE c.id = :candidate_id
             LIMIT 1
             """,
             {"candidate_id": candidate_id},
         )
-        if session:
-            ai_eval_res = fetch_one(
-                "SELECT * FROM ai_interview_evaluations WHERE session_id = :session_id LIMIT 1",
-                {"session_id": session["id"]},
-            )
-            if ai_eval_res:
-                ai_interview_report = {
-                    **ai_eval_res,
-                    "matched_skills": from_json_db(ai_eval_res.get("matched_skills"), []),
-                    "missing_skills": from_json_db(ai_eval_res.get("missing_skills"), []),
-                    "strengths": from_json_db(ai_eval_res.get("strengths"), []),
-                    "areas_for_improvement": from_json_db(ai_eval_res.get("areas_for_improvement"), []),
-                }
+    except Exception as exc:  # noqa: BLE001
+        print(f"Error fetching candidate {candidate_id}: {exc}")
+        raise HTTPException(status_code=500, detail="Failed to fetch candidate") from exc
+    if not candidate:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+
+    payload: Dict[str, Any] = {}
+    if "documents" in sections:
+        docs = []
+        for doc in _parse_documents(candidate.pop("documents_json")):
+            url = await get_resume_url(doc["storage_path"], doc["storage_bucket"])
+            docs.append({**doc, "url": url})
+        payload["documents"] = docs
 
+    if "evaluation" in sections:
+        payload["evaluation"] = normalize_ai_evaluation_row(_pop_prefixed(candidate, "eval", _EVALUATION_COLUMNS))
+
+    session = _pop_prefixed(candidate, "session", _SESSION_COLUMNS) if want_session else None
+    if "ai_interview_report" in sections:
+        report = _pop_prefixed(candidate, "report", _REPORT_COLUMNS)
+        payload["ai_interview_report"] = (
+            {
+                **report,
+                "matched_skills": from_json_db(report.get("matched_skills"), []),
+                "missing_skills": from_json_db(report.get("missing_skills"), []),
+                "strengths": from_json_db(report.get("strengths"), []),
+                "areas_for_improvement": from_json_db(report.get("areas_for_improvement"), []),
+            }
+            if report
+            else None
+        )
+    if "interview" in sections:
+        interview_data = None
+        if session:
             duration_value = session.get("duration")
             video_url = duration_value if isinstance(duration_value, str) and duration_value.startswith("http") else None
             transcript_url = session.get("transcript_url") if isinstance(session.get("transcript_url"), str) else None
             interview_data = {**session, "video_url": video_url, "transcript_url": transcript_url}
-    except Exception as exc:  # noqa: BLE001
-        print(f"Error fetching interview data: {exc}")
-
-    job_payload = {
-        "id": candidate.get("job_id_ref"),
-        "title": candidate.get("job_title"),
-        "description": candidate.get("job_description"),
-        "status": candidate.get("job_status"),
-        "created_at": candidate.get("job_created_at"),
-    }
-
-    return {
-        **candidate,
-        "job": job_payload,
-        "documents": docs,
-        "evaluation": evaluation_data,
-        "interview": interview_data,
-        "ai_interview_report": ai_interview_report,
-    }
+        payload["interview"] = interview_data
+
+    if "job" in sections:
+        job_payload = {
+            "id": candidate.get("job_id_ref"),
+            "title": candidate.get("job_title"),
+            "status": candidate.get("job_status"),
+            "created_at": candidate.get("job_created_at"),
+        }
+        if "job_description" in sections:
+            job_payload["description"] = candidate.get("job_description")
+        payload["job"] = job_payload
+
+    return {**candidate, **payload}
 
 
 @router.put("/{candidate_id}/status")
-async def update_candidate_status(candidate_id: str, body: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
+async def update_candidate_status(
+    candidate_id: str,
+    body: Dict[str, Any] = Body(...),
+    uow: UnitOfWork = Depends(get_unit_of_work),
+) -> Dict[str, Any]:
     status_value = body.get("status")
     custom_message = body.get("customMessage") or ""
 
@@ -153,7 +322,7 @@ async def update_candidate_status(candidate_id: str, body: Dict[str, Any] = Body
         raise HTTPException(status_code=400, detail="Invalid status")
 
     try:
-        execute(
+        await execute_async(
             """
             UPDATE candidates
             SET status = :status, status_updated_at = :updated_at
@@ -174,7 +343,7 @@ async def update_candidate_status(candidate_id: str, body: Dict[str, Any] = Body
     is_interview_done = False
 
     try:
-        candidate = fetch_one(
+        candidate = await fetch_one_async(
             """
             SELECT
                 c.*,
@@ -191,7 +360,7 @@ async def update_candidate_status(candidate_id: str, body: Dict[str, Any] = Body
             raise RuntimeError("Candidate not found after status update")
         job_title = candidate.get("job_title") or "Position"
 
-        rows = fetch_all(
+        rows = await fetch_all_async(
             "SELECT status FROM interview_sessions WHERE candidate_id = :candidate_id",
             {"candidate_id": candidate_id},
         )
@@ -199,13 +368,20 @@ async def update_candidate_status(candidate_id: str, body: Dict[str, Any] = Body
     except Exception as exc:  # noqa: BLE001
         return {"message": f"Status updated to {status_value}, but email failed.", "error": str(exc)}
 
+    # Release the connection before the slow mail calls below (question generation runs
+    # outside this unit of work, see ensure_interview_questions)
+    await uow.commit_async()
+
     interview_link = ""
     try:
         if status_value == "APPROVED":
             if is_interview_done:
                 send_offer_email(candidate["email"], job_title, custom_message)
             else:
-                session = create_interview_session(candidate_id, candidate["job_id"])
+                await ensure_interview_questions(candidate["job_id"])
+                session = await run_in_db_executor(create_interview_session, candidate_id, candidate["job_id"])
+                # Commit the session before the email goes out, and release the connection while it does
+                await uow.commit_async()
                 settings = get_settings()
                 interview_link = f"{settings.app_url}/interview/{session['access_token']}"
                 send_approval_email(candidate["email"], job_title, custom_message, interview_link)
@@ -3,19 +3,21 @@ from __future__ import annotations
 from typing import Any, Dict, Optional
 
 from fastapi import APIRouter, Body, File, Form, HTTPException, UploadFile, status
+from starlette.concurrency import run_in_threadpool
 
-from ..db import execute
+from ..db import execute_async, run_in_db_executor
 from ..services.interview_grader_service import grade_interview_session, save_evaluation_to_db
 from ..services.interview_service import (
     complete_interview_session,
     create_interview_session,
+    ensure_interview_questions,
     get_next_question,
     get_session_by_token,
     save_interview_response,
 )
 from ..services.storage_service import upload_interview_media
 from ..services.transcription_service import transcribe_audio_chunk
-from ..services.tts_service import generate_question_audio
+from ..services.tts_service import get_question_audio_url
 
 
 router = APIRouter(prefix="/api/interview", tags=["interview"])
@@ -23,7 +25,7 @@ router = APIRouter(prefix="/api/interview", tags=["interview"])
 
 @router.get("/validate/{token}")
 async def validate_token(token: str):
-    session = get_session_by_token(token)
+    session = await run_in_db_executor(get_session_by_token, token)
     if not session:
         raise HTTPException(status_code=404, detail="Invalid interview link")
     return session
@@ -36,7 +38,8 @@ async def start_interview(payload: Dict[str, Any] = Body(...)) -> Dict[str, Any]
     if not candidate_id or not job_id:
         raise HTTPException(status_code=400, detail="Missing IDs")
     try:
-        session = create_interview_session(candidate_id, job_id)
+        await ensure_interview_questions(job_id)
+        session = await run_in_db_executor(create_interview_session, candidate_id, job_id)
     except Exception as exc:  # noqa: BLE001
         raise HTTPException(status_code=500, detail=str(exc)) from exc
     return {"session": session}
@@ -49,12 +52,13 @@ async def get_question(payload: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
     if not job_id:
         raise HTTPException(status_code=400, detail="job_id is required")
 
-    question = get_next_question(job_id, last_question_id)
+    question = await run_in_db_executor(get_next_question, job_id, last_question_id)
     if not question:
         return {"question": None, "done": True}
 
-    audio_b64 = generate_question_audio(question["question_text"])
-    return {"question": question, "audio_base64": audio_b64, "done": False}
+    # Content-addressed file in shared storage, synthesized once per distinct question text
+    audio_url = await run_in_threadpool(get_question_audio_url, question["question_text"])
+    return {"question": question, "audio_url": audio_url, "done": False}
 
 
 @router.post("/answer", status_code=status.HTTP_201_CREATED)
@@ -65,8 +69,9 @@ async def submit_answer(
 ) -> Dict[str, Any]:
     try:
         file_bytes = await audio_chunk.read()
-        transcript_text = transcribe_audio_chunk(file_bytes)
-        save_interview_response(session_id, question_id, transcript_text, None, None)
+        # Blocking (Whisper call, may wait on the shared OpenAI rate limiter)
+        transcript_text = await run_in_threadpool(transcribe_audio_chunk, file_bytes)
+        await run_in_db_executor(save_interview_response, session_id, question_id, transcript_text, None, None)
         return {"success": True, "transcript": transcript_text}
     except Exception as exc:  # noqa: BLE001
         print(f"Error at answer route: {exc}")
@@ -79,11 +84,11 @@ async def complete_interview(payload: Dict[str, Any] = Body(...)) -> Dict[str, A
     if not session_id:
         raise HTTPException(status_code=400, detail="session_id required")
 
-    complete_interview_session(session_id, None)
+    await run_in_db_executor(complete_interview_session, session_id, None)
     try:
         grading_result = await grade_interview_session(session_id=session_id, pdf_path=None)
         if "error" not in grading_result:
-            save_success = save_evaluation_to_db(session_id, grading_result)
+            save_success = await run_in_db_executor(save_evaluation_to_db, session_id, grading_result)
             if not save_success:
                 print("Warning: Failed to save to database, but AI generation worked.")
         return {"success": True, "grade": grading_result}
@@ -96,7 +101,7 @@ async def upload_full_video(session_id: str = Form(...), video: UploadFile = Fil
     try:
         file_bytes = await video.read()
         url = await upload_interview_media(file_bytes, session_id, "FULL_SESSION_RECORDING", media_type="video")
-        execute(
+        await execute_async(
             "UPDATE interview_sessions SET duration = :url WHERE id = :session_id",
             {"url": url, "session_id": session_id},
         )
@@ -112,7 +117,7 @@ async def upload_transcript(session_id: str = Form(...), file: UploadFile = File
         file_bytes = await file.read()
         url = await upload_interview_media(file_bytes, session_id, "TRANSCRIPT", media_type="pdf")
         try:
-            execute(
+            await execute_async(
                 "UPDATE interview_sessions SET transcript_url = :url WHERE id = :session_id",
                 {"url": url, "session_id": session_id},
             )
@@ -9,7 +9,7 @@ from uuid import uuid4
 from fastapi import APIRouter, HTTPException, Query, status
 
 from ..config import get_settings
-from ..db import db_connection, execute, fetch_all, fetch_one
+from ..db import db_connection, execute, execute_async, fetch_all_async, fetch_one, run_in_db_executor
 from ..services.email_service import send_invite_email, should_soft_fail_mailgun
 
 
@@ -42,7 +42,8 @@ async def send_invite(payload: Dict[str, Any]) -> Dict[str, Any]:
 
     token_id = str(uuid4())
     created_at = datetime.utcnow()
-    try:
+
+    def _insert_token() -> Dict[str, Any] | None:
         with db_connection(transactional=True) as conn:
             execute(
                 """
@@ -62,11 +63,14 @@ async def send_invite(payload: Dict[str, Any]) -> Dict[str, Any]:
                 },
                 conn=conn,
             )
-            row = fetch_one(
+            return fetch_one(
                 "SELECT * FROM application_tokens WHERE id = :id LIMIT 1",
                 {"id": token_id},
                 conn=conn,
             )
+
+    try:
+        row = await run_in_db_executor(_insert_token)
     except Exception as exc:  # noqa: BLE001
         print(f"Error creating application token: {exc}")
         raise HTTPException(
@@ -93,7 +97,7 @@ async def send_invite(payload: Dict[str, Any]) -> Dict[str, Any]:
 @router.get("/")
 async def get_invited_candidates(issued_by: str = Query(..., description="User ID who issued invites")) -> List[Dict[str, Any]]:
     try:
-        tokens = fetch_all(
+        tokens = await fetch_all_async(
             """
             SELECT *
             FROM application_tokens
@@ -138,7 +142,7 @@ async def get_invited_candidates(issued_by: str = Query(..., description="User I
 @router.get("/public/jobs")
 async def get_public_jobs() -> List[Dict[str, Any]]:
     try:
-        return fetch_all(
+        return await fetch_all_async(
             """
             SELECT id, title, description
             FROM jobs
@@ -171,7 +175,7 @@ async def send_bulk_invites(payload: Dict[str, Any]) -> Dict[str, Any]:
             token = token_urlsafe(32)
             expires_at = datetime.utcnow() + timedelta(hours=48)
             invite_url = f"{settings.app_url.rstrip('/')}/apply?token={token}"
-            execute(
+            await execute_async(
                 """
                 INSERT INTO application_tokens (
                     id, token, email, issued_by, status, expires_at, created_at
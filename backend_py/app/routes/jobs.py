@@ -4,9 +4,28 @@ from datetime import datetime
 from typing import Any, Dict, List
 from uuid import uuid4
 
-from fastapi import APIRouter, HTTPException, status
-
-from ..db import db_connection, execute, fetch_all, fetch_one
+from fastapi import APIRouter, Depends, HTTPException, status
+from starlette.concurrency import run_in_threadpool
+
+from ..db import (
+    UnitOfWork,
+    db_connection,
+    execute,
+    execute_async,
+    fetch_all_async,
+    fetch_one,
+    get_unit_of_work,
+    run_in_db_executor,
+)
+from ..services.evaluation_scheduler_service import (
+    MAX_WEIGHT,
+    MIN_WEIGHT,
+    get_lane_weight,
+    lane_length,
+    set_lane_weight,
+)
+from ..services.job_cache_service import get_job, invalidate_job
+from ..services.question_cache_service import invalidate_job_questions
 
 
 router = APIRouter(prefix="/api/jobs", tags=["jobs"])
@@ -19,7 +38,7 @@ def _now_db() -> datetime:
 @router.get("/", response_model=List[Dict[str, Any]])
 async def get_jobs() -> List[Dict[str, Any]]:
     try:
-        return fetch_all("SELECT * FROM jobs ORDER BY created_at DESC")
+        return await fetch_all_async("SELECT * FROM jobs ORDER BY created_at DESC")
     except Exception as exc:  # noqa: BLE001
         print("Error fetching jobs:", exc)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch jobs") from exc
@@ -28,7 +47,7 @@ async def get_jobs() -> List[Dict[str, Any]]:
 @router.get("/{job_id}")
 async def get_job_by_id(job_id: str) -> Dict[str, Any]:
     try:
-        row = fetch_one("SELECT * FROM jobs WHERE id = :job_id LIMIT 1", {"job_id": job_id})
+        row = await run_in_db_executor(get_job, job_id)
     except Exception as exc:  # noqa: BLE001
         print("Error fetching job:", exc)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch job") from exc
@@ -50,7 +69,8 @@ async def create_job(payload: Dict[str, Any]) -> Dict[str, Any]:
 
     job_id = str(uuid4())
     created_at = _now_db()
-    try:
+
+    def _insert_job() -> Dict[str, Any] | None:
         with db_connection(transactional=True) as conn:
             execute(
                 """
@@ -66,7 +86,10 @@ async def create_job(payload: Dict[str, Any]) -> Dict[str, Any]:
                 },
                 conn=conn,
             )
-            row = fetch_one("SELECT * FROM jobs WHERE id = :job_id LIMIT 1", {"job_id": job_id}, conn=conn)
+            return fetch_one("SELECT * FROM jobs WHERE id = :job_id LIMIT 1", {"job_id": job_id}, conn=conn)
+
+    try:
+        row = await run_in_db_executor(_insert_job)
     except Exception as exc:  # noqa: BLE001
         print("Error creating job:", exc)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to create job") from exc
@@ -76,7 +99,11 @@ async def create_job(payload: Dict[str, Any]) -> Dict[str, Any]:
 
 
 @router.put("/{job_id}")
-async def update_job(job_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+async def update_job(
+    job_id: str,
+    payload: Dict[str, Any],
+    uow: UnitOfWork = Depends(get_unit_of_work),
+) -> Dict[str, Any]:
     title = payload.get("title")
     description = payload.get("description")
     status_value = payload.get("status")
@@ -86,7 +113,7 @@ async def update_job(job_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
     if status_value not in ("open", "closed"):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Status must be 'open' or 'closed'")
 
-    try:
+    def _update_job() -> Dict[str, Any] | None:
         with db_connection(transactional=True) as conn:
             result = execute(
                 """
@@ -104,7 +131,12 @@ async def update_job(job_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
             )
             if result.rowcount == 0:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
-            row = fetch_one("SELECT * FROM jobs WHERE id = :job_id LIMIT 1", {"job_id": job_id}, conn=conn)
+            return fetch_one("SELECT * FROM jobs WHERE id = :job_id LIMIT 1", {"job_id": job_id}, conn=conn)
+
+    try:
+        row = await run_in_db_executor(_update_job)
+        await uow.commit_async()
+        await run_in_db_executor(invalidate_job, job_id)
     except HTTPException:
         raise
     except Exception as exc:  # noqa: BLE001
@@ -116,11 +148,52 @@ async def update_job(job_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
 
 
 @router.delete("/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_job(job_id: str) -> None:
+async def delete_job(job_id: str, uow: UnitOfWork = Depends(get_unit_of_work)) -> None:
     try:
-        with db_connection(transactional=True) as conn:
-            execute("DELETE FROM jobs WHERE id = :job_id", {"job_id": job_id}, conn=conn)
+        await execute_async("DELETE FROM jobs WHERE id = :job_id", {"job_id": job_id})
+        await uow.commit_async()
+        await run_in_db_executor(invalidate_job, job_id)
+        await run_in_db_executor(invalidate_job_questions, job_id)
     except Exception as exc:  # noqa: BLE001
         print("Error deleting job:", exc)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to delete job") from exc
     return None
+
+
+def _evaluation_priority(job_id: str) -> Dict[str, Any]:
+    return {"job_id": job_id, "weight": get_lane_weight(job_id), "queued_evaluations": lane_length(job_id)}
+
+
+@router.get("/{job_id}/evaluation-priority")
+async def get_evaluation_priority(job_id: str) -> Dict[str, Any]:
+    try:
+        return await run_in_threadpool(_evaluation_priority, job_id)
+    except Exception as exc:  # noqa: BLE001
+        print("Error fetching evaluation priority:", exc)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch evaluation priority"
+        ) from exc
+
+
+@router.put("/{job_id}/evaluation-priority")
+async def update_evaluation_priority(job_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Share of evaluation slots this job gets relative to others (weight 1 is the default, 2 is twice as many)."""
+    weight = payload.get("weight")
+    if isinstance(weight, bool) or not isinstance(weight, (int, float)):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="weight must be a number")
+    if not MIN_WEIGHT <= weight <= MAX_WEIGHT:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"weight must be between {MIN_WEIGHT} and {MAX_WEIGHT}"
+        )
+
+    row = await run_in_db_executor(get_job, job_id)
+    if not row:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    try:
+        await run_in_threadpool(set_lane_weight, job_id, float(weight))
+        return await run_in_threadpool(_evaluation_priority, job_id)
+    except Exception as exc:  # noqa: BLE001
+        print("Error updating evaluation priority:", exc)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to update evaluation priority"
+        ) from exc
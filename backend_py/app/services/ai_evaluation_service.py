@@ -1,15 +1,26 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import time
+from functools import lru_cache
 from typing import Any, Dict, List, Literal, TypedDict, Union
 
-from openai import OpenAI
+from openai import AsyncOpenAI
 
+from .. import metrics
+from ..cache import ReadThroughCache
 from ..config import get_settings
-from ..db import execute, fetch_one, from_json_db, to_json_db
+from ..db import execute_async, from_json_db, run_in_db_executor, to_json_db
+from .job_cache_service import get_job
+from .openai_rate_limit_service import acquire_async, estimate_chat_tokens, settle_async
 
 
 Recommendation = Literal["STRONG_MATCH", "POTENTIAL_MATCH", "WEAK_MATCH"]
 
+# Part of the evaluation cache key: bump whenever the prompt or result parsing changes
+PROMPT_VERSION = "2"
+
 
 class AIEvaluationResult(TypedDict):
     score: int
@@ -27,21 +38,15 @@ class JobDetails(TypedDict):
     description: str | None
 
 
-def _get_openai_client() -> OpenAI:
+@lru_cache()
+def _get_openai_client() -> AsyncOpenAI:
+    # One client per process so concurrent evaluations share its connection pool
     settings = get_settings()
-    return OpenAI(api_key=settings.openai_api_key)
+    return AsyncOpenAI(api_key=settings.openai_api_key)
 
 
 async def get_job_details(job_id: str) -> JobDetails:
-    row = fetch_one(
-        """
-        SELECT id, title, description
-        FROM jobs
-        WHERE id = :job_id
-        LIMIT 1
-        """,
-        {"job_id": job_id},
-    )
+    row = await run_in_db_executor(get_job, job_id)
     if not row:
         raise RuntimeError("Failed to fetch job details: Job not found")
     return JobDetails(id=str(row["id"]), title=row["title"], description=row.get("description"))
@@ -112,17 +117,23 @@ IMPORTANT:
 - Be objective and fair
 - Recommendation should be based on score: 80-100 = STRONG_MATCH, 50-79 = POTENTIAL_MATCH, 0-49 = WEAK_MATCH
 """
+    model = settings.openai_model or "gpt-4o"
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+    estimated_tokens = estimate_chat_tokens(messages, max_tokens=2000)
+    await acquire_async(model, estimated_tokens, priority="background")
+
     client = _get_openai_client()
-    completion = client.chat.completions.create(
-        model=settings.openai_model or "gpt-4o",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
+    completion = await client.chat.completions.create(
+        model=model,
+        messages=messages,
         response_format={"type": "json_object"},
         temperature=0.3,
         max_tokens=2000,
     )
+    await settle_async(model, estimated_tokens, completion.usage)
     content = completion.choices[0].message.content
     if not content:
         raise RuntimeError("OpenAI returned empty response")
@@ -169,16 +180,71 @@ IMPORTANT:
     )
 
 
-async def save_evaluation(candidate_id: str, result: AIEvaluationResult) -> None:
-    execute(
+@lru_cache()
+def _evaluation_cache() -> ReadThroughCache:
+    settings = get_settings()
+    return ReadThroughCache("evaluation", settings.evaluation_cache_ttl_seconds, settings.cache_local_ttl_seconds)
+
+
+def evaluation_cache_key(resume_hash: str, job_details: JobDetails) -> str:
+    """Resume file hash + job title/description hash + model + prompt version + resume token budget."""
+    settings = get_settings()
+    job_text = f"{job_details['title']}\x1f{job_details.get('description') or ''}"
+    job_hash = hashlib.sha256(job_text.encode("utf-8")).hexdigest()
+    model = settings.openai_model or "gpt-4o"
+    return f"{resume_hash}:{job_hash}:{model}:{PROMPT_VERSION}:{settings.resume_token_budget}"
+
+
+def get_cached_evaluation(resume_hash: str | None, job_details: JobDetails) -> AIEvaluationResult | None:
+    """Blocking (Redis); coroutines call it through asyncio.to_thread."""
+    if not resume_hash:
+        return None
+    cached = _evaluation_cache().peek(evaluation_cache_key(resume_hash, job_details))
+    if not cached:
+        metrics.incr("evaluation.cache_miss")
+        return None
+    metrics.incr("evaluation.cache_hit")
+    metrics.incr("evaluation.llm_seconds_saved", cached.get("llm_seconds") or 0)
+    return AIEvaluationResult(**cached["result"])
+
+
+async def evaluate_candidate_cached(
+    resume_text: str,
+    job_details: JobDetails,
+    resume_hash: str | None,
+) -> AIEvaluationResult:
+    """evaluate_candidate, storing the result under the resume/job cache key when the hash is known."""
+    started = time.perf_counter()
+    result = await evaluate_candidate(resume_text, job_details)
+    llm_seconds = time.perf_counter() - started
+    metrics.observe("evaluation.llm_seconds", llm_seconds)
+    if resume_hash:
+        # Blocking Redis write; keep it off the event loop the concurrent evaluations share
+        await asyncio.to_thread(
+            _evaluation_cache().set,
+            evaluation_cache_key(resume_hash, job_details),
+            {"result": dict(result), "llm_seconds": llm_seconds},
+        )
+    return result
+
+
+async def save_evaluation(
+    candidate_id: str,
+    result: AIEvaluationResult,
+    resume_tokens_original: int | None = None,
+    resume_tokens_compacted: int | None = None,
+) -> None:
+    await execute_async(
         """
         INSERT INTO ai_evaluations (
             id, candidate_id, score, recommendation, matched_skills, missing_skills,
-            strengths, weaknesses, summary, status, created_at, updated_at
+            strengths, weaknesses, summary, status, resume_tokens_original, resume_tokens_compacted,
+            created_at, updated_at
         )
         VALUES (
             UUID(), :candidate_id, :score, :recommendation, :matched_skills, :missing_skills,
-            :strengths, :weaknesses, :summary, 'COMPLETED', NOW(), NOW()
+            :strengths, :weaknesses, :summary, 'COMPLETED', :resume_tokens_original, :resume_tokens_compacted,
+            NOW(), NOW()
         )
         ON DUPLICATE KEY UPDATE
             score = VALUES(score),
@@ -190,6 +256,8 @@ async def save_evaluation(candidate_id: str, result: AIEvaluationResult) -> None
             summary = VALUES(summary),
             status = 'COMPLETED',
             error_message = NULL,
+            resume_tokens_original = VALUES(resume_tokens_original),
+            resume_tokens_compacted = VALUES(resume_tokens_compacted),
             updated_at = NOW()
         """,
         {
@@ -201,13 +269,15 @@ async def save_evaluation(candidate_id: str, result: AIEvaluationResult) -> None
             "strengths": to_json_db(result["strengths"]),
             "weaknesses": to_json_db(result["weaknesses"]),
             "summary": result["summary"],
+            "resume_tokens_original": resume_tokens_original,
+            "resume_tokens_compacted": resume_tokens_compacted,
         },
     )
 
 
 async def mark_evaluation_failed(candidate_id: str, error_message: str) -> None:
     try:
-        execute(
+        await execute_async(
             """
             INSERT INTO ai_evaluations (
                 id, candidate_id, score, recommendation, matched_skills, missing_skills,
@@ -242,7 +312,7 @@ async def mark_evaluation_failed(candidate_id: str, error_message: str) -> None:
 
 async def create_pending_evaluation(candidate_id: str) -> None:
     try:
-        execute(
+        await execute_async(
             """
             INSERT INTO ai_evaluations (
                 id, candidate_id, score, recommendation, matched_skills, missing_skills,
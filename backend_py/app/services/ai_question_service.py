@@ -7,12 +7,14 @@ from openai import OpenAI
 
 from ..config import get_settings
 from ..db import execute
+from .openai_rate_limit_service import acquire, estimate_chat_tokens, settle
+from .question_cache_service import invalidate_job_questions
 
 
-def generate_interview_questions(job_id: str, job_title: str, job_description: str) -> bool:
+def generate_question_texts(job_title: str, job_description: str) -> list[str] | None:
     """
-    Generates 3-5 interview questions based on the job description
-    and saves them to the interview_questions table.
+    Asks the model for 4 interview questions for the job description.
+    Blocking OpenAI call (and rate-limiter wait); keep it off the DB executor.
     """
     settings = get_settings()
     client = OpenAI(api_key=settings.openai_api_key)
@@ -30,12 +32,17 @@ def generate_interview_questions(job_id: str, job_title: str, job_description: s
     4. Return ONLY a raw JSON array of strings. Example: ["Question 1", "Question 2"]
     """
 
+    messages = [{"role": "user", "content": prompt}]
     try:
+        # Runs while a candidate is starting an interview
+        estimated_tokens = estimate_chat_tokens(messages)
+        acquire("gpt-4o", estimated_tokens, priority="interactive")
         response = client.chat.completions.create(
             model="gpt-4o",
-            messages=[{"role": "user", "content": prompt}],
+            messages=messages,
             temperature=0.7,
         )
+        settle("gpt-4o", estimated_tokens, response.usage)
 
         content = (response.choices[0].message.content or "").strip()
         if content.startswith("```json"):
@@ -43,24 +50,26 @@ def generate_interview_questions(job_id: str, job_title: str, job_description: s
 
         questions = json.loads(content)
         if not isinstance(questions, list):
-            return False
-
-        for idx, q_text in enumerate(questions):
-            if not str(q_text).strip():
-                continue
-            execute(
-                """
-                INSERT INTO interview_questions (id, job_id, question_text, question_order)
-                VALUES (:id, :job_id, :question_text, :question_order)
-                """,
-                {
-                    "id": str(uuid4()),
-                    "job_id": job_id,
-                    "question_text": str(q_text).strip(),
-                    "question_order": idx + 1,
-                },
-            )
-        return True
+            return None
+        return [str(q_text).strip() for q_text in questions if str(q_text).strip()]
     except Exception as exc:  # noqa: BLE001
         print(f"Error generating questions: {exc}")
-        return False
+        return None
+
+
+def save_interview_questions(job_id: str, questions: list[str]) -> None:
+    """Saves generated questions to the interview_questions table, in order."""
+    for idx, q_text in enumerate(questions):
+        execute(
+            """
+            INSERT INTO interview_questions (id, job_id, question_text, question_order)
+            VALUES (:id, :job_id, :question_text, :question_order)
+            """,
+            {
+                "id": str(uuid4()),
+                "job_id": job_id,
+                "question_text": q_text,
+                "question_order": idx + 1,
+            },
+        )
+    invalidate_job_questions(job_id)
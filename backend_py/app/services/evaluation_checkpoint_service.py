@@ -0,0 +1,61 @@
+"""
+Per-candidate checkpoints of finished evaluation stages, so a retry or a manual
+re-enqueue resumes from the last completed stage instead of starting over.
+
+One Redis hash per candidate (TTL EVAL_CHECKPOINT_TTL_SECONDS) holds:
+- resume_hash: sha256 of the resume file. The parsed text is not copied
+  here; it is read from the resume text store, which is keyed by that hash.
+- llm_key / llm_result: the model's parsed JSON result, plus the key it is
+  valid for (resume hash, job text, model, prompt version).
+
+Checkpoints are best effort: Redis errors are logged and read as "no checkpoint".
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict
+
+import orjson
+
+from ..config import get_redis_connection, get_settings
+
+
+def _checkpoint_key(candidate_id: str) -> str:
+    return f"eval_ckpt:{candidate_id}"
+
+
+def get_checkpoint(candidate_id: str) -> Dict[str, Any]:
+    try:
+        raw = get_redis_connection().hgetall(_checkpoint_key(candidate_id))
+    except Exception as exc:  # noqa: BLE001
+        print(f"[eval_checkpoint] redis read failed: {exc}")
+        return {}
+    checkpoint: Dict[str, Any] = {key.decode(): value.decode() for key, value in raw.items()}
+    if "llm_result" in checkpoint:
+        checkpoint["llm_result"] = orjson.loads(checkpoint["llm_result"])
+    return checkpoint
+
+
+def save_checkpoint(candidate_id: str, **fields: Any) -> None:
+    mapping = {
+        key: orjson.dumps(value) if key == "llm_result" else str(value)
+        for key, value in fields.items()
+        if value is not None
+    }
+    if not mapping:
+        return
+    key = _checkpoint_key(candidate_id)
+    try:
+        with get_redis_connection().pipeline() as pipeline:
+            pipeline.hset(key, mapping=mapping)
+            pipeline.expire(key, get_settings().eval_checkpoint_ttl_seconds)
+            pipeline.execute()
+    except Exception as exc:  # noqa: BLE001
+        print(f"[eval_checkpoint] redis write failed: {exc}")
+
+
+def clear_checkpoint(candidate_id: str) -> None:
+    try:
+        get_redis_connection().delete(_checkpoint_key(candidate_id))
+    except Exception as exc:  # noqa: BLE001
+        print(f"[eval_checkpoint] redis delete failed: {exc}")
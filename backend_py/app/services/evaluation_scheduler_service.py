@@ -0,0 +1,319 @@
+"""
+Weighted fair scheduling of AI evaluations across job postings.
+
+Evaluations are not pushed straight onto the ai-evaluation RQ queue. Each job
+posting has its own Redis list (a lane). The RQ queue only holds a short
+buffer (EVAL_QUEUE_BUFFER) that fill_queue() tops up from the lanes, both
+after every enqueue and after every dequeue by a worker.
+
+Lanes are picked by virtual time, as in weighted fair queueing. Each lane has
+a score in a sorted set. The lane with the lowest score goes next, and its
+score then grows by 1 / weight. A lane that becomes active starts at the
+current virtual time, not at zero. So a 5,000-applicant campaign gets one
+slot per round like any other job, unless its weight says otherwise.
+
+Enqueues are idempotent per application: the RQ job id is derived from the
+job posting, the applicant email and the resume hash (evaluation_job_id), and
+a SET NX marker is held from enqueue until the run ends, so a second enqueue
+meanwhile is dropped. A marker left behind by a run that died without
+releasing it (SIGKILL, OOM) is taken over once no live job holds the id. At
+run time a per-candidate lease (acquire_evaluation_lease) collapses duplicates
+that got past the marker, such as manual re-runs of failed jobs, into one
+execution.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+import uuid
+from datetime import timezone
+from functools import lru_cache
+from typing import Any, Dict
+
+from rq import Queue
+from rq.exceptions import NoSuchJobError
+from rq.job import Job, JobStatus
+from rq.utils import now
+
+from .. import metrics
+from ..config import get_redis_connection, get_settings
+
+
+LANES_KEY = "eval_sched:lanes"
+VTIME_KEY = "eval_sched:vtime"
+WEIGHTS_KEY = "eval_sched:weights"
+LANE_KEY_PREFIX = "eval_sched:lane:"
+DEDUPE_KEY_PREFIX = "eval_sched:dedupe:"
+LEASE_KEY_PREFIX = "eval_lease:"
+
+# A marker younger than this may belong to an enqueue that has not saved its job yet
+MARKER_CLAIM_GRACE_SECONDS = 30
+
+DEFAULT_WEIGHT = 1.0
+MIN_WEIGHT = 0.1
+MAX_WEIGHT = 100.0
+
+# KEYS: lanes zset, vtime, lane list. ARGV: lane id, RQ job id.
+_ENQUEUE_LUA = """
+local vtime = tonumber(redis.call('GET', KEYS[2]) or '0')
+redis.call('ZADD', KEYS[1], 'NX', vtime, ARGV[1])
+return redis.call('RPUSH', KEYS[3], ARGV[2])
+"""
+
+# KEYS: lanes zset, vtime, weights hash, RQ queue list. ARGV: buffer size, lane key prefix.
+# Moves job ids from the lowest-score lanes to the RQ queue until it holds `buffer` ids.
+_FILL_LUA = """
+local moved = 0
+local missing = tonumber(ARGV[1]) - redis.call('LLEN', KEYS[4])
+while missing > 0 do
+    local head = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    if #head == 0 then
+        break
+    end
+    local lane, score = head[1], tonumber(head[2])
+    local lane_key = ARGV[2] .. lane
+    local job_id = redis.call('LPOP', lane_key)
+    if job_id then
+        redis.call('RPUSH', KEYS[4], job_id)
+        redis.call('SET', KEYS[2], score)
+        moved = moved + 1
+        missing = missing - 1
+    end
+    if redis.call('LLEN', lane_key) == 0 then
+        redis.call('ZREM', KEYS[1], lane)
+    else
+        local weight = tonumber(redis.call('HGET', KEYS[3], lane) or '1')
+        redis.call('ZADD', KEYS[1], score + 1 / weight, lane)
+    end
+end
+return moved
+"""
+
+
+# KEYS[1] lease. ARGV[1] token. Deletes the lease only if this run still owns it.
+_RELEASE_LEASE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# KEYS[1] dedupe marker. ARGV: value seen, new value, TTL (s). Replaces the marker only if it is unchanged.
+_TAKE_OVER_MARKER_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+    return 1
+end
+return 0
+"""
+
+# Jobs in these states still hold their id; a new job with the same id would overwrite them
+_LIVE_STATUSES = {JobStatus.QUEUED, JobStatus.STARTED, JobStatus.DEFERRED, JobStatus.SCHEDULED}
+
+
+def _lane_key(lane: str) -> str:
+    return f"{LANE_KEY_PREFIX}{lane}"
+
+
+def evaluation_job_id(job_posting_id: str, email: str, resume_hash: str) -> str:
+    """Deterministic RQ job id for one application: job posting, applicant email and resume file."""
+    key = "\n".join((job_posting_id, email.strip().lower(), resume_hash))
+    return f"eval-{hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]}"
+
+
+@lru_cache()
+def _enqueue_script():
+    return get_redis_connection().register_script(_ENQUEUE_LUA)
+
+
+@lru_cache()
+def _fill_script():
+    return get_redis_connection().register_script(_FILL_LUA)
+
+
+@lru_cache()
+def _release_lease_script():
+    return get_redis_connection().register_script(_RELEASE_LEASE_LUA)
+
+
+@lru_cache()
+def _take_over_marker_script():
+    return get_redis_connection().register_script(_TAKE_OVER_MARKER_LUA)
+
+
+def fill_queue(queue: Queue) -> int:
+    """Top the RQ queue up to EVAL_QUEUE_BUFFER jobs from the lanes; returns how many were moved."""
+    moved = int(
+        _fill_script()(
+            keys=[LANES_KEY, VTIME_KEY, WEIGHTS_KEY, queue.key],
+            args=[get_settings().eval_queue_buffer, LANE_KEY_PREFIX],
+        )
+    )
+    if moved:
+        metrics.incr("eval_sched.dispatched", moved)
+    return moved
+
+
+def _fetch_job(queue: Queue, job_id: str) -> Job | None:
+    try:
+        return Job.fetch(job_id, connection=queue.connection)
+    except NoSuchJobError:
+        return None
+
+
+def _take_over_stale_marker(queue: Queue, job_id: str, marker: str, claim: str, ttl: int) -> bool:
+    """
+    Take over a marker whose run ended without releasing it (worker SIGKILLed or OOM-killed),
+    so the evaluation is not blocked until the marker expires. The marker holds its claim time.
+    """
+    held = queue.connection.get(marker)
+    if held is None:
+        # Released in the meantime
+        return bool(queue.connection.set(marker, claim, nx=True, ex=ttl))
+    try:
+        claimed_at = float(held)
+    except ValueError:
+        # Markers set before claim times were recorded hold the job id
+        claimed_at = 0.0
+    if time.time() - claimed_at < MARKER_CLAIM_GRACE_SECONDS:
+        return False
+    previous = _fetch_job(queue, job_id)
+    if previous is not None and previous.get_status(refresh=False) in _LIVE_STATUSES:
+        return False
+    if not _take_over_marker_script()(keys=[marker], args=[held, claim, ttl]):
+        return False
+    metrics.incr("eval_sched.stale_marker_taken_over")
+    return True
+
+
+def _claim_job_id(queue: Queue, job_id: str) -> bool:
+    """Take the enqueue marker for job_id; False when a job with that id is already queued or running."""
+    marker = f"{DEDUPE_KEY_PREFIX}{job_id}"
+    ttl = get_settings().eval_dedupe_ttl_seconds
+    claim = f"{time.time():.6f}"
+    if not queue.connection.set(marker, claim, nx=True, ex=ttl):
+        if not _take_over_stale_marker(queue, job_id, marker, claim, ttl):
+            return False
+    previous = _fetch_job(queue, job_id)
+    if previous is None:
+        return True
+    if previous.get_status(refresh=False) in _LIVE_STATUSES:
+        # Marker expired or was cleared while the job was still queued or finishing up
+        queue.connection.delete(marker)
+        return False
+    # A finished or failed run of the same evaluation: replace it
+    previous.delete()
+    return True
+
+
+def release_job_id(job_id: str) -> None:
+    """Drop the enqueue marker once the run has ended, so the evaluation can be enqueued again."""
+    try:
+        get_redis_connection().delete(f"{DEDUPE_KEY_PREFIX}{job_id}")
+    except Exception as exc:  # noqa: BLE001
+        print(f"[eval_sched] redis delete failed: {exc}")
+
+
+def enqueue_evaluation(
+    queue: Queue,
+    lane: str,
+    func: str,
+    kwargs: Dict[str, Any],
+    timeout: int,
+    job_id: str | None = None,
+) -> Job | None:
+    """
+    Create the RQ job as queue.enqueue would, but park its id in the lane for `lane`
+    (the job posting id) instead of the RQ queue. fill_queue() dispatches it.
+    With a job_id (see evaluation_job_id), returns None without enqueueing when a job
+    with that id is already queued or running.
+    """
+    if job_id and not _claim_job_id(queue, job_id):
+        metrics.incr("eval_sched.duplicate_suppressed")
+        print(f"[eval_sched] Evaluation {job_id} already queued or running, not enqueued again")
+        return None
+    job = queue.create_job(func, kwargs=kwargs, timeout=timeout, job_id=job_id)
+    job.origin = queue.name
+    job.enqueued_at = now()
+    with queue.connection.pipeline() as pipeline:
+        pipeline.sadd(queue.redis_queues_keys, queue.key)
+        job.set_status(JobStatus.QUEUED, pipeline=pipeline)
+        job.save(pipeline=pipeline)
+        _enqueue_script()(keys=[LANES_KEY, VTIME_KEY, _lane_key(lane)], args=[lane, job.id], client=pipeline)
+        pipeline.execute()
+    metrics.incr("eval_sched.enqueued")
+    fill_queue(queue)
+    return job
+
+
+def acquire_evaluation_lease(candidate_id: str) -> str | None:
+    """
+    Token for the only run allowed for this candidate, or None while another run holds
+    the lease. The lease expires after EVAL_LEASE_SECONDS in case its holder dies.
+    If Redis is unavailable the run goes ahead.
+    """
+    token = uuid.uuid4().hex
+    try:
+        acquired = get_redis_connection().set(
+            f"{LEASE_KEY_PREFIX}{candidate_id}", token, nx=True, ex=get_settings().eval_lease_seconds
+        )
+    except Exception as exc:  # noqa: BLE001
+        print(f"[eval_sched] redis lease failed, running unleased: {exc}")
+        return token
+    return token if acquired else None
+
+
+def release_evaluation_lease(candidate_id: str, token: str) -> None:
+    try:
+        _release_lease_script()(keys=[f"{LEASE_KEY_PREFIX}{candidate_id}"], args=[token])
+    except Exception as exc:  # noqa: BLE001
+        print(f"[eval_sched] redis lease release failed: {exc}")
+
+
+def get_lane_weight(lane: str) -> float:
+    raw = get_redis_connection().hget(WEIGHTS_KEY, lane)
+    return float(raw) if raw is not None else DEFAULT_WEIGHT
+
+
+def set_lane_weight(lane: str, weight: float) -> None:
+    """Relative share of dispatch slots for this job posting (default 1, 2 = twice as many)."""
+    if not MIN_WEIGHT <= weight <= MAX_WEIGHT:
+        raise ValueError(f"weight must be between {MIN_WEIGHT} and {MAX_WEIGHT}")
+    if weight == DEFAULT_WEIGHT:
+        get_redis_connection().hdel(WEIGHTS_KEY, lane)
+    else:
+        get_redis_connection().hset(WEIGHTS_KEY, lane, weight)
+
+
+def lane_length(lane: str) -> int:
+    return int(get_redis_connection().llen(_lane_key(lane)))
+
+
+def backlog(queue: Queue) -> Dict[str, Any]:
+    """Jobs waiting in lanes and in the RQ buffer, and the age in seconds of the oldest one."""
+    redis_conn = get_redis_connection()
+    lanes = [lane.decode() if isinstance(lane, bytes) else lane for lane in redis_conn.zrange(LANES_KEY, 0, -1)]
+    with redis_conn.pipeline() as pipeline:
+        for lane in lanes:
+            pipeline.llen(_lane_key(lane))
+            pipeline.lindex(_lane_key(lane), 0)
+        pipeline.lindex(queue.key, 0)
+        results = pipeline.execute()
+
+    lane_lengths = results[0:-1:2]
+    head_ids = [job_id for job_id in results[1:-1:2] + [results[-1]] if job_id]
+    oldest_age = 0.0
+    current = now()
+    for job in Job.fetch_many([job_id.decode() for job_id in head_ids], connection=queue.connection):
+        if job is None or not job.enqueued_at:
+            continue
+        enqueued_at = job.enqueued_at
+        if enqueued_at.tzinfo is None:
+            enqueued_at = enqueued_at.replace(tzinfo=timezone.utc)
+        oldest_age = max(oldest_age, (current - enqueued_at).total_seconds())
+    return {
+        "depth": sum(lane_lengths) + queue.count,
+        "lanes": len(lanes),
+        "oldest_age_seconds": oldest_age,
+    }
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 from typing import Any, Dict
@@ -8,8 +9,9 @@ import PyPDF2
 from openai import OpenAI
 
 from ..config import get_settings
-from ..db import execute, to_json_db
+from ..db import execute, run_in_db_executor, to_json_db
 from .interview_service import fetch_interview_transcript, get_job_description_by_sessionid
+from .openai_rate_limit_service import acquire_async, estimate_chat_tokens, settle_async
 
 
 def save_evaluation_to_db(session_id: str, grading_result: dict) -> bool:
@@ -107,7 +109,7 @@ async def grade_interview_session(session_id: str, pdf_path: str = None) -> Dict
     settings = get_settings()
     client = OpenAI(api_key=settings.openai_api_key)
 
-    job_context = get_job_description_by_sessionid(session_id)
+    job_context = await run_in_db_executor(get_job_description_by_sessionid, session_id)
     if not job_context:
         print("Warning: Job description not found, AI grading might be less accurate.")
         job_context = "General Software Engineering Role"
@@ -117,7 +119,7 @@ async def grade_interview_session(session_id: str, pdf_path: str = None) -> Dict
         pdf_text = read_transcript_from_pdf(pdf_path)
         transcript_data = parse_transcript_text(pdf_text)
     else:
-        transcript_data = fetch_interview_transcript(session_id) or []
+        transcript_data = await run_in_db_executor(fetch_interview_transcript, session_id) or []
 
     system_prompt = (
         "You are an expert technical interviewer and hiring manager. "
@@ -149,18 +151,24 @@ async def grade_interview_session(session_id: str, pdf_path: str = None) -> Dict
         "5. Areas for Improvement: Focus on red flags or weak spots (e.g., 'Limited Professional Experience', 'Theoretical Knowledge only')."
     )
 
-    response = client.chat.completions.create(
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {
+            "role": "user",
+            "content": f"JOB CONTEXT:\n{job_context}\n\nINTERVIEW TRANSCRIPT:\n{transcript_data}",
+        },
+    ]
+    estimated_tokens = estimate_chat_tokens(messages)
+    await acquire_async("gpt-4o-mini", estimated_tokens, priority="interactive")
+    # Sync client: run the request in a thread so it does not block the event loop
+    response = await asyncio.to_thread(
+        client.chat.completions.create,
         model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {
-                "role": "user",
-                "content": f"JOB CONTEXT:\n{job_context}\n\nINTERVIEW TRANSCRIPT:\n{transcript_data}",
-            },
-        ],
+        messages=messages,
         response_format={"type": "json_object"},
         temperature=0.2,
     )
+    await settle_async("gpt-4o-mini", estimated_tokens, response.usage)
 
     content = response.choices[0].message.content
     try:
@@ -4,32 +4,57 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 from uuid import uuid4
 
-from ..db import execute, fetch_all, fetch_one, from_json_db
-from .ai_question_service import generate_interview_questions
+from starlette.concurrency import run_in_threadpool
+
+from ..db import (
+    execute,
+    fetch_all,
+    fetch_one,
+    from_json_db,
+    outside_unit_of_work,
+    run_in_db_executor,
+    unit_of_work,
+)
+from .ai_question_service import generate_question_texts, save_interview_questions
+from .job_cache_service import get_job, get_job_for_session
+from .question_cache_service import get_job_questions, next_question
 
 
 def _now_db() -> datetime:
     return datetime.utcnow()
 
 
-def create_interview_session(candidate_id: str, job_id: str) -> Dict[str, Any]:
+async def ensure_interview_questions(job_id: str) -> None:
+    """
+    Generates questions for a job that has none yet. Only the DB reads and writes go
+    through the DB executor; the OpenAI call runs in the general threadpool, so it
+    does not hold a DB executor slot while it waits. The DB work runs outside the
+    caller's unit of work, so no connection or transaction is held during the call.
+    """
     try:
-        q_check = fetch_one(
-            "SELECT COUNT(*) AS total FROM interview_questions WHERE job_id = :job_id",
-            {"job_id": job_id},
-        )
-        total = int(q_check["total"]) if q_check else 0
-        if total == 0:
-            job_res = fetch_one(
-                "SELECT title, description FROM jobs WHERE id = :job_id LIMIT 1",
-                {"job_id": job_id},
+        with outside_unit_of_work():
+            if await run_in_db_executor(get_job_questions, job_id):
+                return
+            job_res = await run_in_db_executor(get_job, job_id)
+            if not job_res:
+                return
+            print(f"Generating questions for Job {job_id}...")
+            questions = await run_in_threadpool(
+                generate_question_texts, job_res["title"], job_res.get("description") or ""
             )
-            if job_res:
-                print(f"Generating questions for Job {job_id}...")
-                generate_interview_questions(job_id, job_res["title"], job_res.get("description") or "")
+            if questions:
+                await run_in_db_executor(_save_questions_atomically, job_id, questions)
     except Exception as exc:  # noqa: BLE001
         print(f"Warning: Question generation check failed: {exc}")
 
+
+def _save_questions_atomically(job_id: str, questions: list[str]) -> None:
+    with unit_of_work():
+        save_interview_questions(job_id, questions)
+
+
+def create_interview_session(candidate_id: str, job_id: str) -> Dict[str, Any]:
+    """Existing or new session for the candidate; call ensure_interview_questions first."""
     try:
         existing = fetch_one(
             """
@@ -89,37 +114,7 @@ def get_session_by_token(token: str) -> Dict[str, Any] | None:
 
 def get_next_question(job_id: str, last_question_id: Optional[str]) -> Optional[Dict[str, Any]]:
     try:
-        if last_question_id:
-            last_res = fetch_one(
-                "SELECT question_order FROM interview_questions WHERE id = :id LIMIT 1",
-                {"id": last_question_id},
-            )
-            if not last_res:
-                return get_next_question(job_id, None)
-
-            last_order = int(last_res["question_order"])
-            rows = fetch_all(
-                """
-                SELECT *
-                FROM interview_questions
-                WHERE job_id = :job_id AND question_order > :last_order
-                ORDER BY question_order ASC
-                LIMIT 1
-                """,
-                {"job_id": job_id, "last_order": last_order},
-            )
-        else:
-            rows = fetch_all(
-                """
-                SELECT *
-                FROM interview_questions
-                WHERE job_id = :job_id
-                ORDER BY question_order ASC
-                LIMIT 1
-                """,
-                {"job_id": job_id},
-            )
-        return rows[0] if rows else None
+        return next_question(job_id, last_question_id)
     except Exception as exc:  # noqa: BLE001
         print(f"Error getting question: {exc}")
         return None
@@ -224,16 +219,7 @@ def complete_interview_session(session_id: str, duration_seconds: Optional[int])
 
 def get_job_description_by_sessionid(session_id: str) -> str:
     try:
-        row = fetch_one(
-            """
-            SELECT j.title, j.description
-            FROM interview_sessions s
-            LEFT JOIN jobs j ON j.id = s.job_id
-            WHERE s.id = :session_id
-            LIMIT 1
-            """,
-            {"session_id": session_id},
-        )
+        row = get_job_for_session(session_id)
         if row:
             return f"Role: {row.get('title')}\n\nDescription: {row.get('description')}"
         return ""
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict
+
+from ..cache import ReadThroughCache
+from ..config import get_settings
+from ..db import fetch_one
+
+
+@lru_cache()
+def _job_cache() -> ReadThroughCache:
+    settings = get_settings()
+    return ReadThroughCache("job", settings.job_cache_ttl_seconds, settings.cache_local_ttl_seconds)
+
+
+@lru_cache()
+def _session_job_cache() -> ReadThroughCache:
+    # A session never moves to another job, so this mapping only expires by TTL
+    settings = get_settings()
+    return ReadThroughCache("session_job", settings.job_cache_ttl_seconds, settings.cache_local_ttl_seconds)
+
+
+def get_job(job_id: str) -> Dict[str, Any] | None:
+    """Job row (``SELECT * FROM jobs``) served from cache; datetimes come back as ISO strings."""
+    return _job_cache().get(
+        job_id,
+        lambda: fetch_one("SELECT * FROM jobs WHERE id = :job_id LIMIT 1", {"job_id": job_id}),
+    )
+
+
+def get_job_for_session(session_id: str) -> Dict[str, Any] | None:
+    mapping = _session_job_cache().get(
+        session_id,
+        lambda: fetch_one(
+            "SELECT job_id FROM interview_sessions WHERE id = :session_id LIMIT 1",
+            {"session_id": session_id},
+        ),
+    )
+    if not mapping or not mapping.get("job_id"):
+        return None
+    return get_job(str(mapping["job_id"]))
+
+
+def invalidate_job(job_id: str) -> None:
+    """Call after the job change is committed so a concurrent miss cannot re-cache the old row."""
+    _job_cache().invalidate(job_id)
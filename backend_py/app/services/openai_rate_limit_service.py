@@ -0,0 +1,186 @@
+"""
+Redis token buckets shared by every process that calls OpenAI.
+
+Each model has a requests-per-minute and a tokens-per-minute bucket, refilled
+continuously in Redis so the API and all workers draw from the same budget.
+Background callers (resume evaluation) must leave OPENAI_INTERACTIVE_RESERVE
+of each bucket untouched, so interview-path calls (TTS, Whisper, question
+generation, grading) still get through while a backlog is being evaluated.
+Token costs are estimates taken before the call and corrected with the
+reported usage afterwards (settle).
+
+If Redis is unavailable the limiter lets calls through.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Literal, Tuple
+
+from .. import metrics
+from ..config import get_redis_connection, get_settings
+from .resume_compaction_service import estimate_tokens
+
+
+Priority = Literal["interactive", "background"]
+
+# Completion budget assumed for calls that do not set max_tokens
+DEFAULT_COMPLETION_TOKENS = 1000
+# Per-message overhead of the chat format (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+_BUCKET_TTL_MS = 120_000
+
+# KEYS[1] bucket hash; ARGV: rpm, tpm, request cost, token cost, reserve fraction, force.
+# Returns 0 when the cost was taken, otherwise the milliseconds until it would fit.
+# A token cost larger than the usable bucket is checked as "bucket full" and taken as debt.
+_ACQUIRE_LUA = """
+local rpm = tonumber(ARGV[1])
+local tpm = tonumber(ARGV[2])
+local req_cost = tonumber(ARGV[3])
+local tok_cost = tonumber(ARGV[4])
+local reserve = tonumber(ARGV[5])
+local force = ARGV[6] == '1'
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + tonumber(t[2]) / 1000
+local state = redis.call('HMGET', KEYS[1], 'req', 'tok', 'ts')
+local req = tonumber(state[1]) or rpm
+local tok = tonumber(state[2]) or tpm
+local elapsed = math.max(0, now - (tonumber(state[3]) or now))
+req = math.min(rpm, req + elapsed * rpm / 60000)
+if tpm > 0 then
+    tok = math.min(tpm, tok + elapsed * tpm / 60000)
+end
+
+local wait = 0
+if not force then
+    local need_req = req_cost + rpm * reserve - req
+    if need_req > 0 then
+        wait = need_req * 60000 / rpm
+    end
+    if tpm > 0 then
+        local need_tok = math.min(tok_cost, tpm * (1 - reserve)) + tpm * reserve - tok
+        if need_tok > 0 then
+            wait = math.max(wait, need_tok * 60000 / tpm)
+        end
+    end
+end
+
+if wait <= 0 then
+    req = req - req_cost
+    if tpm > 0 then
+        tok = math.min(tpm, tok - tok_cost)
+    end
+end
+redis.call('HSET', KEYS[1], 'req', req, 'tok', tok, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], ARGV[7])
+if wait <= 0 then
+    return 0
+end
+return math.ceil(wait)
+"""
+
+
+class RateLimitTimeout(RuntimeError):
+    pass
+
+
+@lru_cache()
+def _acquire_script():
+    return get_redis_connection().register_script(_ACQUIRE_LUA)
+
+
+def model_limits(model: str) -> Tuple[float, float]:
+    """(rpm, tpm) actually handed out for this model, i.e. the account limits times the headroom."""
+    settings = get_settings()
+    rpm, tpm = settings.openai_rate_limits.get(model, (settings.openai_default_rpm, settings.openai_default_tpm))
+    headroom = settings.openai_rate_limit_headroom
+    return rpm * headroom, tpm * headroom
+
+
+def estimate_chat_tokens(messages: Iterable[Dict[str, Any]], max_tokens: int | None = None) -> int:
+    """Prompt estimate plus the completion budget, what OpenAI counts against TPM up front."""
+    prompt = sum(estimate_tokens(str(message.get("content") or "")) + MESSAGE_OVERHEAD_TOKENS for message in messages)
+    return prompt + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+
+
+def _try_acquire(model: str, tokens: int, priority: Priority, force: bool = False, requests: int = 1) -> float:
+    """Seconds to wait before retrying, 0 when the request and tokens were taken."""
+    rpm, tpm = model_limits(model)
+    reserve = 0.0 if priority == "interactive" else get_settings().openai_interactive_reserve
+    try:
+        wait_ms = _acquire_script()(
+            keys=[f"openai_ratelimit:{model}"],
+            args=[rpm, tpm, requests, tokens, reserve, "1" if force else "0", _BUCKET_TTL_MS],
+        )
+    except Exception as exc:  # noqa: BLE001
+        metrics.incr("openai_limiter.redis_error")
+        print(f"[openai_limiter] redis error, not limiting: {exc}")
+        return 0.0
+    return int(wait_ms) / 1000
+
+
+def _max_wait(priority: Priority) -> float:
+    settings = get_settings()
+    if priority == "interactive":
+        return settings.openai_interactive_max_wait_seconds
+    return settings.openai_background_max_wait_seconds
+
+
+def _on_timeout(model: str, priority: Priority, tokens: int) -> None:
+    metrics.incr(f"openai_limiter.{priority}.timeout")
+    if priority == "background":
+        raise RateLimitTimeout(f"OpenAI rate limit: no capacity for {model} within {_max_wait(priority):.0f}s")
+    # Interview-path calls go ahead rather than fail the candidate; the bucket takes the debt
+    _try_acquire(model, tokens, priority, force=True)
+
+
+def acquire(model: str, tokens: int = 0, priority: Priority = "background") -> None:
+    """Block until one request and `tokens` estimated tokens are available for model."""
+    deadline = time.monotonic() + _max_wait(priority)
+    started = time.monotonic()
+    while True:
+        wait = _try_acquire(model, tokens, priority)
+        if wait <= 0:
+            break
+        if time.monotonic() + wait > deadline:
+            _on_timeout(model, priority, tokens)
+            break
+        metrics.incr(f"openai_limiter.{priority}.throttled")
+        time.sleep(wait)
+    metrics.observe(f"openai_limiter.{priority}.wait_seconds", time.monotonic() - started)
+
+
+async def acquire_async(model: str, tokens: int = 0, priority: Priority = "background") -> None:
+    """
+    acquire() for coroutines: the Redis calls run in a thread and waits use asyncio.sleep,
+    so a slow Redis or a full bucket does not stall other calls on the event loop.
+    """
+    deadline = time.monotonic() + _max_wait(priority)
+    started = time.monotonic()
+    while True:
+        wait = await asyncio.to_thread(_try_acquire, model, tokens, priority)
+        if wait <= 0:
+            break
+        if time.monotonic() + wait > deadline:
+            await asyncio.to_thread(_on_timeout, model, priority, tokens)
+            break
+        metrics.incr(f"openai_limiter.{priority}.throttled")
+        await asyncio.sleep(wait)
+    metrics.observe(f"openai_limiter.{priority}.wait_seconds", time.monotonic() - started)
+
+
+def settle(model: str, estimated_tokens: int, usage: Any) -> None:
+    """Correct the token bucket with the usage OpenAI reported (refund or extra charge)."""
+    actual = getattr(usage, "total_tokens", None)
+    if actual is None or actual == estimated_tokens:
+        return
+    _try_acquire(model, actual - estimated_tokens, "interactive", force=True, requests=0)
+
+
+async def settle_async(model: str, estimated_tokens: int, usage: Any) -> None:
+    """settle() for coroutines, with the Redis call in a thread."""
+    await asyncio.to_thread(settle, model, estimated_tokens, usage)
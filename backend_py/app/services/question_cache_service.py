@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from ..cache import ReadThroughCache
+from ..config import get_settings
+from ..db import fetch_all
+
+
+@lru_cache()
+def _question_cache() -> ReadThroughCache:
+    settings = get_settings()
+    return ReadThroughCache("job_questions", settings.job_cache_ttl_seconds, settings.cache_local_ttl_seconds)
+
+
+def _load_sequence(job_id: str) -> Dict[str, Any] | None:
+    rows = fetch_all(
+        "SELECT * FROM interview_questions WHERE job_id = :job_id ORDER BY question_order ASC",
+        {"job_id": job_id},
+    )
+    if not rows:
+        # Not cached, so questions generated a moment later are picked up on the next call
+        return None
+    return {"questions": rows, "positions": {str(row["id"]): idx for idx, row in enumerate(rows)}}
+
+
+def get_question_sequence(job_id: str) -> Dict[str, Any] | None:
+    """Ordered questions for a job plus an id -> position map, served from cache."""
+    return _question_cache().get(job_id, lambda: _load_sequence(job_id))
+
+
+def get_job_questions(job_id: str) -> List[Dict[str, Any]]:
+    sequence = get_question_sequence(job_id)
+    return sequence["questions"] if sequence else []
+
+
+def next_question(job_id: str, last_question_id: Optional[str]) -> Optional[Dict[str, Any]]:
+    """First question when last_question_id is empty or unknown for this job, otherwise the one after it."""
+    sequence = get_question_sequence(job_id)
+    if not sequence:
+        return None
+    questions = sequence["questions"]
+    position = sequence["positions"].get(str(last_question_id)) if last_question_id else None
+    index = 0 if position is None else position + 1
+    return questions[index] if index < len(questions) else None
+
+
+def invalidate_job_questions(job_id: str) -> None:
+    """Call after questions for the job are written or removed."""
+    _question_cache().invalidate(job_id)
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+
+@dataclass
+class CompactionResult:
+    text: str
+    original_tokens: int
+    compacted_tokens: int
+
+
+# Word pieces, numbers and single symbols, roughly how BPE tokenizers split English text
+_TOKEN_PIECE_RE = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+_NORMALIZE_RE = re.compile(r"[\W_]+")
+
+_HEADINGS_BY_KIND: Dict[str, Tuple[str, ...]] = {
+    "experience": (
+        "experience", "work experience", "professional experience", "employment", "employment history",
+        "work history", "career history", "relevant experience",
+    ),
+    "skills": ("skills", "technical skills", "core skills", "key skills", "competencies", "core competencies",
+               "technologies", "tech stack", "tools"),
+    "education": ("education", "academic background", "qualifications", "education and training"),
+    "summary": ("summary", "profile", "professional summary", "about me", "objective", "career objective"),
+    "projects": ("projects", "key projects", "personal projects", "selected projects"),
+    "certifications": ("certifications", "certificates", "licenses", "courses", "training"),
+    "other": ("awards", "achievements", "publications", "languages", "volunteering", "volunteer experience",
+              "activities", "leadership"),
+    "interests": ("interests", "hobbies", "hobbies and interests", "personal interests"),
+    "references": ("references", "referees"),
+}
+# Normalized heading text -> section kind
+_SECTION_HEADINGS: Dict[str, str] = {
+    heading: kind for kind, headings in _HEADINGS_BY_KIND.items() for heading in headings
+}
+
+# Lower is kept first when the budget is tight; references never reach the model
+SECTION_PRIORITY: Tuple[str, ...] = (
+    "experience", "skills", "education", "summary", "projects", "certifications", "other", "interests",
+)
+_DROPPED_SECTIONS = {"references"}
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Local token estimate, no tokenizer download needed: one token per symbol or
+    number, and words cost about one token per four letters.
+    """
+    total = 0
+    for piece in _TOKEN_PIECE_RE.findall(text or ""):
+        total += 1 if len(piece) <= 4 else (len(piece) + 3) // 4
+    return total
+
+
+def _normalize(line: str) -> str:
+    return _NORMALIZE_RE.sub(" ", line.lower()).strip()
+
+
+def _section_kind(line: str) -> str | None:
+    if len(line) > 40:
+        return None
+    return _SECTION_HEADINGS.get(_normalize(line))
+
+
+def _truncate_to_tokens(line: str, budget: int) -> str:
+    words: List[str] = []
+    used = 0
+    for word in line.split(" "):
+        cost = estimate_tokens(word)
+        if used + cost > budget:
+            break
+        words.append(word)
+        used += cost
+    return " ".join(words)
+
+
+def _split_sections(lines: List[str]) -> List[Tuple[str, List[str]]]:
+    # Text before the first heading is usually the name/headline/summary
+    sections: List[Tuple[str, List[str]]] = [("summary", [])]
+    for line in lines:
+        kind = _section_kind(line)
+        if kind:
+            sections.append((kind, [line]))
+        else:
+            sections[-1][1].append(line)
+    return [section for section in sections if section[1]]
+
+
+def compact_resume(text: str, token_budget: int) -> CompactionResult:
+    """
+    Drop repeated lines and sections and the references section, then keep
+    sections by SECTION_PRIORITY until token_budget is reached. Kept lines
+    stay in their original order.
+    """
+    original_tokens = estimate_tokens(text)
+
+    seen_lines = set()
+    lines: List[str] = []
+    for line in (text or "").splitlines():
+        line = line.strip()
+        key = _normalize(line)
+        if not key:
+            continue
+        # Headings may legitimately repeat (e.g. "Skills" per role); their content may not
+        if key in seen_lines and not _section_kind(line):
+            continue
+        seen_lines.add(key)
+        lines.append(line)
+
+    seen_sections = set()
+    sections: List[Tuple[int, str, List[str]]] = []
+    for index, (kind, section_lines) in enumerate(_split_sections(lines)):
+        body = [line for line in section_lines if not _section_kind(line)]
+        if kind in _DROPPED_SECTIONS or not body:
+            continue
+        key = (kind, tuple(_normalize(line) for line in body))
+        if key in seen_sections:
+            continue
+        seen_sections.add(key)
+        sections.append((index, kind, section_lines))
+
+    def _priority(section: Tuple[int, str, List[str]]) -> Tuple[int, int]:
+        kind = section[1]
+        rank = SECTION_PRIORITY.index(kind) if kind in SECTION_PRIORITY else len(SECTION_PRIORITY)
+        return rank, section[0]
+
+    kept: Dict[int, List[str]] = {}
+    used = 0
+    for index, _kind, section_lines in sorted(sections, key=_priority):
+        for line in section_lines:
+            # +1 for the line break
+            cost = estimate_tokens(line) + 1
+            if used + cost > token_budget:
+                # A long line (e.g. a whole paragraph) is cut rather than dropped
+                partial = _truncate_to_tokens(line, token_budget - used - 1)
+                if partial:
+                    kept.setdefault(index, []).append(partial)
+                    used = token_budget
+                break
+            kept.setdefault(index, []).append(line)
+            used += cost
+        if used >= token_budget:
+            break
+
+    compacted = "\n".join(line for index in sorted(kept) for line in kept[index])
+    return CompactionResult(
+        text=compacted,
+        original_tokens=original_tokens,
+        compacted_tokens=estimate_tokens(compacted),
+    )
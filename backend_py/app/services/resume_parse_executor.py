@@ -0,0 +1,253 @@
+"""
+Shared process pool for resume parsing.
+
+pdfplumber is CPU-bound and some PDFs never finish, so parsing runs in child
+processes with an address-space cap and a per-task timeout. The timeout
+counts from the moment a child starts the task (children report it), not
+from submission, so time spent queued behind other parses is free.
+
+A watchdog thread kills only the child running a parse that overran. The
+pool cannot survive losing a process, so it is replaced, and every other
+parse that was queued or running on it is resubmitted to the new pool
+instead of failing. If a child crashes on its own (rather than being
+killed for a timeout), the parses it may have been running get one retry
+before they fail.
+"""
+
+from __future__ import annotations
+
+import itertools
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+import weakref
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
+
+from .. import metrics
+from ..config import get_settings
+from .resume_parser_service import ParseResult, extract_resume_text
+
+
+# Parses running when a child crashed are retried this many times
+MAX_CRASH_RETRIES = 1
+WATCHDOG_INTERVAL_SECONDS = 0.25
+
+_mp_context = multiprocessing.get_context("spawn")
+_lock = threading.Lock()
+_executor: ProcessPoolExecutor | None = None
+_started_queue = None
+_tasks: Dict[int, "_ParseTask"] = {}
+_task_ids = itertools.count(1)
+_watchdog: threading.Thread | None = None
+# Pools broken on purpose by killing a timed-out parse (as opposed to a child crashing)
+_killed_pools: "weakref.WeakSet[ProcessPoolExecutor]" = weakref.WeakSet()
+
+# Set in each child by _init_child
+_child_started_queue = None
+
+
+@dataclass
+class _ParseTask:
+    buffer: bytes
+    filename: str
+    timeout: float
+    future: Future
+    submitted: float = field(default_factory=time.monotonic)
+    executor: ProcessPoolExecutor | None = None
+    # Bumped on every (re)submission, so a late start report from a previous pool is ignored
+    attempt: int = 0
+    # Set when a child reports that it picked the task up
+    pid: int | None = None
+    started: float | None = None
+    timed_out: bool = False
+    crash_retries: int = 0
+
+
+def _limit_memory(limit_mb: int) -> None:
+    if limit_mb <= 0:
+        return
+    try:
+        import resource
+    except ImportError:  # Windows
+        return
+    limit = limit_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _init_child(limit_mb: int, started_queue) -> None:
+    global _child_started_queue
+    _child_started_queue = started_queue
+    _limit_memory(limit_mb)
+
+
+def _parse_in_child(task_id: int, attempt: int, buffer: bytes, filename: str) -> Tuple[ParseResult, float]:
+    _child_started_queue.put((task_id, attempt, os.getpid()))
+    started = time.perf_counter()
+    try:
+        result = extract_resume_text(buffer, filename)
+    except MemoryError as exc:
+        raise RuntimeError("Resume parsing exceeded the memory limit") from exc
+    return result, time.perf_counter() - started
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor, _started_queue
+    with _lock:
+        if _executor is None:
+            settings = get_settings()
+            if _started_queue is None:
+                _started_queue = _mp_context.Queue()
+            _executor = ProcessPoolExecutor(
+                max_workers=max(1, settings.parse_pool_size),
+                # spawn: forking a process that already runs threads (uvicorn, DB pool) is unsafe
+                mp_context=_mp_context,
+                initializer=_init_child,
+                initargs=(settings.parse_memory_limit_mb, _started_queue),
+            )
+            _ensure_watchdog()
+        return _executor
+
+
+def _retire_executor(old: ProcessPoolExecutor) -> None:
+    """Route new submissions to a fresh pool; the old one is already broken or about to be."""
+    global _executor
+    with _lock:
+        if _executor is old:
+            _executor = None
+    old.shutdown(wait=False)
+
+
+def _ensure_watchdog() -> None:
+    global _watchdog
+    if _watchdog is None or not _watchdog.is_alive():
+        _watchdog = threading.Thread(target=_watch, name="parse-watchdog", daemon=True)
+        _watchdog.start()
+
+
+def _watch() -> None:
+    while True:
+        try:
+            task_id, attempt, pid = _started_queue.get(timeout=WATCHDOG_INTERVAL_SECONDS)
+        except queue.Empty:
+            pass
+        except (EOFError, OSError):
+            return
+        else:
+            with _lock:
+                task = _tasks.get(task_id)
+                if task is not None and task.attempt == attempt:
+                    task.pid, task.started = pid, time.monotonic()
+        _kill_overdue()
+
+
+def _kill_overdue() -> None:
+    now = time.monotonic()
+    with _lock:
+        overdue = [
+            task
+            for task in _tasks.values()
+            if task.started is not None and not task.timed_out and now - task.started > task.timeout
+        ]
+        for task in overdue:
+            task.timed_out = True
+            _killed_pools.add(task.executor)
+    for task in overdue:
+        metrics.incr("parse.timeouts")
+        # The pool breaks once its child dies; _on_child_done resubmits the other parses
+        _retire_executor(task.executor)
+        try:
+            os.kill(task.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+def _finish(task_id: int, task: _ParseTask, exc: BaseException | None = None, result: ParseResult | None = None) -> None:
+    with _lock:
+        _tasks.pop(task_id, None)
+    metrics.incr("parse.in_flight", -1)
+    if exc is not None:
+        metrics.incr("parse.failures")
+        task.future.set_exception(exc)
+    else:
+        task.future.set_result(result)
+
+
+def _on_child_done(task_id: int, task: _ParseTask, executor: ProcessPoolExecutor, done: Future) -> None:
+    try:
+        result, parse_seconds = done.result()
+    except BrokenProcessPool as exc:
+        _retire_executor(executor)
+        if task.timed_out:
+            _finish(task_id, task, RuntimeError("Resume parsing timed out"))
+            return
+        if task.started is not None and executor not in _killed_pools:
+            # A child died on its own while this parse was running; it may be the cause
+            if task.crash_retries >= MAX_CRASH_RETRIES:
+                _finish(task_id, task, exc)
+                return
+            task.crash_retries += 1
+        metrics.incr("parse.resubmitted")
+        _submit(task_id, task)
+        return
+    except BaseException as exc:  # noqa: BLE001
+        _finish(task_id, task, exc)
+        return
+    metrics.observe("parse.seconds", parse_seconds)
+    started = task.started if task.started is not None else time.monotonic() - parse_seconds
+    metrics.observe("parse.queue_seconds", max(0.0, started - task.submitted))
+    _finish(task_id, task, result=result)
+
+
+def _submit(task_id: int, task: _ParseTask) -> None:
+    # A pool can be retired between picking it and submitting; the next one is fresh
+    for _ in range(3):
+        try:
+            executor = _get_executor()
+        except Exception as exc:  # noqa: BLE001
+            _finish(task_id, task, exc)
+            return
+        with _lock:
+            task.executor, task.pid, task.started = executor, None, None
+            task.attempt += 1
+            attempt = task.attempt
+        try:
+            child_future = executor.submit(_parse_in_child, task_id, attempt, task.buffer, task.filename)
+        except (RuntimeError, BrokenProcessPool) as exc:
+            _retire_executor(executor)
+            error: BaseException = exc
+            continue
+        child_future.add_done_callback(lambda done: _on_child_done(task_id, task, executor, done))
+        return
+    _finish(task_id, task, error)
+
+
+def submit_parse(buffer: bytes, filename: str, timeout: float | None = None) -> Future:
+    """
+    Queue a parse; the future resolves to ParseResult, or fails with RuntimeError if the
+    parse runs longer than timeout (default PARSE_TIMEOUT_SECONDS) once started.
+    Queue depth is the parse.in_flight counter.
+    """
+    task = _ParseTask(
+        buffer=buffer,
+        filename=filename,
+        timeout=timeout or get_settings().parse_timeout_seconds,
+        future=Future(),
+    )
+    task.future.set_running_or_notify_cancel()
+    task_id = next(_task_ids)
+    with _lock:
+        _tasks[task_id] = task
+    metrics.incr("parse.in_flight")
+    _submit(task_id, task)
+    return task.future
+
+
+def parse_resume(buffer: bytes, filename: str, timeout: float | None = None) -> ParseResult:
+    # The watchdog enforces the timeout from the moment a child starts the parse
+    return submit_parse(buffer, filename, timeout).result()
@@ -3,8 +3,20 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import io  # <--- IMPORT IO
+import re
+import unicodedata
+import zipfile
+from typing import Callable, Dict, Iterable, Iterator, List
 import docx  # python-docx
 import pdfplumber
+import pypdfium2 as pdfium
+from lxml import etree
+
+from ..config import get_settings
+
+
+# Stored next to cached parsed text; bump whenever extraction or cleaning output changes
+PARSER_VERSION = "5"
 
 
 @dataclass
@@ -13,30 +25,74 @@ class ParseResult:
     word_count: int
 
 
-def _clean_text(text: str) -> str:
+# ~8k tokens; text past this is never sent to the model, so extraction stops once it is reached
+MAX_TEXT_CHARS = 32000
+# Raw text is cleaned in windows of about this size so one huge page cannot blow the budget
+_CLEAN_WINDOW_CHARS = 8192
+
+# Runs of spaces/tabs collapse to one space; line breaks survive (collapsed to one) so that
+# section headings and repeated lines can still be recognised downstream
+_SPACES_RE = re.compile(r"[^\S\n]+")
+_LINE_BREAKS_RE = re.compile(r" ?\n[\s]*")
+_BOILERPLATE_RE = re.compile(r"(Page \d+ of \d+|Confidential|Resume|Curriculum Vitae)", re.IGNORECASE)
+_EMAIL_RE = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b")
+_PHONE_RE = re.compile(r"(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}")
+
+
+def _windows(text: str) -> Iterator[str]:
+    start = 0
+    while len(text) - start > _CLEAN_WINDOW_CHARS:
+        end = start + _CLEAN_WINDOW_CHARS
+        # Split at a line break (else a space) so emails and phone numbers stay whole
+        split = text.rfind("\n", start, end)
+        if split <= start + _CLEAN_WINDOW_CHARS // 2:
+            split = text.rfind(" ", start, end)
+        if split <= start:
+            split = end
+        yield text[start:split]
+        start = split
+    yield text[start:]
+
+
+def _clean_chunk(text: str) -> str:
     """
-    Clean extracted text:
-    - Remove excessive whitespace
-    - Remove some common header/footer patterns
-    - Limit to ~32k characters (~8k tokens)
+    Clean one piece of extracted text:
+    - Remove excessive whitespace (keeping single line breaks)
+    - Remove some common header/footer patterns, emails and phone numbers
     """
-    import re
+    cleaned = _LINE_BREAKS_RE.sub("\n", _SPACES_RE.sub(" ", text))
+    cleaned = _BOILERPLATE_RE.sub("", cleaned)
+    cleaned = _EMAIL_RE.sub("", cleaned)
+    cleaned = _PHONE_RE.sub("", cleaned)
+    return _LINE_BREAKS_RE.sub("\n", _SPACES_RE.sub(" ", cleaned)).strip()
 
-    cleaned = re.sub(r"\s+", " ", text or "").strip()
 
-    cleaned = re.sub(r"(Page \d+ of \d+|Confidential|Resume|Curriculum Vitae)", "", cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(
-        r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b",
-        "",
-        cleaned,
-    )
-    cleaned = re.sub(
-        r"(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}",
-        "",
-        cleaned,
-    )
+def _collect_text(chunks: Iterable[str], max_length: int = MAX_TEXT_CHARS) -> str:
+    """
+    Clean and accumulate chunks (pages, paragraphs) until the budget is exceeded,
+    then stop pulling from the iterator and limit to ~max_length characters.
+    """
+    parts: List[str] = []
+    length = 0
+    try:
+        for chunk in chunks:
+            for window in _windows(chunk or ""):
+                cleaned = _clean_chunk(window)
+                if not cleaned:
+                    continue
+                parts.append(cleaned)
+                length += len(cleaned) + 1
+                if length > max_length:
+                    break
+            if length > max_length:
+                break
+    finally:
+        # Generators release their document right away instead of at garbage collection
+        close = getattr(chunks, "close", None)
+        if close:
+            close()
 
-    max_length = 32000
+    cleaned = "\n".join(parts)
     if len(cleaned) > max_length:
         truncated = cleaned[:max_length]
         last_period = truncated.rfind(".")
@@ -48,40 +104,167 @@ def _clean_text(text: str) -> str:
     return cleaned.strip()
 
 
-def _parse_pdf(buffer: bytes) -> ParseResult:
+def _clean_text(text: str) -> str:
+    return _collect_text([text])
+
+
+def _pdf_pages_pdfplumber(buffer: bytes) -> Iterator[str]:
+    # FIX: Wrap raw bytes in io.BytesIO so pdfplumber can .seek()
+    with pdfplumber.open(io.BytesIO(buffer)) as pdf:
+        for page in pdf.pages:
+            yield page.extract_text() or ""
+            # Drop the parsed layout objects of pages already consumed
+            page.close()
+
+
+def _pdf_pages_pdfium(buffer: bytes) -> Iterator[str]:
+    # Plain text in content order; no layout analysis, which cleaning would discard anyway
+    pdf = pdfium.PdfDocument(buffer)
     try:
-        # FIX: Wrap raw bytes in io.BytesIO so pdfplumber can .seek()
-        with pdfplumber.open(io.BytesIO(buffer)) as pdf:
-            pages_text = [page.extract_text() or "" for page in pdf.pages]
-        
-        text = _clean_text(" ".join(pages_text))
+        for index in range(len(pdf)):
+            page = pdf[index]
+            textpage = page.get_textpage()
+            try:
+                text = textpage.get_text_range() or ""
+            finally:
+                textpage.close()
+                page.close()
+            yield text
+    finally:
+        pdf.close()
+
+
+PDF_ENGINES: Dict[str, Callable[[bytes], Iterator[str]]] = {
+    "pdfium": _pdf_pages_pdfium,
+    "pdfplumber": _pdf_pages_pdfplumber,
+}
+
+
+def _looks_garbled(text: str) -> bool:
+    """
+    True for output a fallback engine might do better on: nothing extracted
+    (scanned pages) or mostly replacement/private-use/control characters
+    (broken font encodings).
+    """
+    visible = [ch for ch in text if not ch.isspace()]
+    if len(visible) < 50:
+        return True
+    bad = sum(1 for ch in visible if ch == "\ufffd" or unicodedata.category(ch) in ("Co", "Cc", "Cs"))
+    letters = sum(1 for ch in visible if ch.isalpha())
+    return bad / len(visible) > 0.05 or letters / len(visible) < 0.4
+
+
+def _pdf_text(buffer: bytes, engine: str) -> str:
+    """Cleaned, budget-limited text; pages after the budget is reached are never extracted."""
+    if engine not in PDF_ENGINES:
+        raise RuntimeError(f"Unknown PDF engine: {engine}")
+    if engine == "pdfplumber":
+        # The fallback engine itself; nothing further to try
+        return _collect_text(_pdf_pages_pdfplumber(buffer))
+    try:
+        text = _collect_text(PDF_ENGINES[engine](buffer))
+    except Exception as exc:  # noqa: BLE001
+        print(f"PDF engine {engine} failed, falling back to pdfplumber: {exc}")
+        return _collect_text(_pdf_pages_pdfplumber(buffer))
+    if _looks_garbled(text):
+        fallback = _collect_text(_pdf_pages_pdfplumber(buffer))
+        # Keep the fast result when pdfplumber cannot do better either (e.g. a scan)
+        if len(fallback) > len(text):
+            return fallback
+    return text
+
+
+def _parse_pdf(buffer: bytes, engine: str | None = None) -> ParseResult:
+    try:
+        text = _pdf_text(buffer, engine or get_settings().resume_pdf_engine)
         words = [w for w in text.split() if w]
         return ParseResult(text=text, word_count=len(words))
     except Exception as exc:  # noqa: BLE001
         raise RuntimeError(f"Failed to parse PDF: {exc}") from exc
 
 
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+_DOCX_HEADER_RE = re.compile(r"word/header\d*\.xml")
+
+
+def _docx_part_paragraphs(archive: zipfile.ZipFile, name: str) -> Iterator[str]:
+    """
+    Paragraph text of one WordprocessingML part in document order, read with an
+    incremental parser so the part is never fully materialized. Table cells and
+    text boxes are paragraphs too; a text box's paragraphs come out just before
+    the paragraph that anchors it. mc:Fallback copies (legacy VML text boxes
+    that duplicate the modern ones) are skipped.
+    """
+    with archive.open(name) as stream:
+        # Paragraphs nest (a text box inside a paragraph), so keep one buffer per open w:p
+        open_paragraphs: List[List[str]] = []
+        fallback_depth = 0
+        for event, element in etree.iterparse(
+            stream, events=("start", "end"), resolve_entities=False, no_network=True
+        ):
+            tag = element.tag
+            if tag == _MC_FALLBACK:
+                fallback_depth += 1 if event == "start" else -1
+                continue
+            if event == "start":
+                if tag == f"{_W}p" and not fallback_depth:
+                    open_paragraphs.append([])
+                continue
+            if fallback_depth or not open_paragraphs:
+                if tag == f"{_W}p":
+                    element.clear()
+                continue
+            if tag == f"{_W}t":
+                open_paragraphs[-1].append(element.text or "")
+            elif tag == f"{_W}tab":
+                open_paragraphs[-1].append("\t")
+            elif tag in (f"{_W}br", f"{_W}cr"):
+                open_paragraphs[-1].append("\n")
+            elif tag == f"{_W}p":
+                yield "".join(open_paragraphs.pop())
+                # Free the parsed paragraph and everything before it
+                element.clear()
+                if not open_paragraphs:
+                    while element.getprevious() is not None:
+                        del element.getparent()[0]
+
+
+def _docx_paragraphs(buffer: bytes) -> Iterator[str]:
+    """Header paragraphs, then the body. Media parts in the zip are never decompressed."""
+    with zipfile.ZipFile(io.BytesIO(buffer)) as archive:
+        names = archive.namelist()
+        if "word/document.xml" not in names:
+            raise RuntimeError("word/document.xml not found")
+        for name in sorted(n for n in names if _DOCX_HEADER_RE.fullmatch(n)):
+            yield from _docx_part_paragraphs(archive, name)
+        yield from _docx_part_paragraphs(archive, "word/document.xml")
+
+
 def _parse_docx(buffer: bytes) -> ParseResult:
     try:
-        # docx also requires a file-like object
-        document = docx.Document(io.BytesIO(buffer))
-        paragraphs = [p.text for p in document.paragraphs]
-        text = _clean_text(" ".join(paragraphs))
-        words = [w for w in text.split() if w]
-        return ParseResult(text=text, word_count=len(words))
-    except Exception as exc:  # noqa: BLE001
-        raise RuntimeError(f"Failed to parse DOCX: {exc}") from exc
+        text = _collect_text(_docx_paragraphs(buffer))
+    except Exception as stream_exc:  # noqa: BLE001
+        print(f"Streaming DOCX extraction failed, falling back to python-docx: {stream_exc}")
+        try:
+            # docx also requires a file-like object
+            document = docx.Document(io.BytesIO(buffer))
+            text = _collect_text(p.text for p in document.paragraphs)
+        except Exception as exc:  # noqa: BLE001
+            raise RuntimeError(f"Failed to parse DOCX: {exc}") from exc
+    words = [w for w in text.split() if w]
+    return ParseResult(text=text, word_count=len(words))
 
 
-def extract_resume_text(buffer: bytes, filename: str) -> ParseResult:
+def extract_resume_text(buffer: bytes, filename: str, pdf_engine: str | None = None) -> ParseResult:
     lower = filename.lower()
     if lower.endswith(".pdf"):
-        return _parse_pdf(buffer)
+        return _parse_pdf(buffer, pdf_engine)
     if lower.endswith(".docx") or lower.endswith(".doc"):
         return _parse_docx(buffer)
     # Fallback: detect type from file signature for storage URLs without extension
     if buffer.startswith(b"%PDF"):
-        return _parse_pdf(buffer)
+        return _parse_pdf(buffer, pdf_engine)
     if buffer.startswith(b"PK\x03\x04"):
         # DOCX is a zip container; best-effort parse
         return _parse_docx(buffer)
@@ -90,7 +273,7 @@ def extract_resume_text(buffer: bytes, filename: str) -> ParseResult:
     pdf_error = None
     docx_error = None
     try:
-        return _parse_pdf(buffer)
+        return _parse_pdf(buffer, pdf_engine)
     except Exception as exc:  # noqa: BLE001
         pdf_error = exc
     try:
@@ -0,0 +1,204 @@
+"""
+Shared store of parsed resume text: one zlib-compressed blob per file sha256
+and parser version, so a resume is parsed once across the API and workers.
+
+Queued evaluations carry only the hash, plus a reference id. The API adds
+that id to the blob's reference set before enqueueing (retain_parsed_text).
+The worker removes it once it has read the text (release_parsed_text). A
+set rather than a counter makes a repeated release, for example from a
+re-run of a failed job, a no-op.
+
+While the set is non-empty the blob lives at least RESUME_TEXT_REF_TTL_SECONDS,
+which also bounds references leaked by jobs that never ran. After the last
+release it expires after RESUME_TEXT_TTL_SECONDS, the shorter lifetime of a
+text that is only kept to avoid re-parsing.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+import zlib
+from functools import lru_cache
+
+from .. import metrics
+from ..config import get_redis_connection, get_settings
+from .resume_parse_executor import parse_resume
+from .resume_parser_service import PARSER_VERSION
+
+
+# Another process parsing the same file holds the lock for at most this long
+PARSE_LOCK_SECONDS = 60
+PARSE_WAIT_SECONDS = 20
+PARSE_WAIT_INTERVAL = 0.25
+
+
+def _text_key(file_hash: str) -> str:
+    return f"resume_text:{PARSER_VERSION}:{file_hash}"
+
+
+def _lock_key(file_hash: str) -> str:
+    return f"resume_text_lock:{PARSER_VERSION}:{file_hash}"
+
+
+def _refs_key(file_hash: str) -> str:
+    return f"resume_text_refs:{PARSER_VERSION}:{file_hash}"
+
+
+# KEYS: text, refs. ARGV: reference id, referenced TTL (s).
+_RETAIN_LUA = """
+redis.call('SADD', KEYS[2], ARGV[1])
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+local ttl = redis.call('TTL', KEYS[1])
+if ttl >= 0 and ttl < tonumber(ARGV[2]) then
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return redis.call('SCARD', KEYS[2])
+"""
+
+# KEYS: text, refs. ARGV: reference id, unreferenced TTL (s).
+# Returns the references left, or -1 when this id held none (already released).
+_RELEASE_LUA = """
+if redis.call('SREM', KEYS[2], ARGV[1]) == 0 then
+    return -1
+end
+local refs = redis.call('SCARD', KEYS[2])
+if refs == 0 and redis.call('TTL', KEYS[1]) >= 0 then
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return refs
+"""
+
+# KEYS: text, refs. ARGV: compressed text, unreferenced TTL (s), referenced TTL (s).
+_PUT_LUA = """
+local ttl = ARGV[2]
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    ttl = ARGV[3]
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ttl)
+"""
+
+
+def _referenced_ttl() -> int:
+    settings = get_settings()
+    # A referenced text never expires sooner than an unreferenced one would
+    return max(settings.resume_text_ref_ttl_seconds, settings.resume_text_ttl_seconds)
+
+
+@lru_cache()
+def _retain_script():
+    return get_redis_connection().register_script(_RETAIN_LUA)
+
+
+@lru_cache()
+def _release_script():
+    return get_redis_connection().register_script(_RELEASE_LUA)
+
+
+@lru_cache()
+def _put_script():
+    return get_redis_connection().register_script(_PUT_LUA)
+
+
+def get_parsed_text(file_hash: str | None) -> str | None:
+    """Cleaned text for this file from the shared store, or None (also when Redis is unavailable)."""
+    if not file_hash:
+        return None
+    try:
+        raw = get_redis_connection().get(_text_key(file_hash))
+    except Exception as exc:  # noqa: BLE001
+        print(f"[resume_text] redis read failed: {exc}")
+        return None
+    if raw is None:
+        return None
+    return zlib.decompress(raw).decode("utf-8")
+
+
+def put_parsed_text(file_hash: str, text: str) -> bool:
+    """Store the text; False when the write failed (the error is logged, not raised)."""
+    try:
+        _put_script()(
+            keys=[_text_key(file_hash), _refs_key(file_hash)],
+            args=[zlib.compress(text.encode("utf-8")), get_settings().resume_text_ttl_seconds, _referenced_ttl()],
+        )
+    except Exception as exc:  # noqa: BLE001
+        print(f"[resume_text] redis write failed: {exc}")
+        return False
+    return True
+
+
+def retain_parsed_text(file_hash: str, ref_id: str) -> None:
+    """Add a reference for a queued job, keeping the text alive until it is released."""
+    try:
+        _retain_script()(keys=[_text_key(file_hash), _refs_key(file_hash)], args=[ref_id, _referenced_ttl()])
+    except Exception as exc:  # noqa: BLE001
+        print(f"[resume_text] redis retain failed: {exc}")
+
+
+def release_parsed_text(file_hash: str, ref_id: str) -> None:
+    """Drop the reference; releasing the same ref_id again does nothing."""
+    try:
+        _release_script()(
+            keys=[_text_key(file_hash), _refs_key(file_hash)],
+            args=[ref_id, get_settings().resume_text_ttl_seconds],
+        )
+    except Exception as exc:  # noqa: BLE001
+        print(f"[resume_text] redis release failed: {exc}")
+
+
+def _wait_for_parsed_text(file_hash: str) -> str | None:
+    deadline = time.monotonic() + PARSE_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(PARSE_WAIT_INTERVAL)
+        text = get_parsed_text(file_hash)
+        if text is not None:
+            return text
+        try:
+            if not get_redis_connection().exists(_lock_key(file_hash)):
+                return None
+        except Exception:  # noqa: BLE001
+            return None
+    return None
+
+
+def parse_resume_once(file_bytes: bytes, filename: str, file_hash: str | None = None) -> str:
+    """
+    Cleaned resume text keyed by the file's sha256, parsed at most once across processes.
+    If another process holds the parse lock we wait for its result, then parse ourselves
+    as a fallback so a crashed holder never blocks evaluation.
+    """
+    return parse_resume_shared(file_bytes, filename, file_hash)[0]
+
+
+def parse_resume_shared(file_bytes: bytes, filename: str, file_hash: str | None = None) -> tuple[str, bool]:
+    """
+    parse_resume_once, plus whether the text is in the shared store. Only then can a
+    queued job reference it by hash (retain_parsed_text) instead of re-parsing.
+    """
+    file_hash = file_hash or hashlib.sha256(file_bytes).hexdigest()
+    text = get_parsed_text(file_hash)
+    if text is not None:
+        metrics.incr("resume_text.hit")
+        return text, True
+    metrics.incr("resume_text.miss")
+
+    acquired = True
+    try:
+        acquired = bool(get_redis_connection().set(_lock_key(file_hash), b"1", nx=True, ex=PARSE_LOCK_SECONDS))
+    except Exception as exc:  # noqa: BLE001
+        print(f"[resume_text] redis lock failed: {exc}")
+    if not acquired:
+        metrics.incr("resume_text.wait")
+        text = _wait_for_parsed_text(file_hash)
+        if text is not None:
+            return text, True
+
+    try:
+        text = parse_resume(file_bytes, filename).text
+        return text, put_parsed_text(file_hash, text)
+    finally:
+        if acquired:
+            try:
+                get_redis_connection().delete(_lock_key(file_hash))
+            except Exception:  # noqa: BLE001
+                pass
@@ -56,6 +56,27 @@ async def upload_interview_media(
         raise RuntimeError(f"Failed to upload media to Cloudinary: {exc}") from exc
 
 
+def upload_question_audio(audio_bytes: bytes, cache_key: str, audio_format: str = "mp3") -> str:
+    """
+    Blocking upload of synthesized question audio under a public id derived from its
+    content hash, so every API instance stores and serves the same file.
+    """
+    _configure_cloudinary()
+    try:
+        upload_result = cloudinary.uploader.upload(
+            audio_bytes,
+            # Cloudinary files audio under the video resource type
+            resource_type="video",
+            folder="ai-interviewer/tts",
+            public_id=cache_key,
+            format=audio_format,
+            overwrite=False,
+        )
+        return upload_result["secure_url"]
+    except Exception as exc:  # noqa: BLE001
+        raise RuntimeError(f"Failed to upload question audio to Cloudinary: {exc}") from exc
+
+
 async def upload_resume(file_bytes: bytes, file_name: str, file_type: str, candidate_id: str) -> dict:
     _ = file_type
     _configure_cloudinary()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 import os
 from ..config import get_settings
+from .openai_rate_limit_service import acquire
 from openai import OpenAI
 
 def transcribe_audio_chunk(file_bytes: bytes) -> str:
@@ -18,6 +19,7 @@ def transcribe_audio_chunk(file_bytes: bytes) -> str:
         with open(temp_filename, "wb") as f:
             f.write(file_bytes)
             
+        acquire("whisper-1", priority="interactive")
         with open(temp_filename, "rb") as audio_file:
             transcript = client.audio.transcriptions.create(
                 model="whisper-1", 
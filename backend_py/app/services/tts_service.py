@@ -1,26 +1,68 @@
 from __future__ import annotations
-import base64
-from ..config import get_settings
+import hashlib
+from typing import Optional
+
+from ..config import get_redis_connection, get_settings
+from .. import metrics
+from .openai_rate_limit_service import acquire
+from .storage_service import upload_question_audio
 from openai import Client
 
-def generate_question_audio(text: str) -> str:
+TTS_MODEL = "tts-1"
+TTS_VOICE = "alloy"
+TTS_FORMAT = "mp3"
+
+# Content hash -> URL of the stored audio, shared by all API instances
+TTS_URL_KEY_PREFIX = "tts_audio:"
+
+
+def tts_cache_key(text: str, voice: str = TTS_VOICE, model: str = TTS_MODEL, response_format: str = TTS_FORMAT) -> str:
+    return hashlib.sha256("\x1f".join((model, voice, response_format, text)).encode("utf-8")).hexdigest()
+
+
+def _get_cached_url(key: str) -> Optional[str]:
+    try:
+        url = get_redis_connection().get(f"{TTS_URL_KEY_PREFIX}{key}")
+    except Exception as exc:  # noqa: BLE001
+        print(f"[tts] redis read failed: {exc}")
+        return None
+    return url.decode("utf-8") if url else None
+
+
+def _set_cached_url(key: str, url: str) -> None:
+    try:
+        get_redis_connection().set(f"{TTS_URL_KEY_PREFIX}{key}", url)
+    except Exception as exc:  # noqa: BLE001
+        print(f"[tts] redis write failed: {exc}")
+
+
+def get_question_audio_url(text: str) -> Optional[str]:
     """
-    Generates audio from text using OpenAI TTS.
-    Returns base64 encoded audio string to play immediately on frontend.
+    Returns the URL of the stored audio for this text, synthesizing and uploading it
+    once on a miss (see storage_service.upload_question_audio).
+    The key is derived from text, voice, model and format, so it never goes stale.
     """
+    key = tts_cache_key(text)
+    url = _get_cached_url(key)
+    if url:
+        metrics.incr("tts.cache_hit")
+        return url
+
+    metrics.incr("tts.cache_miss")
     settings = get_settings()
     client = Client(api_key=settings.openai_api_key)
 
     try:
+        acquire(TTS_MODEL, priority="interactive")
         response = client.audio.speech.create(
-            model="tts-1",
-            voice="alloy", 
+            model=TTS_MODEL,
+            voice=TTS_VOICE,
             input=text,
-            response_format="mp3"
+            response_format=TTS_FORMAT,
         )
-        # Convert binary audio to base64 for easy JSON transport
-        audio_b64 = base64.b64encode(response.content).decode('utf-8')
-        return f"data:audio/mp3;base64,{audio_b64}"
+        url = upload_question_audio(response.content, key, TTS_FORMAT)
+        _set_cached_url(key, url)
+        return url
     except Exception as e:
         print(f"TTS Generation Error: {e}")
-        return None
\ No newline at end of file
+        return None
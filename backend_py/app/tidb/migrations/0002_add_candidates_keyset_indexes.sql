@@ -0,0 +1,5 @@
+-- Keyset pagination for GET /api/candidates/: newest first on (created_at, id),
+-- optionally narrowed by job or candidate status.
+CREATE INDEX idx_candidates_created_at_id ON candidates (created_at, id);
+CREATE INDEX idx_candidates_job_created_at_id ON candidates (job_id, created_at, id);
+CREATE INDEX idx_candidates_status_created_at_id ON candidates (status, created_at, id);
@@ -0,0 +1,3 @@
+-- Estimated resume tokens before and after compaction (NULL when the result was reused from cache).
+ALTER TABLE ai_evaluations ADD COLUMN resume_tokens_original INT NULL;
+ALTER TABLE ai_evaluations ADD COLUMN resume_tokens_compacted INT NULL;
@@ -34,6 +34,9 @@ CREATE TABLE IF NOT EXISTS candidates (
   created_at DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
   UNIQUE KEY uq_candidates_email_job (email, job_id),
   INDEX idx_candidates_status (status),
+  INDEX idx_candidates_created_at_id (created_at, id),
+  INDEX idx_candidates_job_created_at_id (job_id, created_at, id),
+  INDEX idx_candidates_status_created_at_id (status, created_at, id),
   CONSTRAINT fk_candidates_job FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE RESTRICT
 );
 
@@ -60,6 +63,8 @@ CREATE TABLE IF NOT EXISTS ai_evaluations (
   summary TEXT NOT NULL,
   status ENUM('PENDING', 'COMPLETED', 'FAILED') NOT NULL DEFAULT 'PENDING',
   error_message TEXT NULL,
+  resume_tokens_original INT NULL,
+  resume_tokens_compacted INT NULL,
   created_at DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
   updated_at DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
   UNIQUE KEY uq_ai_evaluations_candidate_id (candidate_id),
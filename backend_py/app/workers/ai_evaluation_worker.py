@@ -1,42 +1,99 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import os
+import random
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import Awaitable, Callable, TypeVar
 
+import httpx
 import nest_asyncio
-import requests
+import openai
+import redis
+import sqlalchemy.exc
 
-from ..db import fetch_one
+from .. import metrics
+from ..config import get_settings
+from ..db import fetch_one_async, get_pool_stats
 from ..services.ai_evaluation_service import (
-    evaluate_candidate,
+    AIEvaluationResult,
+    JobDetails,
+    evaluate_candidate_cached,
+    evaluation_cache_key,
+    get_cached_evaluation,
     get_job_details,
     mark_evaluation_failed,
     save_evaluation,
 )
-from ..services.resume_parser_service import extract_resume_text
+from ..services.evaluation_checkpoint_service import clear_checkpoint, get_checkpoint, save_checkpoint
+from ..services.evaluation_scheduler_service import (
+    acquire_evaluation_lease,
+    release_evaluation_lease,
+    release_job_id,
+)
+from ..services.openai_rate_limit_service import RateLimitTimeout
+from ..services.resume_compaction_service import CompactionResult, compact_resume
+from ..services.resume_text_service import get_parsed_text, parse_resume_once, release_parsed_text
 from ..services.storage_service import get_signed_download_url
 
 
 nest_asyncio.apply()
 
+T = TypeVar("T")
+
 UPLOAD_DIR = os.path.join(os.getcwd(), "local_uploads")
 
+_http_client: httpx.AsyncClient | None = None
 
-def _fetch_job_id_from_candidate(candidate_id: str) -> str:
+
+async def _fetch_job_id_from_candidate(candidate_id: str) -> str:
     print("[Worker Warning] job_id missing in arguments. Fetching from DB...")
-    row = fetch_one("SELECT job_id FROM candidates WHERE id = :id LIMIT 1", {"id": candidate_id})
+    row = await fetch_one_async("SELECT job_id FROM candidates WHERE id = :id LIMIT 1", {"id": candidate_id})
     if row and row.get("job_id"):
         return str(row["job_id"])
     raise RuntimeError(f"Could not find job_id for candidate {candidate_id}")
 
 
-def _load_resume_bytes(
+async def _fetch_resume_hash(candidate_id: str) -> str | None:
+    row = await fetch_one_async(
+        """
+        SELECT file_hash
+        FROM candidate_documents
+        WHERE candidate_id = :id
+        ORDER BY uploaded_at DESC
+        LIMIT 1
+        """,
+        {"id": candidate_id},
+    )
+    return str(row["file_hash"]) if row and row.get("file_hash") else None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    # Created lazily inside the running loop; shared by every download on that loop
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(timeout=30, follow_redirects=True)
+    return _http_client
+
+
+def _read_local_file(local_file_path: str) -> bytes:
+    if not os.path.exists(local_file_path):
+        raise RuntimeError(f"File not found on local disk: {local_file_path}")
+    with open(local_file_path, "rb") as file:
+        return file.read()
+
+
+async def _load_resume_bytes(
     resume_path: str,
     resume_public_id: str | None = None,
     resume_resource_type: str = "raw",
 ) -> bytes:
     if resume_path.startswith("http://") or resume_path.startswith("https://"):
-        response = requests.get(resume_path, timeout=30)
+        client = _get_http_client()
+        response = await client.get(resume_path)
         if response.status_code == 401:
             signed_url = get_signed_download_url(
                 resume_path=resume_path,
@@ -44,20 +101,98 @@ def _load_resume_bytes(
                 resource_type=resume_resource_type,
             )
             if signed_url:
-                signed_resp = requests.get(signed_url, timeout=30)
+                signed_resp = await client.get(signed_url)
                 signed_resp.raise_for_status()
                 return signed_resp.content
         response.raise_for_status()
         return response.content
 
-    local_file_path = os.path.join(UPLOAD_DIR, resume_path)
-    if not os.path.exists(local_file_path):
-        raise RuntimeError(f"File not found on local disk: {local_file_path}")
-    with open(local_file_path, "rb") as file:
-        return file.read()
+    return await asyncio.to_thread(_read_local_file, os.path.join(UPLOAD_DIR, resume_path))
 
 
-def process_evaluation_job(
+@dataclass
+class PreparedEvaluation:
+    """Output of the prepare stage: everything the LLM stage needs, or the final result on a cache hit."""
+
+    candidate_id: str
+    job_details: JobDetails | None
+    resume_hash: str | None
+    compacted: CompactionResult | None = None
+    result: dict | None = None
+    # LLM result restored from a checkpoint; complete_evaluation then only saves it
+    evaluation: AIEvaluationResult | None = None
+    # Run lease and enqueue dedupe id, released by complete_evaluation
+    lease: str | None = None
+    dedupe_job_id: str | None = None
+
+
+@contextmanager
+def _stage(name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.observe(f"evaluation.stage.{name}", time.perf_counter() - started)
+
+
+@asynccontextmanager
+async def _mark_failed_on_error(candidate_id: str):
+    try:
+        yield
+    except BaseException as exc:
+        # BaseException so a job timeout (CancelledError) in the async worker is recorded too
+        try:
+            message = "Evaluation timed out" if isinstance(exc, asyncio.CancelledError) else str(exc)
+            await asyncio.shield(mark_evaluation_failed(candidate_id, message))
+        except BaseException:  # noqa: BLE001
+            pass
+        raise
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Failures worth retrying: network, timeouts, 429/5xx, rate limiter waits, dropped DB/Redis connections."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code == 429 or exc.response.status_code >= 500
+    return isinstance(
+        exc,
+        (
+            openai.APIConnectionError,
+            openai.RateLimitError,
+            openai.InternalServerError,
+            httpx.TransportError,
+            redis.exceptions.ConnectionError,
+            redis.exceptions.TimeoutError,
+            sqlalchemy.exc.OperationalError,
+            sqlalchemy.exc.InterfaceError,
+            RateLimitTimeout,
+            ConnectionError,
+            TimeoutError,
+        ),
+    )
+
+
+async def _with_retries(stage: str, call: Callable[[], Awaitable[T]]) -> T:
+    """
+    Run one stage, retrying transient failures with exponential backoff and jitter,
+    so a retry repeats only this stage. Other errors and the last attempt's error propagate.
+    """
+    settings = get_settings()
+    attempt = 1
+    while True:
+        try:
+            return await call()
+        except Exception as exc:  # noqa: BLE001
+            if attempt >= settings.eval_retry_attempts or not is_transient_error(exc):
+                raise
+            backoff = min(settings.eval_retry_max_seconds, settings.eval_retry_base_seconds * 2 ** (attempt - 1))
+            delay = random.uniform(backoff / 2, backoff)
+            metrics.incr(f"evaluation.retry.{stage}")
+            print(f"[Worker] {stage} failed ({exc!r}), retry {attempt} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+async def prepare_evaluation(
     candidate_id: str,
     resume_path: str,
     storage_bucket: str,
@@ -65,41 +200,274 @@ def process_evaluation_job(
     resume_public_id: str | None = None,
     resume_resource_type: str = "raw",
     resume_text: str | None = None,
-) -> dict:
+    resume_hash: str | None = None,
+    resume_text_ref: str | None = None,
+    resume_text_ref_id: str | None = None,
+    dedupe_job_id: str | None = None,
+) -> PreparedEvaluation:
+    """
+    Everything before the LLM call: job lookup, cache check, resume download, parse
+    and compaction. The async worker runs this for upcoming jobs while earlier ones
+    wait on the model. Stages already checkpointed for this candidate are skipped.
+
+    resume_text_ref is the hash of a parsed text in the shared store that the job
+    holds the reference resume_text_ref_id on (see resume_text_service); it is
+    released here, after the text has been read. resume_text is still accepted
+    from jobs enqueued before that.
+
+    dedupe_job_id is the enqueue dedupe id the job was created under (see
+    evaluation_job_id); its marker is released when the run ends.
+
+    Only one run per candidate proceeds at a time (the evaluation lease); a duplicate
+    returns a result straight away and complete_evaluation passes it through.
+    """
+    if dedupe_job_id is None and resume_hash:
+        # Jobs enqueued before the id was passed along used the candidate-based id
+        dedupe_job_id = f"eval-{candidate_id}-{resume_hash[:16]}"
+    lease = await asyncio.to_thread(acquire_evaluation_lease, candidate_id)
+    try:
+        if lease is None:
+            # Another run for this candidate is in progress and will save the result
+            metrics.incr("evaluation.duplicate_suppressed")
+            print(f"[Worker] Evaluation of candidate {candidate_id} already running, skipping duplicate")
+            return PreparedEvaluation(
+                candidate_id=candidate_id,
+                job_details=None,
+                resume_hash=resume_hash,
+                result={"success": True, "duplicate": True},
+            )
+        prepared = await _prepare_evaluation(
+            candidate_id,
+            resume_path,
+            storage_bucket,
+            job_id=job_id,
+            resume_public_id=resume_public_id,
+            resume_resource_type=resume_resource_type,
+            resume_text=resume_text,
+            resume_hash=resume_hash or resume_text_ref,
+        )
+        prepared.lease = lease
+        prepared.dedupe_job_id = dedupe_job_id
+        return prepared
+    except BaseException:
+        if lease is not None:
+            await asyncio.shield(asyncio.to_thread(_end_run, candidate_id, lease, dedupe_job_id))
+        raise
+    finally:
+        if resume_text_ref and resume_text_ref_id:
+            await asyncio.shield(asyncio.to_thread(release_parsed_text, resume_text_ref, resume_text_ref_id))
+
+
+async def _prepare_evaluation(
+    candidate_id: str,
+    resume_path: str,
+    storage_bucket: str,
+    job_id: str = None,
+    resume_public_id: str | None = None,
+    resume_resource_type: str = "raw",
+    resume_text: str | None = None,
+    resume_hash: str | None = None,
+) -> PreparedEvaluation:
     _ = storage_bucket
 
     if not job_id:
-        job_id = _fetch_job_id_from_candidate(candidate_id)
+        job_id = await _with_retries("job_lookup", lambda: _fetch_job_id_from_candidate(candidate_id))
+
+    async with _mark_failed_on_error(candidate_id):
+        checkpoint = await asyncio.to_thread(get_checkpoint, candidate_id)
+        if resume_hash and checkpoint.get("resume_hash") not in (None, resume_hash):
+            # A different resume than the one checkpointed: nothing in it applies
+            checkpoint = {}
+            await asyncio.to_thread(clear_checkpoint, candidate_id)
+        resume_hash = resume_hash or checkpoint.get("resume_hash")
+
+        with _stage("job_lookup"):
+            # Jobs enqueued before resume_hash was passed fall back to the stored document hash
+            if not resume_hash:
+                resume_hash = await _with_retries("job_lookup", lambda: _fetch_resume_hash(candidate_id))
+            job_details = await _with_retries("job_lookup", lambda: get_job_details(job_id))
+            cached = await asyncio.to_thread(get_cached_evaluation, resume_hash, job_details)
+        if cached:
+            with _stage("save"):
+                await _with_retries("save", lambda: save_evaluation(candidate_id, cached))
+            await asyncio.to_thread(clear_checkpoint, candidate_id)
+            return PreparedEvaluation(
+                candidate_id=candidate_id,
+                job_details=job_details,
+                resume_hash=resume_hash,
+                result={"success": True, "score": cached["score"], "cached": True},
+            )
 
-    try:
         final_resume_text = (resume_text or "").strip()
         if not final_resume_text:
-            file_bytes = _load_resume_bytes(
-                resume_path,
-                resume_public_id=resume_public_id,
-                resume_resource_type=resume_resource_type,
-            )
+            final_resume_text = ((await asyncio.to_thread(get_parsed_text, resume_hash)) or "").strip()
+        if not final_resume_text:
+            with _stage("download"):
+                file_bytes = await _with_retries(
+                    "download",
+                    lambda: _load_resume_bytes(
+                        resume_path,
+                        resume_public_id=resume_public_id,
+                        resume_resource_type=resume_resource_type,
+                    ),
+                )
             if not file_bytes:
                 raise RuntimeError("Empty file.")
+            resume_hash = resume_hash or hashlib.sha256(file_bytes).hexdigest()
+            await asyncio.to_thread(save_checkpoint, candidate_id, resume_hash=resume_hash)
 
             filename = resume_path.split("/")[-1]
-            parsed = extract_resume_text(file_bytes, filename)
-            final_resume_text = parsed.text
+            with _stage("parse"):
+                # parse_resume_once also stores the text under resume_hash, the parse checkpoint
+                final_resume_text = await _with_retries(
+                    "parse", lambda: asyncio.to_thread(parse_resume_once, file_bytes, filename, resume_hash)
+                )
+        elif resume_hash and not checkpoint.get("resume_hash"):
+            await asyncio.to_thread(save_checkpoint, candidate_id, resume_hash=resume_hash)
 
         if not final_resume_text or len(final_resume_text.strip()) < 50:
             raise RuntimeError("Resume text too short.")
 
-        job_details = _run_sync(get_job_details(job_id))
-        evaluation = _run_sync(evaluate_candidate(final_resume_text, job_details))
-        _run_sync(save_evaluation(candidate_id, evaluation))
+        with _stage("compact"):
+            compacted = compact_resume(final_resume_text, get_settings().resume_token_budget)
+        metrics.incr("evaluation.resume_tokens_original", compacted.original_tokens)
+        metrics.incr("evaluation.resume_tokens_compacted", compacted.compacted_tokens)
+
+        evaluation = None
+        if checkpoint.get("llm_result") and checkpoint.get("llm_key") == evaluation_cache_key(
+            resume_hash or "", job_details
+        ):
+            metrics.incr("evaluation.checkpoint_resumed")
+            evaluation = AIEvaluationResult(**checkpoint["llm_result"])
+        return PreparedEvaluation(
+            candidate_id=candidate_id,
+            job_details=job_details,
+            resume_hash=resume_hash,
+            compacted=compacted,
+            evaluation=evaluation,
+        )
+
+
+def _end_run(candidate_id: str, lease: str, dedupe_job_id: str | None) -> None:
+    if dedupe_job_id:
+        release_job_id(dedupe_job_id)
+    release_evaluation_lease(candidate_id, lease)
+
+
+async def complete_evaluation(prepared: PreparedEvaluation) -> dict:
+    """The LLM call and the save, for a job that went through prepare_evaluation."""
+    try:
+        return await _complete_evaluation(prepared)
+    finally:
+        if prepared.lease is not None:
+            await asyncio.shield(
+                asyncio.to_thread(_end_run, prepared.candidate_id, prepared.lease, prepared.dedupe_job_id)
+            )
+
+
+async def _complete_evaluation(prepared: PreparedEvaluation) -> dict:
+    if prepared.result is not None:
+        return prepared.result
+    compacted = prepared.compacted
+    async with _mark_failed_on_error(prepared.candidate_id):
+        evaluation = prepared.evaluation
+        if evaluation is None:
+            with _stage("llm"):
+                evaluation = await _with_retries(
+                    "llm",
+                    lambda: evaluate_candidate_cached(compacted.text, prepared.job_details, prepared.resume_hash),
+                )
+            await asyncio.to_thread(
+                save_checkpoint,
+                prepared.candidate_id,
+                llm_key=evaluation_cache_key(prepared.resume_hash or "", prepared.job_details),
+                llm_result=dict(evaluation),
+            )
+        with _stage("save"):
+            await _with_retries(
+                "save",
+                lambda: save_evaluation(
+                    prepared.candidate_id,
+                    evaluation,
+                    resume_tokens_original=compacted.original_tokens,
+                    resume_tokens_compacted=compacted.compacted_tokens,
+                ),
+            )
+        await asyncio.to_thread(clear_checkpoint, prepared.candidate_id)
         return {"success": True, "score": evaluation["score"]}
 
+
+async def process_evaluation_job_async(
+    candidate_id: str,
+    resume_path: str,
+    storage_bucket: str,
+    job_id: str = None,
+    resume_public_id: str | None = None,
+    resume_resource_type: str = "raw",
+    resume_text: str | None = None,
+    resume_hash: str | None = None,
+    resume_text_ref: str | None = None,
+    resume_text_ref_id: str | None = None,
+    dedupe_job_id: str | None = None,
+) -> dict:
+    """
+    process_evaluation_job without blocking the event loop. DB, Redis and parsing
+    calls are offloaded to threads; the download and the OpenAI call are awaited directly.
+    """
+    prepared = await prepare_evaluation(
+        candidate_id,
+        resume_path,
+        storage_bucket,
+        job_id=job_id,
+        resume_public_id=resume_public_id,
+        resume_resource_type=resume_resource_type,
+        resume_text=resume_text,
+        resume_hash=resume_hash,
+        resume_text_ref=resume_text_ref,
+        resume_text_ref_id=resume_text_ref_id,
+        dedupe_job_id=dedupe_job_id,
+    )
+    return await complete_evaluation(prepared)
+
+
+def process_evaluation_job(
+    candidate_id: str,
+    resume_path: str,
+    storage_bucket: str,
+    job_id: str = None,
+    resume_public_id: str | None = None,
+    resume_resource_type: str = "raw",
+    resume_text: str | None = None,
+    resume_hash: str | None = None,
+    resume_text_ref: str | None = None,
+    resume_text_ref_id: str | None = None,
+    dedupe_job_id: str | None = None,
+) -> dict:
+    try:
+        return _run_sync(
+            process_evaluation_job_async(
+                candidate_id,
+                resume_path,
+                storage_bucket,
+                job_id=job_id,
+                resume_public_id=resume_public_id,
+                resume_resource_type=resume_resource_type,
+                resume_text=resume_text,
+                resume_hash=resume_hash,
+                resume_text_ref=resume_text_ref,
+                resume_text_ref_id=resume_text_ref_id,
+                dedupe_job_id=dedupe_job_id,
+            )
+        )
+    finally:
+        publish_worker_metrics()
+
+
+def publish_worker_metrics() -> None:
+    try:
+        metrics.publish("worker", {"db_pool": get_pool_stats()})
     except Exception as exc:  # noqa: BLE001
-        try:
-            _run_sync(mark_evaluation_failed(candidate_id, str(exc)))
-        except Exception:
-            pass
-        raise exc
+        print("[Worker] Failed to publish metrics:", repr(exc))
 
 
 def _run_sync(coro):
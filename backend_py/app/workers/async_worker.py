@@ -0,0 +1,308 @@
+"""
+RQ worker that runs many evaluation jobs at once on a single asyncio event loop.
+
+RQ's own workers run one job per process, so the job lifecycle bookkeeping
+(started registry, results, failed registry) is done here per job, with the
+same Redis calls RQ's Worker makes.
+
+Jobs flow through two stages joined by bounded asyncio queues. The prepare
+stage (EVAL_WORKER_PREFETCH tasks) does job lookup, download, parse and
+compaction. The evaluate stage (EVAL_WORKER_CONCURRENCY tasks) makes the
+LLM call and saves. So the next jobs' network and CPU work overlaps the
+current LLM waits. Only functions in STAGED_HANDLERS are split this way.
+Those in ASYNC_HANDLERS are awaited whole in the evaluate stage, and
+anything else runs there in a thread via job.perform(). Stage durations are
+published as evaluation.stage.* timings, and the time spent in each buffer
+as worker.stage.*_wait.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import signal
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from rq import Queue, Worker
+from rq.exceptions import DequeueTimeout
+from rq.executions import Execution
+from rq.job import Job, JobStatus
+from rq.timeouts import JobTimeoutException
+from rq.utils import now
+
+from .. import metrics
+from ..services.evaluation_scheduler_service import fill_queue
+from .ai_evaluation_worker import (
+    complete_evaluation,
+    prepare_evaluation,
+    process_evaluation_job_async,
+    publish_worker_metrics,
+)
+
+
+ASYNC_HANDLERS: Dict[str, Callable[..., Awaitable[Any]]] = {
+    "app.workers.ai_evaluation_worker.process_evaluation_job": process_evaluation_job_async,
+}
+# (prepare, complete) pairs: prepare runs in the prefetch stage, complete (the LLM wait) in the main stage
+STAGED_HANDLERS: Dict[str, Tuple[Callable[..., Awaitable[Any]], Callable[[Any], Awaitable[Any]]]] = {
+    "app.workers.ai_evaluation_worker.process_evaluation_job": (prepare_evaluation, complete_evaluation),
+}
+
+DEQUEUE_TIMEOUT_SECONDS = 5
+HEARTBEAT_INTERVAL_SECONDS = 15
+# Extra heartbeat TTL so a job is not considered abandoned between two heartbeats
+HEARTBEAT_GRACE_SECONDS = 60
+
+
+@dataclass
+class _InFlight:
+    job: Job
+    queue: Queue
+    started: float
+    deadline: float
+    # When the job was put into its current buffer, for the per-stage wait timings
+    handed_off: float
+    prepared: Any = None
+
+
+class AsyncEvaluationWorker:
+    def __init__(
+        self,
+        queues: List[Queue],
+        concurrency: int,
+        prefetch: int = 1,
+        max_jobs: int | None = None,
+    ) -> None:
+        self.queues = queues
+        self.connection = queues[0].connection
+        # LLM-stage slots, and how many upcoming jobs are prepared ahead of them
+        self.concurrency = max(1, concurrency)
+        self.prefetch = max(1, prefetch)
+        # Like Worker.work(max_jobs=...): exit after this many jobs so a supervisor can recycle the process
+        self.max_jobs = max_jobs
+        self._jobs_taken = 0
+        # Registration, heartbeats and job counters only; jobs never go through worker.work()
+        self.worker = Worker(queues, connection=self.connection)
+        # Jobs held by this process at once: in the LLM stage, prepared and waiting, or being prepared
+        self._intake = asyncio.Semaphore(self.concurrency + self.prefetch)
+        self._prepare_queue: asyncio.Queue[_InFlight] = asyncio.Queue(maxsize=self.prefetch)
+        self._ready_queue: asyncio.Queue[_InFlight] = asyncio.Queue(maxsize=self.prefetch)
+        self._in_flight = 0
+        self._executions: Dict[str, tuple[Job, Execution]] = {}
+        self._stopping = asyncio.Event()
+
+    def _heartbeat_ttl(self, job: Job) -> int:
+        timeout = job.timeout or Queue.DEFAULT_TIMEOUT
+        return int(min(timeout, HEARTBEAT_INTERVAL_SECONDS)) + HEARTBEAT_GRACE_SECONDS
+
+    def _prepare(self, job: Job, queue: Queue) -> None:
+        ttl = self._heartbeat_ttl(job)
+        with self.connection.pipeline() as pipeline:
+            job.prepare_for_execution(self.worker.name, pipeline=pipeline)
+            job.heartbeat(now(), ttl, pipeline=pipeline)
+            self._executions[job.id] = (job, Execution.create(job, ttl, pipeline=pipeline))
+            # Single-queue dequeues go through RQ's intermediate queue (LMOVE)
+            if len(self.queues) == 1:
+                pipeline.lrem(queue.intermediate_queue_key, 1, job.id)
+            pipeline.execute()
+
+    def _finish(self, job: Job, queue: Queue, result: Any = None, exc_string: str | None = None) -> None:
+        _, execution = self._executions.pop(job.id, (job, None))
+        with self.connection.pipeline() as pipeline:
+            if execution is not None:
+                execution.delete(job=job, pipeline=pipeline)
+            if exc_string is None:
+                job._result = result
+                result_ttl = job.get_result_ttl(self.worker.default_result_ttl)
+                if result_ttl != 0:
+                    job._handle_success(result_ttl, pipeline=pipeline, worker_name=self.worker.name)
+                job.cleanup(result_ttl, pipeline=pipeline, remove_from_queue=False)
+                self.worker.increment_successful_job_count(pipeline=pipeline)
+            elif job.should_retry:
+                job.retry(queue, pipeline)
+                self.worker.increment_failed_job_count(pipeline)
+            else:
+                job.set_status(JobStatus.FAILED, pipeline=pipeline)
+                job._handle_failure(exc_string, pipeline=pipeline, worker_name=self.worker.name)
+                self.worker.increment_failed_job_count(pipeline)
+            if job.started_at and job.ended_at:
+                self.worker.increment_total_working_time(job.ended_at - job.started_at, pipeline)
+            pipeline.execute()
+
+    def _heartbeat(self) -> None:
+        with self.connection.pipeline() as pipeline:
+            self.worker.heartbeat(pipeline=pipeline)
+            for job, execution in list(self._executions.values()):
+                ttl = self._heartbeat_ttl(job)
+                job.heartbeat(now(), ttl, pipeline=pipeline)
+                execution.heartbeat(job.started_job_registry, ttl, pipeline)
+            pipeline.execute()
+
+    async def _call(self, item: _InFlight, call: Awaitable[Any]) -> Any:
+        # At least a second, so a job that used up its time in a buffer still starts and can record its failure
+        remaining = max(1.0, item.deadline - time.monotonic())
+        try:
+            return await asyncio.wait_for(call, timeout=remaining)
+        except asyncio.TimeoutError as exc:
+            raise JobTimeoutException(f"Task exceeded maximum timeout value ({item.job.timeout} seconds)") from exc
+
+    async def _finish_item(self, item: _InFlight, result: Any = None, exc_string: str | None = None) -> None:
+        item.job.ended_at = now()
+        if exc_string is None:
+            metrics.incr("worker.jobs_succeeded")
+        else:
+            metrics.incr("worker.jobs_failed")
+            print(f"[AsyncWorker] Job {item.job.id} failed:\n{exc_string}")
+        try:
+            await asyncio.to_thread(self._finish, item.job, item.queue, result, exc_string)
+        except Exception as exc:  # noqa: BLE001
+            print(f"[AsyncWorker] Bookkeeping failed for job {item.job.id}:", repr(exc))
+        finally:
+            self._in_flight -= 1
+            metrics.incr("worker.in_flight", -1)
+            metrics.observe("worker.job_seconds", time.monotonic() - item.started)
+            self._intake.release()
+
+    async def _prepare_stage(self) -> None:
+        """Download, parse and look up upcoming jobs while earlier ones wait on the LLM."""
+        while True:
+            item = await self._prepare_queue.get()
+            try:
+                metrics.observe("worker.stage.prepare_wait", time.monotonic() - item.handed_off)
+                staged = STAGED_HANDLERS.get(item.job.func_name)
+                if staged is not None:
+                    try:
+                        item.prepared = await self._call(item, staged[0](*item.job.args, **item.job.kwargs))
+                    except Exception:  # noqa: BLE001
+                        await self._finish_item(item, exc_string=traceback.format_exc())
+                        continue
+                item.handed_off = time.monotonic()
+                await self._ready_queue.put(item)
+            finally:
+                self._prepare_queue.task_done()
+
+    async def _evaluate_stage(self) -> None:
+        """The LLM call and save for prepared jobs; whole jobs for functions that have no stages."""
+        while True:
+            item = await self._ready_queue.get()
+            try:
+                metrics.observe("worker.stage.ready_wait", time.monotonic() - item.handed_off)
+                staged = STAGED_HANDLERS.get(item.job.func_name)
+                handler = ASYNC_HANDLERS.get(item.job.func_name)
+                if staged is not None:
+                    call = staged[1](item.prepared)
+                elif handler is not None:
+                    call = handler(*item.job.args, **item.job.kwargs)
+                else:
+                    call = asyncio.to_thread(item.job.perform)
+                try:
+                    result = await self._call(item, call)
+                except Exception:  # noqa: BLE001
+                    await self._finish_item(item, exc_string=traceback.format_exc())
+                    continue
+                await self._finish_item(item, result=result)
+            finally:
+                self._ready_queue.task_done()
+
+    async def _start_item(self, job: Job, queue: Queue) -> None:
+        self._in_flight += 1
+        metrics.incr("worker.in_flight")
+        started = time.monotonic()
+        item = _InFlight(
+            job=job,
+            queue=queue,
+            started=started,
+            deadline=started + (job.timeout or Queue.DEFAULT_TIMEOUT),
+            handed_off=started,
+        )
+        try:
+            await asyncio.to_thread(self._prepare, job, queue)
+            job.started_at = now()
+        except Exception as exc:  # noqa: BLE001
+            print(f"[AsyncWorker] Bookkeeping failed for job {job.id}:", repr(exc))
+            self._in_flight -= 1
+            metrics.incr("worker.in_flight", -1)
+            self._intake.release()
+            return
+        await self._prepare_queue.put(item)
+
+    def _dequeue_fair(self) -> tuple[Job, Queue] | None:
+        # Top the RQ queue up from the per-job-posting lanes before and after taking a job
+        for queue in self.queues:
+            fill_queue(queue)
+        try:
+            dequeued = Queue.dequeue_any(self.queues, DEQUEUE_TIMEOUT_SECONDS, connection=self.connection)
+        except DequeueTimeout:
+            return None
+        if dequeued is not None:
+            fill_queue(dequeued[1])
+        return dequeued
+
+    async def _dequeue(self) -> tuple[Job, Queue] | None:
+        return await asyncio.to_thread(self._dequeue_fair)
+
+    async def _maintenance(self) -> None:
+        # Keeps running while in-flight jobs drain after stop(); cancelled by run()
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL_SECONDS)
+            try:
+                await asyncio.to_thread(self._heartbeat)
+                await asyncio.to_thread(publish_worker_metrics)
+            except Exception as exc:  # noqa: BLE001
+                print("[AsyncWorker] Heartbeat failed:", repr(exc))
+
+    def stop(self) -> None:
+        """Stop taking new jobs; jobs already taken are allowed to finish."""
+        if not self._stopping.is_set():
+            print(f"[AsyncWorker] Shutting down, waiting for {self._in_flight} job(s) in flight...")
+            self._stopping.set()
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except NotImplementedError:  # Windows
+                pass
+
+        await asyncio.to_thread(self.worker.register_birth)
+        publish_worker_metrics()
+        maintenance = asyncio.create_task(self._maintenance())
+        stages = [asyncio.create_task(self._prepare_stage()) for _ in range(self.prefetch)]
+        stages += [asyncio.create_task(self._evaluate_stage()) for _ in range(self.concurrency)]
+        queue_names = [queue.name for queue in self.queues]
+        print(
+            f"[AsyncWorker] {self.worker.name} listening on {queue_names}, "
+            f"concurrency {self.concurrency}, prefetch {self.prefetch}"
+        )
+        try:
+            while not self._stopping.is_set():
+                await self._intake.acquire()
+                if self._stopping.is_set():
+                    self._intake.release()
+                    break
+                # A job dequeued after stop() was requested still runs: it has already left the queue
+                dequeued = await self._dequeue()
+                if dequeued is None:
+                    self._intake.release()
+                    continue
+                await self._start_item(*dequeued)
+                self._jobs_taken += 1
+                if self.max_jobs and self._jobs_taken >= self.max_jobs:
+                    print(f"[AsyncWorker] Took {self._jobs_taken} jobs (max_jobs), finishing up")
+                    self._stopping.set()
+            await self._prepare_queue.join()
+            await self._ready_queue.join()
+        finally:
+            self._stopping.set()
+            for task in stages + [maintenance]:
+                task.cancel()
+            await asyncio.gather(*stages, maintenance, return_exceptions=True)
+            await asyncio.to_thread(self.worker.register_death)
+            publish_worker_metrics()
+
+
+def run_async_worker(queues: List[Queue], concurrency: int, prefetch: int = 1, max_jobs: int | None = None) -> None:
+    asyncio.run(AsyncEvaluationWorker(queues, concurrency, prefetch=prefetch, max_jobs=max_jobs).run())
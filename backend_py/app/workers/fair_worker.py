@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from rq import SimpleWorker
+
+from ..services.evaluation_scheduler_service import fill_queue
+
+
+class FairSimpleWorker(SimpleWorker):
+    """SimpleWorker that tops the RQ queue up from the per-job-posting lanes around each dequeue."""
+
+    def dequeue_job_and_maintain_ttl(self, timeout, max_idle_time=None):
+        for queue in self.queues:
+            fill_queue(queue)
+        result = super().dequeue_job_and_maintain_ttl(timeout, max_idle_time)
+        if result is not None:
+            fill_queue(result[1])
+        return result
@@ -0,0 +1,157 @@
+"""
+Keeps a pool of run_worker.py processes sized to the ai-evaluation backlog.
+
+Every WORKER_SCALE_INTERVAL_SECONDS the supervisor reads the backlog (the
+fair-scheduling lanes plus the RQ queue) and the age of its oldest job. It wants one process per
+WORKER_JOBS_PER_PROCESS queued jobs, within WORKER_MIN_PROCESSES and
+WORKER_MAX_PROCESSES. If the oldest job has waited longer than
+WORKER_SCALE_AGE_SECONDS it adds one more process. It scales down one
+process at a time, and only after the backlog has stayed low for
+WORKER_SCALE_DOWN_DELAY_SECONDS.
+
+Each worker exits after WORKER_MAX_JOBS_PER_PROCESS jobs and is replaced on
+the next tick. That bounds memory growth from long-lived parser state.
+
+Workers are stopped with SIGTERM, which RQ and the async worker treat as
+"finish the current job, then exit". On shutdown, workers still busy after
+WORKER_DRAIN_TIMEOUT_SECONDS are killed.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import signal
+import subprocess
+import sys
+import time
+from typing import List
+
+from rq import Queue
+
+from .. import metrics
+from ..config import Settings
+from ..services.evaluation_scheduler_service import backlog
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RUN_WORKER_PATH = os.path.join(BACKEND_DIR, "run_worker.py")
+
+
+def desired_processes(settings: Settings, depth: int, oldest_age: float, running: int) -> int:
+    target = math.ceil(depth / max(1, settings.worker_jobs_per_process))
+    if depth and oldest_age > settings.worker_scale_age_seconds:
+        # Jobs are waiting too long even though the backlog looks small: add capacity
+        target = max(target, running + 1)
+    return max(settings.worker_min_processes, min(settings.worker_max_processes, target))
+
+
+class WorkerSupervisor:
+    def __init__(self, queue: Queue, settings: Settings) -> None:
+        self.queue = queue
+        self.settings = settings
+        self.workers: List[subprocess.Popen] = []
+        # Asked to stop (scale down or shutdown) but still finishing their current job
+        self.draining: List[subprocess.Popen] = []
+        self._last_needed_at = time.monotonic()
+        self._stopping = False
+
+    def _spawn(self) -> None:
+        command = [sys.executable, RUN_WORKER_PATH]
+        if self.settings.worker_max_jobs_per_process > 0:
+            command += ["--max-jobs", str(self.settings.worker_max_jobs_per_process)]
+        # Own session: a terminal Ctrl+C reaches only the supervisor, which then sends a single
+        # SIGTERM (a second signal would make RQ abort the running job)
+        process = subprocess.Popen(command, cwd=BACKEND_DIR, start_new_session=True)
+        self.workers.append(process)
+        metrics.incr("supervisor.spawned")
+        print(f"[Supervisor] Started worker pid {process.pid} ({len(self.workers)} running)")
+
+    def _drain(self, process: subprocess.Popen) -> None:
+        self.workers.remove(process)
+        self.draining.append(process)
+        try:
+            process.send_signal(signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def _reap(self) -> None:
+        for process in list(self.workers):
+            code = process.poll()
+            if code is None:
+                continue
+            self.workers.remove(process)
+            # 0 is a normal exit after --max-jobs; anything else is a crash
+            metrics.incr("supervisor.recycled" if code == 0 else "supervisor.crashed")
+            print(f"[Supervisor] Worker pid {process.pid} exited with code {code}")
+        self.draining = [process for process in self.draining if process.poll() is None]
+
+    def scale(self) -> None:
+        self._reap()
+        pending = backlog(self.queue)
+        depth, oldest_age = pending["depth"], pending["oldest_age_seconds"]
+        running = len(self.workers)
+        target = desired_processes(self.settings, depth, oldest_age, running)
+
+        now = time.monotonic()
+        if target >= running:
+            self._last_needed_at = now
+            for _ in range(target - running):
+                self._spawn()
+        elif now - self._last_needed_at >= self.settings.worker_scale_down_delay_seconds:
+            # One at a time, newest first, so a short lull does not drop the whole pool
+            print(f"[Supervisor] Backlog {depth}, scaling down to {running - 1} worker(s)")
+            self._drain(self.workers[-1])
+            self._last_needed_at = now
+
+        try:
+            metrics.publish(
+                "supervisor",
+                {
+                    "queue_depth": depth,
+                    "oldest_job_age_seconds": oldest_age,
+                    "workers": len(self.workers),
+                    "draining": len(self.draining),
+                    "target_workers": target,
+                },
+            )
+        except Exception as exc:  # noqa: BLE001
+            print("[Supervisor] Failed to publish metrics:", repr(exc))
+
+    def stop(self, *_args) -> None:
+        if not self._stopping:
+            print("[Supervisor] Shutting down, draining workers...")
+            self._stopping = True
+
+    def shutdown(self) -> None:
+        for process in list(self.workers):
+            self._drain(process)
+        deadline = time.monotonic() + self.settings.worker_drain_timeout_seconds
+        for process in self.draining:
+            try:
+                process.wait(timeout=max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                print(f"[Supervisor] Worker pid {process.pid} did not drain in time, killing it")
+                process.kill()
+                process.wait()
+        self.draining = []
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        print(
+            f"[Supervisor] Managing {self.settings.worker_min_processes}-{self.settings.worker_max_processes} "
+            f"worker(s) for queue '{self.queue.name}'"
+        )
+        try:
+            while not self._stopping:
+                try:
+                    self.scale()
+                except Exception as exc:  # noqa: BLE001
+                    # Redis hiccups must not take the pool down; running workers carry on
+                    print("[Supervisor] Scaling check failed:", repr(exc))
+                deadline = time.monotonic() + self.settings.worker_scale_interval_seconds
+                while not self._stopping and time.monotonic() < deadline:
+                    time.sleep(0.2)
+        finally:
+            self.shutdown()
@@ -0,0 +1 @@
+"""Offline micro-benchmarks. Run from backend_py, e.g. `python -m benchmarks.row_materialization`."""
@@ -0,0 +1,145 @@
+"""
+Reproducible synthetic resume corpus (PDF and DOCX) for the parser benchmarks.
+
+PDFs are written by hand with the standard Helvetica font, so their text is
+limited to WinAnsi (Latin-1 accents); the unicode-heavy case is exercised
+fully (CJK, Cyrillic, Arabic, emoji) in DOCX. Everything is generated from a
+seeded RNG, so the same seed always produces the same text.
+"""
+
+from __future__ import annotations
+
+import io
+import random
+import zipfile
+from typing import List, NamedTuple
+
+import docx
+
+
+WORDS = (
+    "Python engineer designed distributed services Kubernetes PostgreSQL Redis led migration "
+    "improved latency mentored team delivered analytics pipeline TypeScript React AWS Terraform"
+).split()
+LATIN1_WORDS = "café naïve señor Zürich résumé façade Ångström crème brûlée déjà coöperate".split()
+UNICODE_WORDS = "工程师 分布式 系统 Москва разработчик مهندس برمجيات データ基盤 🚀 ✅ Δοκιμή".split()
+
+LINES_PER_PAGE = 55
+PARAGRAPHS_PER_PAGE = 40
+
+
+class Document(NamedTuple):
+    name: str
+    kind: str  # "pdf" | "docx"
+    data: bytes
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def minimal_pdf(pages: List[List[str]], table_columns: int = 0) -> bytes:
+    """
+    A valid PDF with one Helvetica text line per entry, no external dependencies.
+    With table_columns, each line is split on " | " and the cells are placed at
+    fixed x offsets, like a table without ruling lines. An empty page list entry
+    draws only a filled rectangle (a page with no text layer, like a scan).
+    """
+    objects: List[bytes] = []
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    for index, lines in enumerate(pages):
+        if not lines:
+            body = ["0.8 g 40 40 532 712 re f"]
+        elif table_columns:
+            body = ["BT /F1 9 Tf"]
+            for row, line in enumerate(lines):
+                for col, cell in enumerate(line.split(" | ")[:table_columns]):
+                    x, y = 50 + col * (512 // table_columns), 780 - row * 12
+                    body.append(f"1 0 0 1 {x} {y} Tm ({_escape(cell)}) Tj")
+            body.append("ET")
+        else:
+            body = ["BT /F1 10 Tf 12 TL 50 780 Td"]
+            body += [f"({_escape(line)}) '" for line in lines]
+            body.append("ET")
+        stream = "\n".join(body).encode("latin-1", errors="replace")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_ids[index] + 1} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def _sentence(rng: random.Random, vocabulary: List[str], words: int = 12) -> str:
+    return " ".join(rng.choice(vocabulary) for _ in range(words)) + "."
+
+
+def _table_row(rng: random.Random) -> str:
+    return " | ".join(
+        (rng.choice(WORDS), f"{rng.randint(1, 12)} years", rng.choice(WORDS), f"20{rng.randint(10, 25)}")
+    )
+
+
+def _pdf(rng: random.Random, pages: int, vocabulary: List[str]) -> bytes:
+    return minimal_pdf([[_sentence(rng, vocabulary) for _ in range(LINES_PER_PAGE)] for _ in range(pages)])
+
+
+def _docx(rng: random.Random, pages: int, vocabulary: List[str], tables: bool = False, image_bytes: int = 0) -> bytes:
+    document = docx.Document()
+    document.sections[0].header.paragraphs[0].text = _sentence(rng, vocabulary, 5)
+    for _ in range(pages):
+        for _ in range(PARAGRAPHS_PER_PAGE):
+            document.add_paragraph(_sentence(rng, vocabulary))
+        if tables:
+            table = document.add_table(rows=10, cols=4)
+            for row in table.rows:
+                for cell, value in zip(row.cells, _table_row(rng).split(" | ")):
+                    cell.text = value
+    buffer = io.BytesIO()
+    document.save(buffer)
+    if not image_bytes:
+        return buffer.getvalue()
+    # A large media part, like an embedded photo or portfolio scan
+    out = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(buffer.getvalue())) as source:
+        with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as target:
+            for item in source.infolist():
+                target.writestr(item, source.read(item.filename))
+            target.writestr("word/media/image1.png", rng.randbytes(image_bytes))
+    return out.getvalue()
+
+
+def build_corpus(seed: int = 1234) -> List[Document]:
+    rng = random.Random(seed)
+    corpus: List[Document] = []
+    for pages in (1, 5, 20, 50):
+        corpus.append(Document(f"text-{pages}p.pdf", "pdf", _pdf(rng, pages, WORDS)))
+    corpus.append(
+        Document(
+            "table-5p.pdf",
+            "pdf",
+            minimal_pdf([[_table_row(rng) for _ in range(LINES_PER_PAGE)] for _ in range(5)], table_columns=4),
+        )
+    )
+    corpus.append(Document("scanned-3p.pdf", "pdf", minimal_pdf([[], [], []])))
+    corpus.append(Document("latin1-5p.pdf", "pdf", _pdf(rng, 5, WORDS + LATIN1_WORDS)))
+    for pages in (1, 5, 20, 50):
+        corpus.append(Document(f"text-{pages}p.docx", "docx", _docx(rng, pages, WORDS)))
+    corpus.append(Document("table-5p.docx", "docx", _docx(rng, 5, WORDS, tables=True)))
+    corpus.append(Document("image-only.docx", "docx", _docx(rng, 0, WORDS, image_bytes=4 * 1024 * 1024)))
+    corpus.append(Document("unicode-5p.docx", "docx", _docx(rng, 5, WORDS + UNICODE_WORDS)))
+    return corpus
@@ -0,0 +1,187 @@
+"""
+Resume parser benchmark suite over a reproducible synthetic corpus.
+
+    python -m benchmarks.resume_parser --repeat 5 --output parser-report.json
+    python -m benchmarks.resume_parser --compare parser-report.json
+
+Every parser path (pdfium and pdfplumber PDF engines, streaming and
+python-docx DOCX extraction, and _clean_text on raw text) runs over the
+corpus from benchmarks.corpus. Each path runs in its own spawned process
+so its peak RSS is not polluted by the others. The JSON report holds per
+document p50/p95 latency, throughput, output length and a checksum of the
+output text; --compare prints latency ratios and checksum changes against a
+previous report. Runs offline; needs no database, Redis or API keys.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import io
+import json
+import multiprocessing
+import platform
+import resource
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+from .corpus import Document, build_corpus
+
+
+PATHS = ("pdf/pdfium", "pdf/pdfplumber", "docx/stream", "docx/python-docx", "clean_text")
+
+
+def _rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _path_function(path: str) -> Callable[[Document], str]:
+    from app.services import resume_parser_service as parser
+
+    if path == "pdf/pdfium":
+        return lambda doc: parser.extract_resume_text(doc.data, doc.name, pdf_engine="pdfium").text
+    if path == "pdf/pdfplumber":
+        return lambda doc: parser.extract_resume_text(doc.data, doc.name, pdf_engine="pdfplumber").text
+    if path == "docx/stream":
+        return lambda doc: parser._collect_text(parser._docx_paragraphs(doc.data))
+    if path == "docx/python-docx":
+        import docx
+
+        return lambda doc: parser._collect_text(p.text for p in docx.Document(io.BytesIO(doc.data)).paragraphs)
+    if path == "clean_text":
+        # Raw DOCX paragraph text joined, i.e. the cleaning cost alone on realistic input
+        def clean(doc: Document) -> str:
+            return parser._clean_text("\n".join(parser._docx_paragraphs(doc.data)))
+
+        return clean
+    raise ValueError(f"Unknown path: {path}")
+
+
+def _applies(path: str, doc: Document) -> bool:
+    return path.startswith(f"{doc.kind}/") or (path == "clean_text" and doc.kind == "docx")
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def run_path(path: str, corpus: List[Document], repeat: int) -> Dict[str, Any]:
+    """Runs in a fresh process: times one parser path over every applicable document."""
+    fn = _path_function(path)
+    baseline_rss = _rss_mb()
+    documents = []
+    for doc in corpus:
+        if not _applies(path, doc):
+            continue
+        fn(doc)  # warm-up, excluded from timings
+        samples = []
+        text = ""
+        for _ in range(repeat):
+            started = time.perf_counter()
+            text = fn(doc)
+            samples.append(time.perf_counter() - started)
+        p50 = statistics.median(samples)
+        documents.append(
+            {
+                "name": doc.name,
+                "bytes": len(doc.data),
+                "p50_ms": p50 * 1000,
+                "p95_ms": _percentile(samples, 95) * 1000,
+                "docs_per_s": 1 / p50 if p50 else 0.0,
+                "mb_per_s": len(doc.data) / 1024 / 1024 / p50 if p50 else 0.0,
+                "chars": len(text),
+                "checksum": hashlib.sha256(text.encode("utf-8")).hexdigest()[:16],
+            }
+        )
+    all_p50 = [d["p50_ms"] for d in documents]
+    return {
+        "path": path,
+        "baseline_rss_mb": baseline_rss,
+        "peak_rss_mb": _rss_mb(),
+        "total_p50_ms": sum(all_p50),
+        "documents": documents,
+    }
+
+
+def run(repeat: int, seed: int, paths: List[str]) -> Dict[str, Any]:
+    from app.services.resume_parser_service import PARSER_VERSION
+
+    corpus = build_corpus(seed)
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for path in paths:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results.append(executor.submit(run_path, path, corpus, repeat).result())
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "parser_version": PARSER_VERSION,
+            "seed": seed,
+            "repeat": repeat,
+            "corpus": [{"name": doc.name, "kind": doc.kind, "bytes": len(doc.data)} for doc in corpus],
+        },
+        "results": results,
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    for result in report["results"]:
+        print(
+            f"\n{result['path']}  (total p50 {result['total_p50_ms']:.1f} ms, "
+            f"peak RSS {result['peak_rss_mb']:.0f} MB, baseline {result['baseline_rss_mb']:.0f} MB)"
+        )
+        print(f"  {'document':22} {'p50 ms':>9} {'p95 ms':>9} {'docs/s':>9} {'MB/s':>7} {'chars':>7}  checksum")
+        for doc in result["documents"]:
+            print(
+                f"  {doc['name']:22} {doc['p50_ms']:9.2f} {doc['p95_ms']:9.2f} {doc['docs_per_s']:9.1f} "
+                f"{doc['mb_per_s']:7.2f} {doc['chars']:7d}  {doc['checksum']}"
+            )
+
+
+def compare(report: Dict[str, Any], previous: Dict[str, Any]) -> None:
+    before = {
+        (result["path"], doc["name"]): doc for result in previous["results"] for doc in result["documents"]
+    }
+    print(f"\nvs parser_version {previous['meta']['parser_version']} ({previous['meta']['created_at']})")
+    for result in report["results"]:
+        for doc in result["documents"]:
+            old = before.get((result["path"], doc["name"]))
+            if not old:
+                continue
+            ratio = doc["p50_ms"] / old["p50_ms"] if old["p50_ms"] else 0.0
+            changed = "" if doc["checksum"] == old["checksum"] else "  TEXT CHANGED"
+            print(f"  {result['path']:17} {doc['name']:22} {ratio:6.2f}x p50{changed}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--paths", nargs="+", choices=PATHS, default=list(PATHS))
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", help="previous JSON report to compare against")
+    args = parser.parse_args()
+
+    report = run(args.repeat, args.seed, args.paths)
+    print_report(report)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            compare(report, json.load(handle))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"\nReport written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
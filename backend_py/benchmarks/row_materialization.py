@@ -0,0 +1,166 @@
+"""
+Row materialization and JSON encoding cost per 10k rows, before and after
+the tuple-backed row / native datetime / ORJSON response changes.
+
+    python -m benchmarks.row_materialization --rows 10000 --repeat 5
+
+Uses an in-memory SQLite table shaped like the /api/candidates/ query, so it
+needs no database server. Times are the best of --repeat runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, text
+
+from app.db import _rows_to_dicts, from_json_db
+
+
+QUERY = """
+SELECT c.id, c.name, c.email, c.phone, c.created_at, c.skills,
+       j.id AS job_id, j.title AS job_title, j.description AS job_description
+FROM candidates c
+LEFT JOIN jobs j ON j.id = c.job_id
+ORDER BY c.created_at DESC
+"""
+
+
+def _legacy_row_to_dict(mapping: Any) -> Dict[str, Any]:
+    row: Dict[str, Any] = {}
+    for key, value in dict(mapping).items():
+        if isinstance(value, datetime):
+            row[key] = value.isoformat()
+        else:
+            row[key] = value
+    return row
+
+
+def _legacy_from_json_db(value: Any, default: Any) -> Any:
+    if value is None:
+        return default
+    if isinstance(value, (bytes, bytearray)):
+        value = value.decode("utf-8")
+    try:
+        return json.loads(value)
+    except Exception:  # noqa: BLE001
+        return default
+
+
+def _legacy_encode(content: Any) -> bytes:
+    # What FastAPI's default JSONResponse path does with a returned list
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _build_engine(rows: int):
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"detect_types": sqlite3.PARSE_DECLTYPES, "check_same_thread": False},
+    )
+    base = datetime(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE jobs (id TEXT PRIMARY KEY, title TEXT, description TEXT)"))
+        conn.execute(
+            text(
+                "CREATE TABLE candidates (id TEXT PRIMARY KEY, job_id TEXT, name TEXT, email TEXT, "
+                "phone TEXT, created_at TIMESTAMP, skills TEXT)"
+            )
+        )
+        conn.execute(
+            text("INSERT INTO jobs VALUES (:id, :title, :description)"),
+            [
+                {"id": f"job-{i}", "title": f"Role {i}", "description": "Build and operate services. " * 40}
+                for i in range(20)
+            ],
+        )
+        conn.execute(
+            text("INSERT INTO candidates VALUES (:id, :job_id, :name, :email, :phone, :created_at, :skills)"),
+            [
+                {
+                    "id": f"cand-{i:08d}",
+                    "job_id": f"job-{i % 20}",
+                    "name": f"Candidate {i}",
+                    "email": f"candidate{i}@example.com",
+                    "phone": "+1 555 0100",
+                    "created_at": base + timedelta(seconds=i),
+                    "skills": json.dumps({"python": "5 years", "sql": "3 years", "aws": "2 years"}),
+                }
+                for i in range(rows)
+            ],
+        )
+    return engine
+
+
+def _best_of(repeat: int, fn: Callable[[], Any]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run(rows: int, repeat: int) -> Dict[str, float]:
+    engine = _build_engine(rows)
+    conn = engine.connect()
+
+    def raw_fetch() -> List[Any]:
+        return conn.execute(text(QUERY)).all()
+
+    def legacy_rows() -> List[Dict[str, Any]]:
+        result = [_legacy_row_to_dict(r._mapping) for r in conn.execute(text(QUERY))]
+        for row in result:
+            row["skills"] = _legacy_from_json_db(row["skills"], {})
+        return result
+
+    def current_rows() -> List[Dict[str, Any]]:
+        result = _rows_to_dicts(conn.execute(text(QUERY)))
+        for row in result:
+            row["skills"] = from_json_db(row["skills"], {})
+        return result
+
+    legacy_payload = legacy_rows()
+    current_payload = current_rows()
+    if _legacy_encode(legacy_payload) != orjson.dumps(current_payload):
+        raise SystemExit("Encoded payloads differ between legacy and current paths")
+
+    timings = {
+        "raw_fetch": _best_of(repeat, raw_fetch),
+        "legacy_materialize": _best_of(repeat, legacy_rows),
+        "current_materialize": _best_of(repeat, current_rows),
+        "legacy_encode": _best_of(repeat, lambda: _legacy_encode(legacy_payload)),
+        "current_encode": _best_of(repeat, lambda: orjson.dumps(current_payload)),
+    }
+    conn.close()
+    scale = 10_000 / rows
+    return {name: seconds * scale * 1000 for name, seconds in timings.items()}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    ms = run(args.rows, args.repeat)
+    legacy_total = ms["legacy_materialize"] + ms["legacy_encode"]
+    current_total = ms["current_materialize"] + ms["current_encode"]
+    print(f"ms per 10k rows ({args.rows} rows, best of {args.repeat})")
+    print(f"  query + fetch only      {ms['raw_fetch']:8.2f}")
+    print(f"  materialize  legacy     {ms['legacy_materialize']:8.2f}   current {ms['current_materialize']:8.2f}")
+    print(f"  encode       legacy     {ms['legacy_encode']:8.2f}   current {ms['current_encode']:8.2f}")
+    print(f"  total        legacy     {legacy_total:8.2f}   current {current_total:8.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
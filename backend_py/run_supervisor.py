@@ -0,0 +1,14 @@
+import os
+import sys
+
+# Ensure the current directory is in the python path
+sys.path.append(os.getcwd())
+
+from app.config import get_settings
+from app.queue import ai_queue
+from app.workers.supervisor import WorkerSupervisor
+
+
+if __name__ == '__main__':
+    # Runs run_worker.py processes, scaled to the ai-evaluation backlog (see app/workers/supervisor.py)
+    WorkerSupervisor(ai_queue, get_settings()).run()
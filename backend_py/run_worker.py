@@ -1,13 +1,17 @@
 ## backend_py/run_worker.py
+import argparse
 import os
 import sys
 
 # Ensure the current directory is in the python path
 sys.path.append(os.getcwd())
 
-# Import SimpleWorker instead of Worker
-from rq import SimpleWorker, Queue
+# SimpleWorker (no fork) that also dispatches from the fair-scheduling lanes
+from rq import Queue
+from app.config import get_settings
 from app.queue import redis_conn
+from app.workers.fair_worker import FairSimpleWorker
+from app.workers.ai_evaluation_worker import publish_worker_metrics
 import nest_asyncio
 
 # Apply nest_asyncio to allow async DB calls inside the worker
@@ -17,14 +21,36 @@ nest_asyncio.apply()
 listen = ['ai-evaluation']
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    # Set by run_supervisor.py so processes are recycled before memory grows unbounded
+    parser.add_argument('--max-jobs', type=int, default=None, help='exit after this many jobs')
+    args = parser.parse_args()
+
+    settings = get_settings()
     print(f"Worker listening on queues: {listen}")
-    print("Running in SimpleWorker mode (Windows compatible)...")
-    
+
     # Create Queue objects with the explicit Redis connection
     queues = [Queue(name, connection=redis_conn) for name in listen]
-    
+
+    if settings.eval_worker_mode == 'async':
+        # Many evaluations in flight on one event loop (EVAL_WORKER_CONCURRENCY)
+        from app.workers.async_worker import run_async_worker
+
+        run_async_worker(
+            queues,
+            settings.eval_worker_concurrency,
+            prefetch=settings.eval_worker_prefetch,
+            max_jobs=args.max_jobs,
+        )
+        sys.exit(0)
+
+    print("Running in SimpleWorker mode (Windows compatible)...")
+
+    # Register this worker's (empty) metrics so it shows up in /metrics right away
+    publish_worker_metrics()
+
     # Use SimpleWorker for Windows support
-    worker = SimpleWorker(queues, connection=redis_conn)
+    worker = FairSimpleWorker(queues, connection=redis_conn)
     
     # Start working
-    worker.work()
\ No newline at end of file
+    worker.work(max_jobs=args.max_jobs)
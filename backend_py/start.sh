@@ -1,8 +1,8 @@
 #!/bin/bash
 pip install rq
 
-# 1. Start the Worker in the background
-python run_worker.py &
+# 1. Start the worker supervisor in the background (scales run_worker.py processes to the queue backlog)
+python run_supervisor.py &
 
 # 2. Start the API in the foreground
 uvicorn app.main:app --host 0.0.0.0 --port $PORT
\ No newline at end of file
@@ -0,0 +1,140 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services import evaluation_checkpoint_service as checkpoints
+from app.workers import ai_evaluation_worker as worker
+
+
+RESULT = {
+    "score": 70,
+    "recommendation": "POTENTIAL_MATCH",
+    "matched_skills": [],
+    "missing_skills": [],
+    "strengths": [],
+    "weaknesses": [],
+    "summary": "ok",
+}
+RESUME_TEXT = "experienced python engineer with redis and kubernetes " * 5
+
+
+class FakeServices:
+    """Stubs for the DB, storage and OpenAI calls the worker makes."""
+
+    def __init__(self, monkeypatch):
+        self.llm_calls = 0
+        self.save_failures = 0
+        self.download_failures = 0
+        self.saved = []
+        self.failed = []
+        for name, value in {
+            "get_job_details": self.get_job_details,
+            "evaluate_candidate_cached": self.evaluate,
+            "save_evaluation": self.save,
+            "mark_evaluation_failed": self.mark_failed,
+            "get_cached_evaluation": lambda resume_hash, job_details: None,
+            "get_parsed_text": lambda resume_hash: None,
+            "_load_resume_bytes": self.download,
+            "parse_resume_once": lambda file_bytes, filename, resume_hash: RESUME_TEXT,
+            "publish_worker_metrics": lambda: None,
+        }.items():
+            monkeypatch.setattr(worker, name, value)
+
+    async def get_job_details(self, job_id):
+        return {"id": job_id, "title": "Engineer", "description": "Python"}
+
+    async def evaluate(self, text, job_details, resume_hash):
+        self.llm_calls += 1
+        return dict(RESULT)
+
+    async def save(self, candidate_id, result, **_kwargs):
+        if self.save_failures:
+            self.save_failures -= 1
+            raise ConnectionError("database went away")
+        self.saved.append(candidate_id)
+
+    async def mark_failed(self, candidate_id, message):
+        self.failed.append((candidate_id, message))
+
+    async def download(self, path, **_kwargs):
+        if self.download_failures:
+            self.download_failures -= 1
+            raise httpx.ConnectError("connection reset")
+        if path == "missing.pdf":
+            request = httpx.Request("GET", "https://files.test/missing.pdf")
+            raise httpx.HTTPStatusError("not found", request=request, response=httpx.Response(404, request=request))
+        return b"%PDF"
+
+
+@pytest.fixture
+def services(monkeypatch, redis_conn, counters):
+    settings = worker.get_settings()
+    monkeypatch.setattr(settings, "eval_retry_attempts", 3)
+    monkeypatch.setattr(settings, "eval_retry_base_seconds", 0.01)
+    monkeypatch.setattr(settings, "eval_retry_max_seconds", 0.02)
+    return FakeServices(monkeypatch)
+
+
+def _run(candidate_id, resume_path="resume.pdf", resume_hash="hash-1", **kwargs):
+    return asyncio.run(
+        worker.process_evaluation_job_async(
+            candidate_id, resume_path, "cloudinary", job_id="job-1", resume_hash=resume_hash, **kwargs
+        )
+    )
+
+
+def test_transient_download_errors_are_retried(services, counters):
+    services.download_failures = 2
+    assert _run("c1") == {"success": True, "score": 70}
+    assert counters["evaluation.retry.download"] == 2
+    assert services.failed == []
+    assert checkpoints.get_checkpoint("c1") == {}
+
+
+def test_permanent_errors_fail_without_retry(services, counters):
+    with pytest.raises(httpx.HTTPStatusError):
+        _run("c1", resume_path="missing.pdf")
+    assert "evaluation.retry.download" not in counters
+    assert [candidate for candidate, _ in services.failed] == ["c1"]
+
+
+def test_rerun_resumes_from_checkpointed_llm_result(services, counters):
+    services.save_failures = 3
+    with pytest.raises(ConnectionError):
+        _run("c1")
+    assert services.failed == [("c1", "database went away")]
+    assert checkpoints.get_checkpoint("c1")["llm_result"]["score"] == 70
+
+    assert _run("c1") == {"success": True, "score": 70}
+    assert services.llm_calls == 1
+    assert counters["evaluation.checkpoint_resumed"] == 1
+    assert checkpoints.get_checkpoint("c1") == {}
+
+
+def test_checkpoint_for_another_resume_is_discarded(services):
+    checkpoints.save_checkpoint("c1", resume_hash="old-hash", llm_key="stale", llm_result={"score": 1})
+    _run("c1", resume_hash="new-hash")
+    assert services.llm_calls == 1
+
+
+def test_run_releases_enqueue_marker_and_lease(services, redis_conn):
+    redis_conn.set("eval_sched:dedupe:eval-test", "0")
+    _run("c1", dedupe_job_id="eval-test")
+    assert not redis_conn.exists("eval_sched:dedupe:eval-test")
+    assert not redis_conn.exists("eval_lease:c1")
+
+
+def test_failed_run_releases_enqueue_marker_and_lease(services, redis_conn):
+    redis_conn.set("eval_sched:dedupe:eval-test", "0")
+    with pytest.raises(httpx.HTTPStatusError):
+        _run("c1", resume_path="missing.pdf", dedupe_job_id="eval-test")
+    assert not redis_conn.exists("eval_sched:dedupe:eval-test")
+    assert not redis_conn.exists("eval_lease:c1")
+
+
+def test_duplicate_run_keeps_the_running_lease(services, redis_conn, counters):
+    redis_conn.set("eval_lease:c1", "other-run")
+    assert _run("c1")["duplicate"] is True
+    assert redis_conn.get("eval_lease:c1") == b"other-run"
+    assert counters["evaluation.duplicate_suppressed"] == 1
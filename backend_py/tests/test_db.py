@@ -0,0 +1,81 @@
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.db import UnitOfWork, execute, execute_async, fetch_all, get_unit_of_work, unit_of_work
+
+
+@pytest.fixture(autouse=True)
+def notes_table():
+    execute("CREATE TABLE IF NOT EXISTS uow_notes (body TEXT)")
+    execute("DELETE FROM uow_notes")
+    yield
+
+
+def _bodies():
+    return [row["body"] for row in fetch_all("SELECT body FROM uow_notes ORDER BY body")]
+
+
+def test_unit_of_work_commits_once_on_one_connection():
+    with unit_of_work() as uow:
+        execute("INSERT INTO uow_notes (body) VALUES ('a')")
+        execute("INSERT INTO uow_notes (body) VALUES ('b')")
+        assert uow.checkouts == 1
+    assert uow.statements == 2
+    assert uow.commits == 1
+    assert _bodies() == ["a", "b"]
+
+
+def test_unit_of_work_rolls_back_on_exception():
+    with pytest.raises(RuntimeError):
+        with unit_of_work():
+            execute("INSERT INTO uow_notes (body) VALUES ('a')")
+            raise RuntimeError("boom")
+    assert _bodies() == []
+
+
+def test_unit_of_work_rollback_only():
+    with unit_of_work() as uow:
+        execute("INSERT INTO uow_notes (body) VALUES ('a')")
+        uow.rollback_only = True
+    assert _bodies() == []
+
+
+def test_early_commit_releases_connection_and_keeps_work():
+    with unit_of_work() as uow:
+        execute("INSERT INTO uow_notes (body) VALUES ('a')")
+        uow.commit()
+        assert uow._conn is None
+        execute("INSERT INTO uow_notes (body) VALUES ('b')")
+        uow.rollback_only = True
+    assert uow.checkouts == 2
+    assert _bodies() == ["a"]
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+
+    @app.post("/notes/{body}/{code}")
+    async def add_note(body: str, code: int, uow: UnitOfWork = Depends(get_unit_of_work)):
+        await execute_async("INSERT INTO uow_notes (body) VALUES (:body)", {"body": body})
+        if code == 599:
+            raise RuntimeError("unhandled")
+        if code != 200:
+            raise HTTPException(status_code=code, detail="failed")
+        return {"ok": True}
+
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def test_dependency_commits_on_success_and_client_errors():
+    client = _client()
+    assert client.post("/notes/ok/200").status_code == 200
+    assert client.post("/notes/expired/400").status_code == 400
+    assert _bodies() == ["expired", "ok"]
+
+
+def test_dependency_rolls_back_on_server_errors():
+    client = _client()
+    assert client.post("/notes/http500/500").status_code == 500
+    assert client.post("/notes/crash/599").status_code == 500
+    assert _bodies() == []
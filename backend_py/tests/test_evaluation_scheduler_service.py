@@ -0,0 +1,117 @@
+from collections import Counter
+
+import pytest
+from rq import Queue
+from rq.job import JobStatus
+
+from app.services import evaluation_scheduler_service as scheduler
+
+
+FUNC = "app.workers.ai_evaluation_worker.process_evaluation_job"
+
+
+@pytest.fixture
+def queue(redis_conn, monkeypatch):
+    monkeypatch.setattr(scheduler.get_settings(), "eval_queue_buffer", 1)
+    return Queue("ai-evaluation-test", connection=redis_conn)
+
+
+def _enqueue(queue, lane, count):
+    return [scheduler.enqueue_evaluation(queue, lane, FUNC, {"candidate_id": f"{lane}-{i}"}, 600) for i in range(count)]
+
+
+def _dispatch_order(queue, count):
+    """Lanes in the order their jobs reach the RQ queue, one buffer slot at a time."""
+    lanes = []
+    for _ in range(count):
+        job = queue.dequeue_any([queue], None, connection=queue.connection)[0]
+        lanes.append(job.kwargs["candidate_id"].split("-")[0])
+        scheduler.fill_queue(queue)
+    return lanes
+
+
+def test_large_lane_does_not_starve_small_one(queue):
+    _enqueue(queue, "big", 50)
+    _enqueue(queue, "small", 3)
+    order = _dispatch_order(queue, 53)
+    # Round-robin once both lanes are active: the small job's 3 evaluations go out early
+    assert [i for i, lane in enumerate(order) if lane == "small"] == [2, 4, 6]
+    assert scheduler.backlog(queue)["depth"] == 0
+
+
+def test_weight_sets_share_of_dispatch(queue):
+    scheduler.set_lane_weight("heavy", 3)
+    _enqueue(queue, "heavy", 30)
+    _enqueue(queue, "light", 30)
+    shares = Counter(_dispatch_order(queue, 20))
+    assert shares["heavy"] == 15
+    assert shares["light"] == 5
+
+
+def test_new_lane_starts_at_current_virtual_time(queue):
+    _enqueue(queue, "old", 20)
+    _dispatch_order(queue, 10)
+    _enqueue(queue, "new", 5)
+    # A lane that becomes active does not get a burst to "catch up" with the old one
+    order = _dispatch_order(queue, 6)
+    assert Counter(order) == Counter({"old": 3, "new": 3})
+
+
+def test_weight_bounds(redis_conn):
+    with pytest.raises(ValueError):
+        scheduler.set_lane_weight("job", 0)
+    scheduler.set_lane_weight("job", 2)
+    assert scheduler.get_lane_weight("job") == 2
+    scheduler.set_lane_weight("job", scheduler.DEFAULT_WEIGHT)
+    assert redis_conn.hget(scheduler.WEIGHTS_KEY, "job") is None
+
+
+def _marker(job_id):
+    return f"{scheduler.DEDUPE_KEY_PREFIX}{job_id}"
+
+
+def _enqueue_once(queue, job_id="eval-test"):
+    return scheduler.enqueue_evaluation(queue, "job", FUNC, {"candidate_id": "job-0"}, 600, job_id)
+
+
+def test_job_id_is_stable_across_retried_submits():
+    first = scheduler.evaluation_job_id("job-1", "Ada@example.com", "hash")
+    assert first == scheduler.evaluation_job_id("job-1", " ada@example.com", "hash")
+    assert first != scheduler.evaluation_job_id("job-2", "ada@example.com", "hash")
+    assert first != scheduler.evaluation_job_id("job-1", "ada@example.com", "other-hash")
+
+
+def test_duplicate_enqueue_is_suppressed(queue, counters):
+    assert _enqueue_once(queue) is not None
+    assert _enqueue_once(queue) is None
+    assert counters["eval_sched.duplicate_suppressed"] == 1
+
+
+def test_released_marker_allows_enqueue_after_the_run(queue):
+    job = _enqueue_once(queue)
+    job.set_status(JobStatus.FINISHED)
+    scheduler.release_job_id(job.id)
+    assert _enqueue_once(queue) is not None
+
+
+def test_stale_marker_of_killed_run_is_taken_over(queue, redis_conn, counters):
+    job = _enqueue_once(queue)
+    # The worker died mid-run: the job ended up failed and the marker was never released
+    job.set_status(JobStatus.FAILED)
+    redis_conn.set(_marker(job.id), "0")
+
+    assert _enqueue_once(queue) is not None
+    assert counters["eval_sched.stale_marker_taken_over"] == 1
+    assert redis_conn.ttl(_marker(job.id)) > 0
+
+
+def test_old_marker_of_live_job_is_kept(queue, redis_conn):
+    job = _enqueue_once(queue)
+    redis_conn.set(_marker(job.id), "0")
+    assert _enqueue_once(queue) is None
+
+
+def test_fresh_marker_without_job_is_kept(queue, redis_conn):
+    # Another enqueue has claimed the id but not saved its job yet
+    redis_conn.set(_marker("eval-test"), "9999999999")
+    assert _enqueue_once(queue) is None
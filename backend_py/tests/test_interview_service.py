@@ -0,0 +1,34 @@
+import asyncio
+
+from app.db import _current_unit_of_work, fetch_all, fetch_one, get_engine, unit_of_work_async
+from app.services import interview_service
+
+
+def test_question_generation_holds_no_connection(monkeypatch):
+    seen = {}
+
+    def generate(title, description):
+        seen["checked_out"] = get_engine().pool.checkedout()
+        return ["Tell us about yourself"]
+
+    def save(job_id, questions):
+        seen["saved_in"] = _current_unit_of_work.get()
+
+    monkeypatch.setattr(interview_service, "get_job_questions", lambda job_id: fetch_all("SELECT 1 AS id WHERE 1 = 0"))
+    monkeypatch.setattr(
+        interview_service, "get_job", lambda job_id: fetch_one("SELECT 'Engineer' AS title, '' AS description")
+    )
+    monkeypatch.setattr(interview_service, "generate_question_texts", generate)
+    monkeypatch.setattr(interview_service, "save_interview_questions", save)
+
+    async def request():
+        # As in a route holding the request's unit of work
+        async with unit_of_work_async() as uow:
+            await interview_service.ensure_interview_questions("job-1")
+            return uow
+
+    uow = asyncio.run(request())
+    assert seen["checked_out"] == 0
+    assert uow.checkouts == 0
+    # The questions are written in their own unit of work, not the request's
+    assert seen["saved_in"] is not None and seen["saved_in"] is not uow
@@ -0,0 +1,39 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.services import openai_rate_limit_service as limiter
+
+
+def test_acquire_async_keeps_redis_calls_off_the_event_loop(redis_conn, monkeypatch):
+    threads = []
+    real_try_acquire = limiter._try_acquire
+
+    def recording_try_acquire(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return real_try_acquire(*args, **kwargs)
+
+    monkeypatch.setattr(limiter, "_try_acquire", recording_try_acquire)
+
+    async def main():
+        await limiter.acquire_async("gpt-4o", 100, priority="background")
+        await limiter.settle_async("gpt-4o", 100, type("Usage", (), {"total_tokens": 40})())
+        return threading.current_thread()
+
+    loop_thread = asyncio.run(main())
+    assert len(threads) == 2
+    assert all(thread is not loop_thread for thread in threads)
+
+
+def test_background_call_gives_up_when_bucket_is_empty(redis_conn, monkeypatch):
+    settings = limiter.get_settings()
+    monkeypatch.setattr(settings, "openai_rate_limits", {"tiny": (1, 0)})
+    monkeypatch.setattr(settings, "openai_background_max_wait_seconds", 0.1)
+
+    async def main():
+        await limiter.acquire_async("tiny", priority="background")
+        await limiter.acquire_async("tiny", priority="background")
+
+    with pytest.raises(limiter.RateLimitTimeout):
+        asyncio.run(main())
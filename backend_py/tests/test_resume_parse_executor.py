@@ -0,0 +1,53 @@
+import os
+import time
+
+import pytest
+
+from app.config import get_settings
+from app.services import resume_parse_executor as executor_module
+
+
+def _sleepy_parse(task_id, attempt, buffer, filename):
+    """Stand-in for _parse_in_child (runs in the spawned child): sleeps `filename` seconds."""
+    executor_module._child_started_queue.put((task_id, attempt, os.getpid()))
+    seconds = float(filename)
+    time.sleep(seconds)
+    return buffer.decode(), seconds
+
+
+@pytest.fixture
+def parse_pool(monkeypatch, counters):
+    def configure(size):
+        monkeypatch.setattr(get_settings(), "parse_pool_size", size)
+
+    monkeypatch.setattr(executor_module, "_parse_in_child", _sleepy_parse)
+    executor_module._executor = None
+    yield configure
+    if executor_module._executor is not None:
+        executor_module._executor.shutdown(wait=True)
+        executor_module._executor = None
+
+
+def test_time_spent_queued_does_not_count(parse_pool):
+    parse_pool(1)
+    first = executor_module.submit_parse(b"first", "0.8", timeout=1.2)
+    second = executor_module.submit_parse(b"second", "0.8", timeout=1.2)
+    # second waits ~0.8s in the queue, then runs 0.8s: over the timeout from submission, not from start
+    assert first.result(timeout=20) == "first"
+    assert second.result(timeout=20) == "second"
+
+
+def test_timeout_kills_only_the_runaway_parse(parse_pool, counters):
+    parse_pool(2)
+    runaway = executor_module.submit_parse(b"runaway", "30", timeout=0.5)
+    running = executor_module.submit_parse(b"running", "1.5", timeout=20)
+    queued = executor_module.submit_parse(b"queued", "0.1", timeout=20)
+
+    with pytest.raises(RuntimeError, match="timed out"):
+        runaway.result(timeout=20)
+    # The parses that shared the broken pool are resubmitted, not failed
+    assert running.result(timeout=20) == "running"
+    assert queued.result(timeout=20) == "queued"
+    assert counters["parse.timeouts"] == 1
+    assert counters["parse.resubmitted"] >= 1
+    assert counters["parse.in_flight"] == 0
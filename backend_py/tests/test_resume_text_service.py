@@ -0,0 +1,85 @@
+import pytest
+
+from app.services import resume_text_service as texts
+
+HASH = "abc123"
+
+
+@pytest.fixture
+def ttls(monkeypatch):
+    settings = texts.get_settings()
+    monkeypatch.setattr(settings, "resume_text_ttl_seconds", 100)
+    monkeypatch.setattr(settings, "resume_text_ref_ttl_seconds", 1000)
+    return settings
+
+
+def _text_ttl(redis_conn):
+    return redis_conn.ttl(texts._text_key(HASH))
+
+
+def test_retain_extends_the_text_to_the_referenced_ttl(redis_conn, ttls):
+    texts.put_parsed_text(HASH, "resume")
+    assert _text_ttl(redis_conn) <= 100
+
+    texts.retain_parsed_text(HASH, "job-a")
+    texts.retain_parsed_text(HASH, "job-b")
+
+    assert _text_ttl(redis_conn) > 100
+    assert redis_conn.scard(texts._refs_key(HASH)) == 2
+
+
+def test_repeated_release_of_one_job_keeps_the_other_reference(redis_conn, ttls):
+    texts.put_parsed_text(HASH, "resume")
+    texts.retain_parsed_text(HASH, "job-a")
+    texts.retain_parsed_text(HASH, "job-b")
+
+    texts.release_parsed_text(HASH, "job-a")
+    texts.release_parsed_text(HASH, "job-a")
+
+    assert redis_conn.smembers(texts._refs_key(HASH)) == {b"job-b"}
+    assert _text_ttl(redis_conn) > 100
+
+
+def test_last_release_falls_back_to_the_unreferenced_ttl(redis_conn, ttls):
+    texts.put_parsed_text(HASH, "resume")
+    texts.retain_parsed_text(HASH, "job-a")
+
+    texts.release_parsed_text(HASH, "job-a")
+
+    assert 0 < _text_ttl(redis_conn) <= 100
+    assert texts.get_parsed_text(HASH) == "resume"
+
+
+def test_put_while_referenced_uses_the_referenced_ttl(redis_conn, ttls):
+    texts.retain_parsed_text(HASH, "job-a")
+    texts.put_parsed_text(HASH, "resume")
+
+    assert _text_ttl(redis_conn) > 100
+
+
+def test_referenced_ttl_is_never_shorter_than_the_unreferenced_one(redis_conn, ttls, monkeypatch):
+    monkeypatch.setattr(ttls, "resume_text_ref_ttl_seconds", 10)
+    texts.put_parsed_text(HASH, "resume")
+    texts.retain_parsed_text(HASH, "job-a")
+
+    assert _text_ttl(redis_conn) > 10
+
+
+def test_parse_reports_whether_the_text_was_stored(redis_conn, ttls, monkeypatch):
+    monkeypatch.setattr(texts, "parse_resume", lambda file_bytes, filename: type("Parsed", (), {"text": "resume"})())
+    assert texts.parse_resume_shared(b"%PDF", "cv.pdf", HASH) == ("resume", True)
+    # Served from the store on the next call
+    assert texts.parse_resume_shared(b"%PDF", "cv.pdf", HASH) == ("resume", True)
+
+
+def test_failed_write_is_reported_so_no_reference_is_taken(redis_conn, ttls, monkeypatch):
+    def broken_put():
+        def script(**_kwargs):
+            raise ConnectionError("redis went away")
+
+        return script
+
+    monkeypatch.setattr(texts, "parse_resume", lambda file_bytes, filename: type("Parsed", (), {"text": "resume"})())
+    monkeypatch.setattr(texts, "_put_script", broken_put)
+    assert texts.put_parsed_text(HASH, "resume") is False
+    assert texts.parse_resume_shared(b"%PDF", "cv.pdf", HASH) == ("resume", False)
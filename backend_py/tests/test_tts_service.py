@@ -0,0 +1,37 @@
+from app.services import tts_service
+
+
+class FakeSpeech:
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, **_kwargs):
+        self.calls += 1
+        return type("Speech", (), {"content": b"ID3"})()
+
+
+class FakeClient:
+    def __init__(self, speech):
+        self.audio = type("Audio", (), {"speech": speech})()
+
+
+def test_question_audio_is_synthesized_once_and_shared(redis_conn, counters, monkeypatch):
+    speech = FakeSpeech()
+    uploads = []
+
+    def upload(audio_bytes, cache_key, audio_format):
+        uploads.append(cache_key)
+        return f"https://media.test/tts/{cache_key}.{audio_format}"
+
+    monkeypatch.setattr(tts_service, "Client", lambda api_key: FakeClient(speech))
+    monkeypatch.setattr(tts_service, "acquire", lambda *args, **kwargs: None)
+    monkeypatch.setattr(tts_service, "upload_question_audio", upload)
+
+    first = tts_service.get_question_audio_url("Tell us about yourself")
+    # Another API instance sees the same URL through Redis
+    second = tts_service.get_question_audio_url("Tell us about yourself")
+
+    assert first == second == f"https://media.test/tts/{tts_service.tts_cache_key('Tell us about yourself')}.mp3"
+    assert speech.calls == 1
+    assert uploads == [tts_service.tts_cache_key("Tell us about yourself")]
+    assert counters["tts.cache_hit"] == 1
@@ -2,12 +2,35 @@
 
 import { useEffect, useState } from "react"
 import { CandidatesList } from "@/components/candidates/candidates-list"
+import { Button } from "@/components/ui/button"
 import { apiRequest } from "@/lib/api/client"
-import type { CandidateWithJob } from "@/lib/types/api"
+import type { CandidatePage, CandidateWithJob } from "@/lib/types/api"
+
+const PAGE_SIZE = 50
+
+async function fetchCandidatePage(cursor: string | null): Promise<{
+  candidates: CandidateWithJob[]
+  nextCursor: string | null
+}> {
+  const params = new URLSearchParams({ limit: String(PAGE_SIZE) })
+  if (cursor) params.set("cursor", cursor)
+  const page = await apiRequest<CandidatePage>(`/candidates/?${params.toString()}`)
+  const candidates = page.items.map((item) => ({
+    id: item.id,
+    name: item.name,
+    email: item.email,
+    phone: item.phone,
+    created_at: item.created_at,
+    job: page.jobs[item.job_id] ?? { id: item.job_id, title: "Unknown", description: null },
+  }))
+  return { candidates, nextCursor: page.next_cursor }
+}
 
 export default function CandidatesPage() {
   const [candidates, setCandidates] = useState<CandidateWithJob[]>([])
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [error, setError] = useState<string | null>(null)
 
   useEffect(() => {
@@ -15,8 +38,9 @@ export default function CandidatesPage() {
       try {
         setLoading(true)
         setError(null)
-        const data = await apiRequest<CandidateWithJob[]>("/candidates")
-        setCandidates(data)
+        const page = await fetchCandidatePage(null)
+        setCandidates(page.candidates)
+        setNextCursor(page.nextCursor)
       } catch (err: any) {
         setError(err.message || "Failed to fetch candidates")
       } finally {
@@ -27,6 +51,20 @@ export default function CandidatesPage() {
     fetchCandidates()
   }, [])
 
+  const loadMore = async () => {
+    if (!nextCursor) return
+    try {
+      setLoadingMore(true)
+      const page = await fetchCandidatePage(nextCursor)
+      setCandidates((prev) => [...prev, ...page.candidates])
+      setNextCursor(page.nextCursor)
+    } catch (err: any) {
+      setError(err.message || "Failed to fetch candidates")
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   if (loading) {
     return (
       <div className="space-y-8">
@@ -76,6 +114,14 @@ export default function CandidatesPage() {
       </div>
 
       <CandidatesList candidates={candidates} />
+
+      {nextCursor && (
+        <div className="flex justify-center">
+          <Button variant="outline" onClick={loadMore} disabled={loadingMore}>
+            {loadingMore ? "Loading..." : "Load more"}
+          </Button>
+        </div>
+      )}
     </div>
   )
 }
@@ -42,6 +42,8 @@ export function InterviewShell({ token }: InterviewShellProps) {
   const isListeningRef = useRef<boolean>(false)
 
   const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:3001/api"
+  // Static files (e.g. cached question audio) are served from the backend root, not /api
+  const API_ORIGIN = API_BASE_URL.replace(/\/api\/?$/, "")
 
   // --- INIT ---
   useEffect(() => {
@@ -202,8 +204,9 @@ export function InterviewShell({ token }: InterviewShellProps) {
         transcriptBuffer.current = ""
         interimBuffer.current = ""
 
-        if (data.audio_base64 && audioElRef.current) {
-          audioElRef.current.src = data.audio_base64
+        if (data.audio_url && audioElRef.current) {
+          // Question audio is served from shared storage (absolute URL)
+          audioElRef.current.src = /^https?:\/\//.test(data.audio_url) ? data.audio_url : `${API_ORIGIN}${data.audio_url}`
           if (audioContextRef.current?.state === 'suspended') await audioContextRef.current.resume()
           await audioElRef.current.play().catch(() => { })
         }
@@ -19,6 +19,27 @@ export interface CandidateWithJob {
   }
 }
 
+export interface CandidateListItem {
+  id: string
+  name: string
+  email: string
+  phone: string | null
+  status: "PENDING" | "APPROVED" | "REJECTED"
+  created_at: string
+  job_id: string
+  evaluation: {
+    status: "PENDING" | "COMPLETED" | "FAILED"
+    recommendation: "STRONG_MATCH" | "POTENTIAL_MATCH" | "WEAK_MATCH"
+    score: number
+  } | null
+}
+
+export interface CandidatePage {
+  items: CandidateListItem[]
+  jobs: Record<string, CandidateWithJob["job"]>
+  next_cursor: string | null
+}
+
 
 
 export interface AIEvaluation {
@@ -33,6 +54,8 @@ export interface AIEvaluation {
   created_at?: string
   updated_at?: string
   error_message?: string
+  resume_tokens_original?: number | null
+  resume_tokens_compacted?: number | null
 }
 
 // Helper interfaces for better readability